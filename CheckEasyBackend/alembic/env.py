@@ -13,7 +13,7 @@ from app.models.base import Base
 from app.modules.auth.register.models import User
 from app.modules.verification.ocr.models import OCRResult
 # 如果你还有其他模型，例如 ManualReview 也需要导入：
-#from app.modules.verification.manual.models import ManualReview
+from app.modules.verification.manual.models import ManualReview
 
 # Alembic 配置
 config = context.config
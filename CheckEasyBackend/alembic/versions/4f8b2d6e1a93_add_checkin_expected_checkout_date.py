@@ -0,0 +1,28 @@
+"""Add checkin_records.expected_checkout_date
+
+Revision ID: 4f8b2d6e1a93
+Revises: e3a71c5d9f02
+Create Date: 2026-10-19 14:22:51.730264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b2d6e1a93'
+down_revision: Union[str, None] = 'e3a71c5d9f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('checkin_records', sa.Column('expected_checkout_date', sa.Date(), nullable=True, comment='预计退房日期（最后一晚的次日）'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('checkin_records', 'expected_checkout_date')
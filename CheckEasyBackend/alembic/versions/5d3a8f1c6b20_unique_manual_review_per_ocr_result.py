@@ -0,0 +1,45 @@
+"""Unique manual review per OCR result
+
+批量审核使用 INSERT ... ON CONFLICT (ocr_result_id) 写入审核结论，需要唯一索引；
+创建前先清理重复记录，只保留每条 OCR 结果最新的审核记录。
+
+Revision ID: 5d3a8f1c6b20
+Revises: 9b1e4c7a2d58
+Create Date: 2026-10-19 16:32:51.604217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3a8f1c6b20'
+down_revision: Union[str, None] = '9b1e4c7a2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        DELETE FROM manual_reviews m
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY ocr_result_id ORDER BY reviewed_at DESC NULLS LAST, id DESC
+            ) AS rn
+            FROM manual_reviews
+        ) ranked
+        WHERE m.id = ranked.id AND ranked.rn > 1
+    """)
+
+    # CREATE INDEX CONCURRENTLY 不能在事务中执行
+    with op.get_context().autocommit_block():
+        op.create_index('uq_manual_reviews_ocr_result_id', 'manual_reviews', ['ocr_result_id'], unique=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_manual_reviews_ocr_result_id', table_name='manual_reviews', postgresql_concurrently=True)
@@ -0,0 +1,38 @@
+"""Manual review keyset indexes and users.is_admin
+
+Revision ID: 6cac4e3befba
+Revises: a180ffe1e045
+Create Date: 2026-10-19 09:12:40.218311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6cac4e3befba'
+down_revision: Union[str, None] = 'a180ffe1e045'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('is_admin', sa.Boolean(), server_default=sa.false(), nullable=False, comment='是否为管理员'))
+
+    # CREATE INDEX CONCURRENTLY 不能在事务中执行
+    with op.get_context().autocommit_block():
+        op.create_index('idx_manual_reviews_created_id', 'manual_reviews', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_manual_reviews_status_created_id', 'manual_reviews', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_manual_reviews_reviewer_created_id', 'manual_reviews', ['reviewer_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_manual_reviews_reviewer_created_id', table_name='manual_reviews', postgresql_concurrently=True)
+        op.drop_index('idx_manual_reviews_status_created_id', table_name='manual_reviews', postgresql_concurrently=True)
+        op.drop_index('idx_manual_reviews_created_id', table_name='manual_reviews', postgresql_concurrently=True)
+    op.drop_column('users', 'is_admin')
@@ -0,0 +1,52 @@
+"""Manual review queue lease columns on ocr_results
+
+ocr_results 为分区表，分区表父表不支持 CREATE INDEX CONCURRENTLY，
+队列部分索引在各分区上普通创建（只覆盖待审核记录，数据量小）。
+
+Revision ID: 9b1e4c7a2d58
+Revises: 4f8b2d6e1a93
+Create Date: 2026-10-19 15:48:09.127530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4c7a2d58'
+down_revision: Union[str, None] = '4f8b2d6e1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ocr_results', sa.Column('review_due_at', sa.DateTime(), nullable=True, comment='审核截止时间（如客人预计到店时间），越早越优先'))
+    op.add_column('ocr_results', sa.Column('review_lease_owner_id', sa.Integer(), nullable=True, comment='当前持有审核租约的审核员ID'))
+    op.add_column('ocr_results', sa.Column('review_lease_expires_at', sa.DateTime(), nullable=True, comment='审核租约到期时间（UTC），过期后可被其他审核员领取'))
+    op.add_column('ocr_results', sa.Column('review_decided_at', sa.DateTime(), nullable=True, comment='人工审核结论提交时间，非空表示已出队'))
+    op.create_foreign_key('ocr_results_review_lease_owner_id_fkey', 'ocr_results', 'users', ['review_lease_owner_id'], ['id'])
+
+    # 已有审核结论的记录直接出队
+    op.execute("""
+        UPDATE ocr_results o SET review_decided_at = m.reviewed_at
+        FROM manual_reviews m
+        WHERE m.ocr_result_id = o.id AND m.status <> 'PENDING' AND m.reviewed_at IS NOT NULL
+    """)
+
+    op.create_index(
+        'idx_ocr_review_queue', 'ocr_results', ['review_due_at', 'upload_time', 'id'], unique=False,
+        postgresql_where=sa.text('review_required IS true AND review_decided_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_ocr_review_queue', table_name='ocr_results')
+    op.drop_constraint('ocr_results_review_lease_owner_id_fkey', 'ocr_results', type_='foreignkey')
+    op.drop_column('ocr_results', 'review_decided_at')
+    op.drop_column('ocr_results', 'review_lease_expires_at')
+    op.drop_column('ocr_results', 'review_lease_owner_id')
+    op.drop_column('ocr_results', 'review_due_at')
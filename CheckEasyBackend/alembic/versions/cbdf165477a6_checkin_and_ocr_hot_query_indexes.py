@@ -0,0 +1,54 @@
+"""Composite and partial indexes for check-in and OCR hot queries
+
+所有索引均使用 CREATE INDEX CONCURRENTLY，可在线上库执行而不阻塞写入。
+若 CONCURRENTLY 构建中途失败，会留下 INVALID 状态的索引，需先 DROP INDEX 再重新执行迁移。
+两条部分唯一索引要求现有数据中每个房间、每个用户最多只有一条 checked_in 记录，
+执行前请先清理重复的活跃入住记录。
+
+Revision ID: cbdf165477a6
+Revises: 6cac4e3befba
+Create Date: 2026-10-19 10:03:27.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cbdf165477a6'
+down_revision: Union[str, None] = '6cac4e3befba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # checkin_records
+        op.create_index('idx_checkin_user_status', 'checkin_records', ['user_id', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('uq_checkin_active_room', 'checkin_records', ['room_number'], unique=True, postgresql_concurrently=True, postgresql_where=sa.text("status = 'checked_in'"))
+        op.create_index('uq_checkin_active_user', 'checkin_records', ['user_id'], unique=True, postgresql_concurrently=True, postgresql_where=sa.text("status = 'checked_in'"))
+
+        # ocr_results
+        op.create_index('idx_ocr_user_created', 'ocr_results', ['user_id', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_ocr_document_number', 'ocr_results', ['document_number'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_ocr_created_at', 'ocr_results', ['created_at'], unique=False, postgresql_concurrently=True)
+        # 低选择性且无查询使用的单列索引
+        op.drop_index('idx_ocr_doc_type', table_name='ocr_results', postgresql_concurrently=True)
+        op.drop_index('idx_ocr_country', table_name='ocr_results', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('idx_ocr_country', 'ocr_results', ['country'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_ocr_doc_type', 'ocr_results', ['doc_type'], unique=False, postgresql_concurrently=True)
+        op.drop_index('idx_ocr_created_at', table_name='ocr_results', postgresql_concurrently=True)
+        op.drop_index('idx_ocr_document_number', table_name='ocr_results', postgresql_concurrently=True)
+        op.drop_index('idx_ocr_user_created', table_name='ocr_results', postgresql_concurrently=True)
+
+        op.drop_index('uq_checkin_active_user', table_name='checkin_records', postgresql_concurrently=True)
+        op.drop_index('uq_checkin_active_room', table_name='checkin_records', postgresql_concurrently=True)
+        op.drop_index('idx_checkin_user_status', table_name='checkin_records', postgresql_concurrently=True)
@@ -0,0 +1,95 @@
+"""Partition ocr_results by upload month and add archive columns
+
+将 ocr_results 改造为按 upload_time 月度范围分区的表：
+- 新建分区父表并按现有数据的月份范围（至当前月后 3 个月）创建月分区，外加 DEFAULT 分区；
+- 拷贝数据后替换原表，序列 ocr_results_id_seq 继续使用；
+- 分区表的主键必须包含分区键，因此主键变为 (id, upload_time)，
+  manual_reviews.ocr_result_id 的外键无法再引用 ocr_results(id)，本迁移将其删除；
+- 新增 archived_at / archive_ref 列，供冷归档任务记录原始文本的归档位置。
+
+数据拷贝期间会持有原表锁，请在维护窗口执行。后续月份的分区由归档任务按月预建。
+
+Revision ID: cd60ed3ca624
+Revises: cbdf165477a6
+Create Date: 2026-10-19 11:26:05.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd60ed3ca624'
+down_revision: Union[str, None] = 'cbdf165477a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_ocr_indexes() -> None:
+    op.create_index(op.f('ix_ocr_results_id'), 'ocr_results', ['id'], unique=False)
+    op.create_index('idx_ocr_status', 'ocr_results', ['status'], unique=False)
+    op.create_index('idx_ocr_user_created', 'ocr_results', ['user_id', 'created_at'], unique=False)
+    op.create_index('idx_ocr_document_number', 'ocr_results', ['document_number'], unique=False)
+    op.create_index('idx_ocr_created_at', 'ocr_results', ['created_at'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('manual_reviews_ocr_result_id_fkey', 'manual_reviews', type_='foreignkey')
+
+    op.execute("""
+        CREATE TABLE ocr_results_partitioned (
+            LIKE ocr_results INCLUDING DEFAULTS INCLUDING COMMENTS
+        ) PARTITION BY RANGE (upload_time)
+    """)
+    op.execute("ALTER TABLE ocr_results_partitioned ADD PRIMARY KEY (id, upload_time)")
+    op.execute("ALTER TABLE ocr_results_partitioned ADD FOREIGN KEY (user_id) REFERENCES users (id)")
+    op.add_column('ocr_results_partitioned', sa.Column('archived_at', sa.DateTime(), nullable=True, comment='原始文本归档时间'))
+    op.add_column('ocr_results_partitioned', sa.Column('archive_ref', sa.String(length=255), nullable=True, comment='归档位置：文件名:偏移:长度'))
+
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start date := date_trunc('month', COALESCE((SELECT min(upload_time) FROM ocr_results), now()))::date;
+            last_month date := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF ocr_results_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'ocr_results_' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE ocr_results_default PARTITION OF ocr_results_partitioned DEFAULT")
+
+    op.execute("INSERT INTO ocr_results_partitioned SELECT *, NULL, NULL FROM ocr_results")
+
+    # 原表删除前解除序列归属，否则序列会随原表一起删除
+    op.execute("ALTER SEQUENCE ocr_results_id_seq OWNED BY NONE")
+    op.drop_table('ocr_results')
+    op.rename_table('ocr_results_partitioned', 'ocr_results')
+    op.execute("ALTER SEQUENCE ocr_results_id_seq OWNED BY ocr_results.id")
+
+    _create_ocr_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 已归档行的原始文本保留在归档文件中，archive_ref 随表保留以便恢复
+    op.execute("CREATE TABLE ocr_results_plain (LIKE ocr_results INCLUDING DEFAULTS INCLUDING COMMENTS)")
+    op.execute("INSERT INTO ocr_results_plain SELECT * FROM ocr_results")
+    op.execute("ALTER SEQUENCE ocr_results_id_seq OWNED BY NONE")
+    op.drop_table('ocr_results')
+    op.rename_table('ocr_results_plain', 'ocr_results')
+    op.execute("ALTER SEQUENCE ocr_results_id_seq OWNED BY ocr_results.id")
+    op.execute("ALTER TABLE ocr_results ADD PRIMARY KEY (id)")
+    op.execute("ALTER TABLE ocr_results ADD FOREIGN KEY (user_id) REFERENCES users (id)")
+
+    _create_ocr_indexes()
+    op.create_foreign_key('manual_reviews_ocr_result_id_fkey', 'manual_reviews', 'ocr_results', ['ocr_result_id'], ['id'])
@@ -0,0 +1,28 @@
+"""Add checkin_records.checkout_time
+
+Revision ID: e3a71c5d9f02
+Revises: cd60ed3ca624
+Create Date: 2026-10-19 13:40:12.384105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a71c5d9f02'
+down_revision: Union[str, None] = 'cd60ed3ca624'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('checkin_records', sa.Column('checkout_time', sa.DateTime(), nullable=True, comment='退房时间'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('checkin_records', 'checkout_time')
@@ -9,7 +9,8 @@ from app.modules.checkin.routes import router as checkin_router
 from app.modules.notification.routes import router as notification_router
 from app.modules.verification.ocr.routes import router as ocr_router
 from app.modules.verification.upload.uploads.upload import router as upload_router
-#from app.modules.verification.manual.routes import router as manual_router
+from app.modules.verification.manual.routes import router as manual_router
+from app.modules.events.routes import router as events_router
 
 
 
@@ -26,4 +27,5 @@ api_router.include_router(notification_router, prefix="/notification", tags=["No
 api_router.include_router(ocr_router, prefix="/verification/ocr", tags=["OCR Verification"])
 api_router.include_router(upload_router, prefix="/verification/upload", tags=["Passport Upload"])  # <-- 新增路由注册
 
-#api_router.include_router(manual_router, prefix="/verification/manual", tags=["Manual Verification"])  # <-- 新增路由注册
\ No newline at end of file
+api_router.include_router(manual_router, prefix="/verification/manual", tags=["Manual Verification"])  # <-- 新增路由注册
+api_router.include_router(events_router, prefix="/events", tags=["Events"])
@@ -8,7 +8,37 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
-    
+
+    # 数据库连接池配置（按 worker 计算）：
+    # 每个 uvicorn worker 最多占用 DB_POOL_SIZE + DB_MAX_OVERFLOW 个连接，
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) 需小于 Postgres 的 max_connections（预留管理连接）。
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    # 默认关闭每次 checkout 的 pre-ping，改由后台存活检测（DB_LIVENESS_INTERVAL 秒，0 表示关闭）
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+    DB_LIVENESS_INTERVAL: int = int(os.getenv("DB_LIVENESS_INTERVAL", 30))
+    # asyncpg 预编译语句缓存大小（每个连接），0 表示关闭
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+    # 只读副本（逗号分隔的连接串），为空时所有读请求走主库
+    DATABASE_REPLICA_URLS: list = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    # 副本复制延迟超过该秒数时不参与路由，回退主库
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 5))
+    DB_REPLICA_LAG_CHECK_INTERVAL: int = int(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", 5))
+    # 同一客户端提交写入后，该秒数内的读请求固定走主库（read-your-writes）
+    DB_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", 10))
+
+    # 每个请求的 SQL 统计：语句数预算（0 表示不限制），按路由覆盖格式 "METHOD /path=N;..."
+    DB_QUERY_BUDGET_DEFAULT: int = int(os.getenv("DB_QUERY_BUDGET_DEFAULT", 0))
+    DB_QUERY_BUDGETS: str = os.getenv("DB_QUERY_BUDGETS", "")
+    # 超出预算时的处理：warn 记录日志，raise 抛出异常（测试环境使用）
+    DB_QUERY_BUDGET_MODE: str = os.getenv("DB_QUERY_BUDGET_MODE", "warn")
+    # 同一语句在单个请求内执行达到该次数时视为疑似 N+1
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change_me")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
@@ -17,7 +47,12 @@ class Settings:
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
     SMTP_USER: str = os.getenv("SMTP_USER", "user@example.com")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "password")
-    
+    # 是否在连接后执行 STARTTLS（本地 SMTP 替身或内网中继可关闭）
+    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() in ("1", "true", "yes")
+    SMTP_TIMEOUT: int = int(os.getenv("SMTP_TIMEOUT", 30))
+    # 异步发送路径在事件循环上允许同时进行的 SMTP 会话数
+    SMTP_ASYNC_MAX_CONCURRENCY: int = int(os.getenv("SMTP_ASYNC_MAX_CONCURRENCY", 50))
+
     ENV: str = os.getenv("ENV", "development")
     
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -39,5 +74,76 @@ class Settings:
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
     # ...
 
+    # 房间占用热索引：redis（多节点共享）或 memory（仅单节点/开发环境）
+    CHECKIN_OCCUPANCY_BACKEND: str = os.getenv("CHECKIN_OCCUPANCY_BACKEND", "redis")
+    # 房间预占在入住记录提交前的最长保留时间（秒），超时的预占可被覆盖
+    CHECKIN_RESERVATION_TTL: int = int(os.getenv("CHECKIN_RESERVATION_TTL", 30))
+
+    # 实时事件推送：物业标识（前台频道 events:property:<PROPERTY_ID>）、SSE 心跳间隔（秒）与客户端重连间隔（毫秒）
+    PROPERTY_ID: str = os.getenv("PROPERTY_ID", "default")
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+    EVENTS_RETRY_MS: int = int(os.getenv("EVENTS_RETRY_MS", 3000))
+
+    # 房间可用性引擎：位图覆盖的天数、定期从数据库重建的间隔（秒，0 表示关闭），
+    # 以及全部房间号（逗号分隔；未配置时只包含入住记录中出现过的房间）
+    AVAILABILITY_HORIZON_DAYS: int = int(os.getenv("AVAILABILITY_HORIZON_DAYS", 365))
+    AVAILABILITY_REFRESH_INTERVAL: int = int(os.getenv("AVAILABILITY_REFRESH_INTERVAL", 300))
+    HOTEL_ROOMS: list = [r.strip() for r in os.getenv("HOTEL_ROOMS", "").split(",") if r.strip()]
+
+    # 文档存储根目录（上传原图、归档文件、派生图片）
+    DOCUMENT_STORE_DIR: str = os.getenv("DOCUMENT_STORE_DIR", "app/modules/verification/upload")
+    # OCR 自动置信度：低于阈值的识别结果进入人工审核；综合分中 MRZ 校验位通过率所占权重；
+    # 开启时任一 ICAO 校验位未通过即进入人工审核
+    OCR_REVIEW_CONFIDENCE_THRESHOLD: float = float(os.getenv("OCR_REVIEW_CONFIDENCE_THRESHOLD", 0.85))
+    OCR_CHECK_DIGIT_WEIGHT: float = float(os.getenv("OCR_CHECK_DIGIT_WEIGHT", 0.6))
+    OCR_REVIEW_ON_CHECK_DIGIT_FAILURE: bool = os.getenv("OCR_REVIEW_ON_CHECK_DIGIT_FAILURE", "true").lower() == "true"
+
+    # Tesseract 识别引擎：auto（已安装 tesserocr 时进程内常驻，否则回退 pytesseract 子进程）、tesserocr 或 pytesseract，
+    # 识别语言（如 eng、eng+chi_sim）与 traineddata 目录（留空使用 Tesseract 默认位置）
+    OCR_ENGINE: str = os.getenv("OCR_ENGINE", "auto")
+    OCR_LANGUAGE: str = os.getenv("OCR_LANGUAGE", "eng")
+    OCR_TESSDATA_DIR: str = os.getenv("OCR_TESSDATA_DIR", "")
+    # 身份证 / 驾照按模板区域识别：并行识别字段区域的线程数，以及卡片与背景的最小灰度差（定位卡片四角）
+    OCR_REGION_WORKERS: int = int(os.getenv("OCR_REGION_WORKERS", 4))
+    OCR_CARD_CONTRAST: int = int(os.getenv("OCR_CARD_CONTRAST", 40))
+
+    # Stanza NER 服务（仅在 OCR worker 中加载）：语言、微批次大小、凑批最长等待（毫秒）、
+    # 单个请求超时（秒），以及是否在消费 ocr 队列的 worker 进程启动时预加载模型
+    NER_LANGUAGE: str = os.getenv("NER_LANGUAGE", "en")
+    NER_BATCH_SIZE: int = int(os.getenv("NER_BATCH_SIZE", 16))
+    NER_BATCH_MAX_WAIT_MS: int = int(os.getenv("NER_BATCH_MAX_WAIT_MS", 20))
+    NER_REQUEST_TIMEOUT: float = float(os.getenv("NER_REQUEST_TIMEOUT", 30))
+    NER_PRELOAD_IN_WORKER: bool = os.getenv("NER_PRELOAD_IN_WORKER", "true").lower() == "true"
+    # NER 推理后端：stanza（torch）或 onnx（int8 量化模型，由 scripts/export_onnx_ner.py 导出），
+    # 以及 ONNX 模型目录与 ONNX Runtime 单个算子内的线程数
+    NER_BACKEND: str = os.getenv("NER_BACKEND", "stanza")
+    NER_ONNX_MODEL_DIR: str = os.getenv("NER_ONNX_MODEL_DIR", "models/ner-onnx")
+    NER_ONNX_INTRA_OP_THREADS: int = int(os.getenv("NER_ONNX_INTRA_OP_THREADS", 1))
+
+    # 级联日期抽取的 NER 兜底方式：remote（Celery 调用 OCR worker）、local（本进程加载模型）或 off
+    DATE_NER_FALLBACK: str = os.getenv("DATE_NER_FALLBACK", "remote")
+    # remote 兜底等待 OCR worker 返回的秒数（远小于 NER_REQUEST_TIMEOUT）：没有 worker 消费 ocr 队列时尽快放弃，
+    # 上传请求只损失这段等待；超时未被领取的任务同时过期，不会在队列中堆积
+    DATE_NER_REMOTE_TIMEOUT: float = float(os.getenv("DATE_NER_REMOTE_TIMEOUT", 3))
+
+    # 审核用派生图片：缩略图与审核图的最长边（像素），以及浏览器私有缓存时间（秒）
+    IMAGE_THUMBNAIL_SIZE: int = int(os.getenv("IMAGE_THUMBNAIL_SIZE", 256))
+    IMAGE_REVIEW_SIZE: int = int(os.getenv("IMAGE_REVIEW_SIZE", 1600))
+    IMAGE_CACHE_MAX_AGE: int = int(os.getenv("IMAGE_CACHE_MAX_AGE", 86400))
+    # OCR 原始文本冷归档：超过该月数的分区归档到 DOCUMENT_STORE_DIR/ocr_archive
+    OCR_ARCHIVE_AFTER_MONTHS: int = int(os.getenv("OCR_ARCHIVE_AFTER_MONTHS", 6))
+    OCR_ARCHIVE_ZSTD_LEVEL: int = int(os.getenv("OCR_ARCHIVE_ZSTD_LEVEL", 10))
+    # 提前创建未来几个月的 ocr_results 分区
+    OCR_PARTITION_PREMAKE_MONTHS: int = int(os.getenv("OCR_PARTITION_PREMAKE_MONTHS", 3))
+
+    # 入住证件有效性缓存时间（秒），审核结论变化时主动失效
+    CERTIFICATE_CACHE_TTL: int = int(os.getenv("CERTIFICATE_CACHE_TTL", 300))
+
+    # 人工审核队列租约时长（秒），到期未提交结论的记录可被其他审核员领取
+    REVIEW_LEASE_SECONDS: int = int(os.getenv("REVIEW_LEASE_SECONDS", 600))
+
+    # 人工审核列表总数缓存时间（秒）
+    REVIEW_COUNT_CACHE_TTL: int = int(os.getenv("REVIEW_COUNT_CACHE_TTL", 60))
+
 
 settings = Settings()
\ No newline at end of file
@@ -1,24 +1,315 @@
 # CheckEasyBackend/app/core/db.py
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import hashlib
+import itertools
+import logging
+import math
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
+
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import async_r
+
+logger = logging.getLogger("CheckEasyBackend.core.db")
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    记录连接获取等待时间的连接池。
+    以 pool_logging_name 作为指标标签（engine.dispose() 重建连接池时会保留该名称）。
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe(
+                "db_pool_checkout_wait_seconds",
+                time.perf_counter() - start,
+                pool=self._orig_logging_name or "primary",
+            )
+
+
+def _engine_options(database_url: str, pool_name: str) -> dict:
+    """
+    根据 Settings 生成 create_async_engine 参数。
+    SQLite 不使用连接池参数；asyncpg 开启预编译语句缓存。
+    """
+    url = make_url(database_url)
+    options = {
+        "echo": settings.DB_ECHO,
+        "future": True,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_logging_name=pool_name,
+        )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+def _register_pool_metrics(engine: AsyncEngine, pool_name: str) -> None:
+    """
+    以回调形式注册连接池指标，采集时读取当前连接池（dispose 后自动指向新池）。
+    """
+    if not isinstance(engine.sync_engine.pool, AsyncAdaptedQueuePool):
+        return
+    metrics.register_gauge("db_pool_size", lambda: engine.sync_engine.pool.size(), pool=pool_name)
+    metrics.register_gauge("db_pool_checked_out", lambda: engine.sync_engine.pool.checkedout(), pool=pool_name)
+    metrics.register_gauge("db_pool_checked_in", lambda: engine.sync_engine.pool.checkedin(), pool=pool_name)
+    metrics.register_gauge("db_pool_overflow", lambda: max(engine.sync_engine.pool.overflow(), 0), pool=pool_name)
+
+
+class PrimarySession(Session):
+    """
+    主库会话：提交包含写操作的事务后，记录客户端的最近写入时间，用于 read-your-writes。
+    """
 
-async_engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    future=True,
-)
+
+async_engine = create_async_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL, "primary"))
+_register_pool_metrics(async_engine, "primary")
 
 AsyncSessionLocal = sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
     future=True,
 )
 
-async def get_async_db():
+# 只读副本：每个副本独立的引擎与会话工厂
+replica_engines = [
+    create_async_engine(url, **_engine_options(url, f"replica{index}"))
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+for _index, _engine in enumerate(replica_engines):
+    _register_pool_metrics(_engine, f"replica{_index}")
+
+ReplicaSessionLocals = [
+    sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+        future=True,
+    )
+    for engine in replica_engines
+]
+
+# 副本复制延迟（秒），未检测或检测失败时为 inf，不参与路由
+_replica_lag = [math.inf] * len(replica_engines)
+_replica_cycle = itertools.cycle(range(len(replica_engines))) if replica_engines else None
+
+# 最近一次主库写入的标记存于 Redis（TTL 为 DB_READ_YOUR_WRITES_SECONDS），所有 worker 进程共享，
+# 写入后的下一次读请求落到其他 worker 时同样走主库
+_LAST_WRITE_KEY = "db:last_write:{}"
+# 本进程内的副本：同一 worker 的读请求无需访问 Redis，Redis 不可用时也作为退化方案
+# 客户端标识 -> 最近一次主库写入提交的时间（time.monotonic）
+_last_write_at: Dict[str, float] = {}
+_LAST_WRITE_MAX_ENTRIES = 10000
+
+
+def _client_key(request: Optional[Request]) -> Optional[str]:
+    """
+    以 Authorization 头（摘要）标识客户端，未登录请求退化为客户端 IP。
+    """
+    if request is None:
+        return None
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        return hashlib.sha1(authorization.encode("utf-8")).hexdigest()
+    return request.client.host if request.client else None
+
+
+def _record_write(client_key: str) -> None:
+    now = time.monotonic()
+    if len(_last_write_at) >= _LAST_WRITE_MAX_ENTRIES:
+        cutoff = now - settings.DB_READ_YOUR_WRITES_SECONDS
+        for key in [k for k, t in _last_write_at.items() if t < cutoff]:
+            del _last_write_at[key]
+    _last_write_at[client_key] = now
+
+
+def _publish_write(client_key: str) -> None:
+    """
+    记录写入标记。在 AsyncSession.commit 的 greenlet 中执行，通过 await_only 等待 Redis 写入完成，
+    提交返回前标记即对所有 worker 可见。
+    """
+    _record_write(client_key)
+    if not replica_engines:
+        return
+    try:
+        await_only(async_r.set(
+            _LAST_WRITE_KEY.format(client_key), 1, px=int(settings.DB_READ_YOUR_WRITES_SECONDS * 1000)
+        ))
+    except Exception as e:
+        logger.warning("Failed to publish read-your-writes marker, falling back to this process: %s", e)
+
+
+async def _wrote_recently(client_key: Optional[str]) -> bool:
+    if client_key is None:
+        return False
+    written_at = _last_write_at.get(client_key)
+    if written_at is not None and time.monotonic() - written_at < settings.DB_READ_YOUR_WRITES_SECONDS:
+        return True
+    try:
+        return bool(await async_r.exists(_LAST_WRITE_KEY.format(client_key)))
+    except Exception as e:
+        logger.warning("Failed to read read-your-writes marker: %s", e)
+        return False
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    # db.execute(update(...)) 等语句不经过 flush，需要单独标记
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_commit_write(session):
+    if session.info.pop("has_writes", False) and session.info.get("client_key"):
+        _publish_write(session.info["client_key"])
+
+
+def _pick_replica() -> Optional[int]:
+    """
+    轮询选择复制延迟在阈值内的副本，全部不可用时返回 None。
+    """
+    if _replica_cycle is None:
+        return None
+    for _ in range(len(replica_engines)):
+        index = next(_replica_cycle)
+        if _replica_lag[index] <= settings.DB_REPLICA_MAX_LAG_SECONDS:
+            return index
+    return None
+
+
+def dialect_insert(db: AsyncSession):
+    """返回会话所用方言的 insert 构造（支持 ON CONFLICT / RETURNING），测试环境的 SQLite 与 PostgreSQL 通用。"""
+    return sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+
+
+async def get_async_db(request: Request = None):
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        session.sync_session.info["client_key"] = _client_key(request)
+        yield session
+
+
+async def get_async_read_db(request: Request = None):
+    """
+    只读会话依赖：
+    - 当前客户端在 DB_READ_YOUR_WRITES_SECONDS 内提交过写入时走主库（写入标记存于 Redis，跨 worker 进程生效）；
+    - 否则轮询选择延迟达标的副本；
+    - 未配置副本或副本全部延迟超标时回退主库。
+    仅用于不写库的接口。
+    """
+    client_key = _client_key(request)
+    replica_index = None
+    if replica_engines and not await _wrote_recently(client_key):
+        replica_index = _pick_replica()
+
+    if replica_index is None:
+        metrics.inc("db_read_route_total", target="primary")
+        async with AsyncSessionLocal() as session:
+            session.sync_session.info["client_key"] = client_key
+            yield session
+        return
+
+    metrics.inc("db_read_route_total", target=f"replica{replica_index}")
+    async with ReplicaSessionLocals[replica_index]() as session:
+        yield session
+
+
+async def db_liveness_loop(engine: AsyncEngine, pool_name: str, interval: int) -> None:
+    """
+    后台存活检测，替代每次 checkout 的 pre-ping：
+    定期借出一个连接执行 SELECT 1；失败时（如数据库重启、网络闪断）丢弃整个连接池，
+    后续请求会重新建立连接。连接的最大存活时间由 DB_POOL_RECYCLE 兜底。
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            metrics.set_gauge("db_liveness_ok", 1, pool=pool_name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Database liveness check failed for pool %s, disposing pool: %s", pool_name, e)
+            metrics.set_gauge("db_liveness_ok", 0, pool=pool_name)
+            metrics.inc("db_pool_disposals_total", pool=pool_name)
+            await engine.dispose()
+
+
+# 副本已追平主库（接收位点等于回放位点）时延迟视为 0，避免主库空闲时误判
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+async def replica_lag_loop(index: int, interval: int) -> None:
+    """
+    定期检测副本复制延迟，检测失败时将副本标记为不可用（inf）。
+    """
+    engine = replica_engines[index]
+    while True:
+        try:
+            async with engine.connect() as conn:
+                lag = float((await conn.execute(_REPLICA_LAG_SQL)).scalar() or 0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Replica lag check failed for replica%s: %s", index, e)
+            lag = math.inf
+        _replica_lag[index] = lag
+        metrics.set_gauge("db_replica_lag_seconds", lag if lag != math.inf else -1, pool=f"replica{index}")
+        await asyncio.sleep(interval)
+
+
+def start_db_background_tasks() -> list:
+    """
+    在应用启动时调用：启动各连接池的存活检测与副本延迟检测，返回任务列表供关闭时取消。
+    """
+    tasks = []
+    if settings.DB_LIVENESS_INTERVAL > 0:
+        tasks.append(asyncio.create_task(db_liveness_loop(async_engine, "primary", settings.DB_LIVENESS_INTERVAL)))
+        for index, engine in enumerate(replica_engines):
+            tasks.append(asyncio.create_task(db_liveness_loop(engine, f"replica{index}", settings.DB_LIVENESS_INTERVAL)))
+    for index in range(len(replica_engines)):
+        tasks.append(asyncio.create_task(replica_lag_loop(index, settings.DB_REPLICA_LAG_CHECK_INTERVAL)))
+    return tasks
+
+
+async def dispose_engines() -> None:
+    await async_engine.dispose()
+    for engine in replica_engines:
+        await engine.dispose()
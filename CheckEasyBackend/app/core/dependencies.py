@@ -11,7 +11,7 @@ import logging
 import os
 
 from app.core.config import settings
-from app.core.db import get_async_db
+from app.core.db import get_async_db, get_async_read_db
 from app.modules.auth.register.models import User
 
 logger = logging.getLogger("CheckEasyBackend.core.dependencies")
@@ -19,13 +19,15 @@ logger = logging.getLogger("CheckEasyBackend.core.dependencies")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 def get_correlation_id(request: Request) -> str:
-    return request.headers.get("X-Correlation-ID", str(uuid.uuid4()))
+    # 优先复用中间件生成的 ID，保证日志、SQL 统计与响应头中的 correlation_id 一致
+    correlation_id = getattr(request.state, "correlation_id", None)
+    if correlation_id is None:
+        correlation_id = request.headers.get("X-Correlation-ID", str(uuid.uuid4()))
+        request.state.correlation_id = correlation_id
+    return correlation_id
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_async_db)
-):
+async def _resolve_user(token: str, db: AsyncSession):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -55,4 +57,29 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
\ No newline at end of file
+    return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _resolve_user(token, db)
+
+
+async def get_current_user_read(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    只读接口使用的当前用户依赖，用户查询走只读副本（遵循 read-your-writes）。
+    返回的 User 对象不应在主库会话中修改。
+    """
+    return await _resolve_user(token, db)
+
+
+def require_admin(current_user: User, action: str = "admin") -> None:
+    """仅限管理员的操作：非管理员时记录日志并返回 403。"""
+    if not current_user.is_admin:
+        logger.warning("Unauthorized %s operation by user_id=%s", action, current_user.id)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
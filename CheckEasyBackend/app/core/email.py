@@ -1,5 +1,6 @@
 # File: CheckEasyBackend/app/core/email.py
 
+import asyncio
 import smtplib
 import ssl
 import logging
@@ -8,10 +9,55 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from typing import List, Optional, Dict, Any
 
+import aiosmtplib
+
 from app.core.config import settings
 
 logger = logging.getLogger("CheckEasyBackend.core.email")
 
+# 异步发送路径的并发闸门，首次使用时在当前事件循环上创建
+_async_send_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _build_message(
+    to: str,
+    subject: str,
+    body: str,
+    from_email: str,
+    attachments: Optional[List[Dict[str, Any]]] = None,
+    is_html: bool = False
+) -> MIMEMultipart:
+    """
+    构建 MIME 邮件对象，供同步与异步两条发送路径共用。
+    """
+    # 构建多部分邮件对象
+    message = MIMEMultipart()
+    message["From"] = from_email
+    message["To"] = to
+    message["Subject"] = subject
+
+    # 添加邮件正文，支持纯文本或 HTML 格式
+    mime_subtype = "html" if is_html else "plain"
+    message.attach(MIMEText(body, mime_subtype, "utf-8"))
+
+    # 添加附件（如果有）
+    if attachments:
+        for attachment in attachments:
+            # attachment 应包含 filename, content 和 mime_type 字段
+            try:
+                mime_main, mime_sub = attachment.get("mime_type", "application/octet-stream").split("/")
+            except Exception:
+                mime_main, mime_sub = "application", "octet-stream"
+            part = MIMEApplication(attachment.get("content"), _subtype=mime_sub)
+            part.add_header(
+                "Content-Disposition",
+                "attachment",
+                filename=attachment.get("filename")
+            )
+            message.attach(part)
+
+    return message
+
 
 def send_email(
     to: str,
@@ -50,40 +96,99 @@ def send_email(
     if not from_email:
         from_email = settings.SMTP_USER
 
-    # 构建多部分邮件对象
-    message = MIMEMultipart()
-    message["From"] = from_email
-    message["To"] = to
-    message["Subject"] = subject
-
-    # 添加邮件正文，支持纯文本或 HTML 格式
-    mime_subtype = "html" if is_html else "plain"
-    message.attach(MIMEText(body, mime_subtype, "utf-8"))
-
-    # 添加附件（如果有）
-    if attachments:
-        for attachment in attachments:
-            # attachment 应包含 filename, content 和 mime_type 字段
-            try:
-                mime_main, mime_sub = attachment.get("mime_type", "application/octet-stream").split("/")
-            except Exception:
-                mime_main, mime_sub = "application", "octet-stream"
-            part = MIMEApplication(attachment.get("content"), _subtype=mime_sub)
-            part.add_header(
-                "Content-Disposition",
-                "attachment",
-                filename=attachment.get("filename")
-            )
-            message.attach(part)
+    message = _build_message(to, subject, body, from_email, attachments, is_html)
 
     try:
         # 建立安全连接并登录 SMTP 服务器
-        context = ssl.create_default_context()
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            server.starttls(context=context)
+        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT) as server:
+            if settings.SMTP_USE_TLS:
+                server.starttls(context=ssl.create_default_context())
             server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
             server.sendmail(from_email, to, message.as_string())
         logger.info("Email sent successfully to %s", to)
     except Exception as e:
         logger.error("Failed to send email to %s: %s", to, str(e), exc_info=True)
-        raise
\ No newline at end of file
+        raise
+
+
+async def send_email_async(
+    to: str,
+    subject: str,
+    body: str,
+    from_email: Optional[str] = None,
+    attachments: Optional[List[Dict[str, Any]]] = None,
+    is_html: bool = False
+) -> None:
+    """
+    send_email 的原生 asyncio 版本，参数与行为保持一致。
+
+    使用 aiosmtplib 在事件循环上完成整个 SMTP 会话（EHLO/STARTTLS/AUTH/MAIL/RCPT/DATA），
+    等待网络往返时不占用 Starlette 的线程池，多封邮件可以在同一事件循环上复用并发。
+    同时进行的会话数受 settings.SMTP_ASYNC_MAX_CONCURRENCY 限制，避免触发邮件服务商的连接限流。
+
+    异常:
+        发送失败时记录错误日志并抛出异常，与同步版本一致。
+    """
+    global _async_send_semaphore
+    if _async_send_semaphore is None:
+        _async_send_semaphore = asyncio.Semaphore(settings.SMTP_ASYNC_MAX_CONCURRENCY)
+
+    if not from_email:
+        from_email = settings.SMTP_USER
+
+    message = _build_message(to, subject, body, from_email, attachments, is_html)
+
+    try:
+        async with _async_send_semaphore:
+            await aiosmtplib.send(
+                message,
+                sender=from_email,
+                recipients=[to],
+                hostname=settings.SMTP_SERVER,
+                port=settings.SMTP_PORT,
+                username=settings.SMTP_USER,
+                password=settings.SMTP_PASSWORD,
+                start_tls=settings.SMTP_USE_TLS,
+                timeout=settings.SMTP_TIMEOUT,
+            )
+        logger.info("Email sent successfully to %s", to)
+    except Exception as e:
+        logger.error("Failed to send email to %s: %s", to, str(e), exc_info=True)
+        raise
+
+
+def send_email_batch(messages: List[Dict[str, Any]], from_email: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    在同一个 SMTP 会话中批量发送邮件（一次连接、STARTTLS 与登录），用于批量通知。
+
+    参数:
+        messages (List[Dict[str, Any]]): 每项包含 to、subject、body，可选 is_html。
+        from_email (Optional[str]): 发件人邮箱地址。默认为 settings.SMTP_USER。
+
+    返回:
+        发送失败的邮件项列表（单封失败不影响其他邮件），供调用方重试。
+
+    异常:
+        连接或登录失败时抛出异常（此时没有任何邮件被发送）。
+    """
+    if not from_email:
+        from_email = settings.SMTP_USER
+
+    failed = []
+    with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT) as server:
+        if settings.SMTP_USE_TLS:
+            server.starttls(context=ssl.create_default_context())
+        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        for item in messages:
+            message = _build_message(
+                item["to"], item["subject"], item["body"], from_email, is_html=item.get("is_html", False)
+            )
+            try:
+                server.sendmail(from_email, item["to"], message.as_string())
+            except smtplib.SMTPServerDisconnected:
+                raise
+            except smtplib.SMTPException as e:
+                logger.error("Failed to send email to %s: %s", item["to"], str(e))
+                failed.append(item)
+    logger.info("Batch email sent: %s succeeded, %s failed", len(messages) - len(failed), len(failed))
+    return failed
@@ -0,0 +1,79 @@
+# File: CheckEasyBackend/app/core/metrics.py
+
+import threading
+import logging
+from typing import Callable, Dict, Tuple, Any
+
+logger = logging.getLogger("CheckEasyBackend.core.metrics")
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_key(key: MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+    进程内指标注册表：
+    - counter: 单调递增计数（如请求数、各层命中次数）；
+    - gauge: 瞬时值，可直接设置或在采集时通过回调读取（如连接池占用数）；
+    - summary: 观测值的次数、总和与最大值（如等待时间、耗时）。
+
+    通过 snapshot() 导出为字典，由 /metrics 接口对外暴露。
+    每个 uvicorn worker 各自维护一份，采集端按 worker 聚合。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._gauge_callbacks: Dict[MetricKey, Callable[[], float]] = {}
+        self._summaries: Dict[MetricKey, Dict[str, float]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def register_gauge(self, name: str, callback: Callable[[], float], **labels) -> None:
+        with self._lock:
+            self._gauge_callbacks[_key(name, labels)] = callback
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.setdefault(key, {"count": 0, "sum": 0.0, "max": 0.0})
+            summary["count"] += 1
+            summary["sum"] += value
+            if value > summary["max"]:
+                summary["max"] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            counters = {_format_key(k): v for k, v in self._counters.items()}
+            gauges = {_format_key(k): v for k, v in self._gauges.items()}
+            callbacks = dict(self._gauge_callbacks)
+            summaries = {_format_key(k): dict(v) for k, v in self._summaries.items()}
+
+        for key, callback in callbacks.items():
+            try:
+                gauges[_format_key(key)] = callback()
+            except Exception as e:
+                logger.warning("Gauge callback %s failed: %s", _format_key(key), e)
+
+        return {"counters": counters, "gauges": gauges, "summaries": summaries}
+
+
+metrics = MetricsRegistry()
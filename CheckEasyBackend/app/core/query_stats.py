@@ -0,0 +1,123 @@
+# File: CheckEasyBackend/app/core/query_stats.py
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger("CheckEasyBackend.core.query_stats")
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    请求执行的 SQL 语句数超过路由预算（DB_QUERY_BUDGET_MODE=raise 时抛出，用于测试中及早暴露 N+1）。
+    """
+
+
+class RequestQueryStats:
+    """
+    单个请求内的 SQL 统计：语句数、数据库总耗时、最慢语句，以及相同语句的重复次数（用于 N+1 检测）。
+    """
+
+    def __init__(self, correlation_id: str):
+        self.correlation_id = correlation_id
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statement_counts: Dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+
+    def repeated_statements(self, threshold: int) -> Dict[str, int]:
+        return {sql: n for sql, n in self.statement_counts.items() if n >= threshold}
+
+
+# 中间件在进入请求时设置；SQLAlchemy 的 greenlet 会沿用调用方的上下文，因此事件钩子能读到同一个对象
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def start_request_stats(correlation_id: str) -> RequestQueryStats:
+    stats = RequestQueryStats(correlation_id)
+    _current_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+def _parse_budgets(raw: str) -> Dict[str, int]:
+    """
+    解析 DB_QUERY_BUDGETS，格式为 "METHOD /route/path=N;..."，路径使用路由模板（如 {review_id}）。
+    """
+    budgets = {}
+    for item in raw.split(";"):
+        if "=" not in item:
+            continue
+        route, budget = item.rsplit("=", 1)
+        budgets[route.strip()] = int(budget)
+    return budgets
+
+
+_route_budgets = _parse_budgets(settings.DB_QUERY_BUDGETS)
+
+
+def query_budget_for(method: str, route: str) -> int:
+    return _route_budgets.get(f"{method} {route}", settings.DB_QUERY_BUDGET_DEFAULT)
+
+
+def finish_request_stats(stats: RequestQueryStats, method: str, route: str) -> None:
+    """
+    请求结束时调用：写入指标、检测重复语句（N+1），并检查路由的语句数预算。
+    """
+    metrics.observe("db_request_queries", stats.count, route=route, method=method)
+    metrics.observe("db_request_time_seconds", stats.total_time, route=route, method=method)
+    metrics.observe("db_slowest_query_seconds", stats.slowest_time, route=route, method=method)
+
+    repeated = stats.repeated_statements(settings.DB_N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        metrics.inc("db_n_plus_one_total", route=route, method=method)
+        for statement, times in repeated.items():
+            logger.warning(
+                "Possible N+1 query: statement executed %s times in one request",
+                times,
+                extra={"route": f"{method} {route}", "statement": statement, "correlation_id": stats.correlation_id},
+            )
+
+    budget = query_budget_for(method, route)
+    if budget and stats.count > budget:
+        metrics.inc("db_query_budget_exceeded_total", route=route, method=method)
+        message = f"{method} {route} executed {stats.count} SQL statements (budget {budget})"
+        if settings.DB_QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message, extra={"correlation_id": stats.correlation_id, "slowest_statement": stats.slowest_statement})
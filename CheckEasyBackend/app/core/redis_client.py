@@ -1,5 +1,6 @@
 # File: app/core/redis_client.py
 import redis
+import redis.asyncio
 from app.core.config import settings
 
 # 根据你的配置来初始化 Redis 连接
@@ -7,4 +8,12 @@ r = redis.Redis(
     host=settings.REDIS_HOST, 
     port=settings.REDIS_PORT, 
     db=0
-)
\ No newline at end of file
+)
+
+# 异步客户端：供事件循环内的请求路径使用，避免同步调用阻塞事件循环
+async_r = redis.asyncio.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=0,
+    decode_responses=True,
+)
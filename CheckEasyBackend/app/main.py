@@ -1,11 +1,19 @@
 import uvicorn
+import asyncio
 import logging
 import time
+import uuid
 from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
 app = FastAPI()
 from app.core.config import settings
 from app.api.api_v1 import api_router  # 导入 api_v1 的路由
+from app.core.db import AsyncSessionLocal, dispose_engines, start_db_background_tasks
+from app.core.metrics import metrics
+from app.core.query_stats import start_request_stats, finish_request_stats
+from app.modules.checkin.availability import availability_refresh_loop
+from app.modules.checkin.occupancy import warm_occupancy_index
+from app.modules.verification.certificates import certificate_invalidation_loop
 from dotenv import load_dotenv
 load_dotenv()  # 🚩 强制明确加载 .env 文件
 
@@ -23,9 +31,25 @@ logger = logging.getLogger("CheckEasyBackend.main")
 async def lifespan(app: FastAPI):
     # Startup事件逻辑
     logger.info("Starting up CheckEasyBackend application...")
+    background_tasks = start_db_background_tasks()
+    try:
+        async with AsyncSessionLocal() as db:
+            await warm_occupancy_index(db)
+    except Exception as e:
+        # 热索引缺失时仍由数据库唯一约束保证不会重复入住
+        logger.warning("Failed to warm room occupancy index: %s", e)
+    background_tasks.append(asyncio.create_task(certificate_invalidation_loop()))
+    if settings.AVAILABILITY_REFRESH_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(
+            availability_refresh_loop(AsyncSessionLocal, settings.AVAILABILITY_REFRESH_INTERVAL)
+        ))
     yield
     # Shutdown事件逻辑
     logger.info("Shutting down CheckEasyBackend application...")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await dispose_engines()
 
 app = FastAPI(
     title=getattr(settings, "PROJECT_NAME", "CheckEasyBackend"),
@@ -44,9 +68,39 @@ async def add_process_time_header(request: Request, call_next):
     response.headers["X-Process-Time"] = f"{process_time:.4f}"
     return response
 
+
+@app.middleware("http")
+async def record_query_stats(request: Request, call_next):
+    """
+    统计每个请求执行的 SQL：开发环境写入响应头，所有环境写入 /metrics，并检查路由语句数预算。
+    """
+    correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+    request.state.correlation_id = correlation_id
+    stats = start_request_stats(correlation_id)
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else "unmatched"
+    finish_request_stats(stats, request.method, route_path)
+
+    response.headers["X-Correlation-ID"] = correlation_id
+    if settings.ENV == "development":
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time"] = f"{stats.total_time:.4f}"
+        response.headers["X-DB-Slowest-Time"] = f"{stats.slowest_time:.4f}"
+    return response
+
 # 正确注册路由
 app.include_router(api_router, prefix="/api/v1")
 
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    导出当前 worker 的进程内指标（连接池占用、等待时间等）。
+    """
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
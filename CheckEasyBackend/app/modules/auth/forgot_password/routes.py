@@ -6,7 +6,6 @@ from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException, Request, status, Depends
 from fastapi.responses import JSONResponse
-from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,7 +19,7 @@ from app.modules.auth.forgot_password.schemas import (
 from app.modules.auth.forgot_password.utils import (
     generate_reset_token,
     verify_reset_token,
-    send_reset_email,
+    send_reset_email_async,
     hash_password,
     validate_password_complexity,
 )
@@ -63,8 +62,8 @@ async def forgot_password(
     await db.commit()
 
     try:
-        # 使用 run_in_threadpool 调用同步的 send_reset_email
-        await run_in_threadpool(send_reset_email, email=request_data.email, reset_token=reset_token)
+        # 原生异步 SMTP 发送，不占用 Starlette 线程池
+        await send_reset_email_async(email=request_data.email, reset_token=reset_token)
     except Exception as e:
         logger.error("Failed to send reset password email", extra={"email": request_data.email, "error": str(e)})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send reset email")
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import Any
 
 from app.core.config import settings
-from app.core.email import send_email
+from app.core.email import send_email, send_email_async
 from app.core.security import hash_password  # 导入用于更新密码的哈希函数
 import re
 
@@ -29,14 +29,9 @@ def generate_reset_token(email: str) -> str:
     return token
 
 
-def send_reset_email(email: str, reset_token: str) -> None:
+def _build_reset_email(reset_token: str) -> tuple:
     """
-    发送重置密码邮件，将重置密码链接发送给用户。
-    构造重置链接并调用邮件模块发送邮件。
-
-    Args:
-        email (str): 用户邮箱
-        reset_token (str): 重置密码 Token（此处实际存储在激活字段中）
+    构造重置密码邮件的主题与正文，供同步和异步发送共用。
     """
     # 构造重置链接，确保 settings.APP_BASE_URL 配置正确，例如 "http://127.0.0.1:8000"
     reset_link = f"{settings.APP_BASE_URL}/api/v1/auth/reset-password?token={reset_token}"
@@ -47,6 +42,19 @@ def send_reset_email(email: str, reset_token: str) -> None:
         f"If you did not request a password reset, please ignore this email.\n\n"
         f"Best regards,\nYour Team"
     )
+    return subject, content
+
+
+def send_reset_email(email: str, reset_token: str) -> None:
+    """
+    发送重置密码邮件，将重置密码链接发送给用户。
+    构造重置链接并调用邮件模块发送邮件。
+
+    Args:
+        email (str): 用户邮箱
+        reset_token (str): 重置密码 Token（此处实际存储在激活字段中）
+    """
+    subject, content = _build_reset_email(reset_token)
     try:
         # 直接调用同步的 send_email 函数
         send_email(
@@ -60,6 +68,28 @@ def send_reset_email(email: str, reset_token: str) -> None:
         logger.error("Failed to send reset password email to %s: %s", email, str(e), exc_info=True)
         raise
 
+
+async def send_reset_email_async(email: str, reset_token: str) -> None:
+    """
+    send_reset_email 的异步版本，直接在事件循环上完成 SMTP 会话，不占用线程池。
+
+    Args:
+        email (str): 用户邮箱
+        reset_token (str): 重置密码 Token
+    """
+    subject, content = _build_reset_email(reset_token)
+    try:
+        await send_email_async(
+            to=email,
+            subject=subject,
+            body=content,
+            from_email=settings.SMTP_USER
+        )
+        logger.info("Reset password email sent successfully to %s", email)
+    except Exception as e:
+        logger.error("Failed to send reset password email to %s: %s", email, str(e), exc_info=True)
+        raise
+
 def validate_password_complexity(password: str) -> bool:
     """
     验证密码复杂性，密码必须至少8位，包含至少一个字母和一个数字。
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.modules.auth.register.models import User
 
-from app.core.db import get_async_db
+from app.core.db import get_async_read_db
 from app.core.config import settings  # 🚩 修复：统一使用 settings 配置
 from app.core.dependencies import get_correlation_id
 from app.modules.auth.login.schemas import LoginRequest, LoginResponse
@@ -41,7 +41,7 @@ async def get_user_agent(request: Request) -> str:
 async def login(
     login_request: LoginRequest,
     request: Request,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_async_read_db),  # 登录仅查询用户，走只读副本
 ):
     client_ip = request.client.host
     correlation_id = get_correlation_id(request)
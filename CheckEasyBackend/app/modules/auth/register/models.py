@@ -1,6 +1,6 @@
 # File: CheckEasyBackend/app/modules/auth/register/models.py
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, false
 from datetime import datetime
 from app.models.base import Base  # 请确保这个导入指向正确的数据库基类
 from sqlalchemy.orm import relationship  # 新增导入
@@ -18,6 +18,7 @@ class User(Base):
     - activation_token: 用于存储邮箱激活的 token，用户点击邮件中的链接时使用。
     - token_expires: 记录 token 何时过期，避免旧 token 被滥用。
     - verification_status: 用户证件审核状态，none: 未上传证件, pending: 待人工审核, approved: 审核通过, rejected: 审核拒绝。
+    - is_admin: 是否为管理员（可进行人工审核）。
     """
     __tablename__ = "users"
 
@@ -35,6 +36,9 @@ class User(Base):
     verification_status = Column(String(20), default="none", nullable=False,
                                  comment="用户审核状态：none, pending, approved, rejected")
 
+    # 管理员（审核员）标识，人工审核相关接口据此鉴权
+    is_admin = Column(Boolean, default=False, server_default=false(), nullable=False, comment="是否为管理员")
+
     def __repr__(self):
         return f"<User(username='{self.username}', email='{self.email}', active={self.is_active})>"
     
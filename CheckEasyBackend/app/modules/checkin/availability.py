@@ -0,0 +1,164 @@
+# File: CheckEasyBackend/app/modules/checkin/availability.py
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.modules.checkin.models import CheckinRecord, CheckinStatus
+
+logger = logging.getLogger("CheckEasyBackend.checkin.availability")
+
+
+def _night_mask(first: int, last: int) -> np.ndarray:
+    """
+    生成覆盖第 first..last 晚（含两端）的字节掩码，对应位图中 first >> 3 .. last >> 3 这几个字节。
+    """
+    mask = np.full((last >> 3) - (first >> 3) + 1, 0xFF, dtype=np.uint8)
+    mask[0] &= np.uint8((0xFF << (first & 7)) & 0xFF)
+    mask[-1] &= np.uint8(0xFF >> (7 - (last & 7)))
+    return mask
+
+
+class AvailabilityEngine:
+    """
+    房间可用性引擎：每个房间一行位图，每晚一位（第 i 晚为 horizon_start + i 当晚）。
+    所有房间的位图存放在同一个 uint8 二维数组中，区间查询对所有房间一次向量化完成。
+
+    入住记录按 [入住日期, 预计退房日期) 占用；未填写预计退房日期的在住记录视为一直占用到视野末尾，
+    保证规划查询不会把在住房间当作空房。
+    """
+
+    def __init__(self, horizon_start: date, horizon_days: int):
+        self.horizon_start = horizon_start
+        self.horizon_days = horizon_days
+        self._row_bytes = (horizon_days + 7) >> 3
+        self._bitmap = np.zeros((16, self._row_bytes), dtype=np.uint8)
+        self._rooms: List[str] = []
+        self._room_index: Dict[str, int] = {}
+
+    @property
+    def rooms(self) -> List[str]:
+        return list(self._rooms)
+
+    def add_room(self, room_number: str) -> int:
+        index = self._room_index.get(room_number)
+        if index is not None:
+            return index
+        index = len(self._rooms)
+        if index == self._bitmap.shape[0]:
+            self._bitmap = np.vstack([self._bitmap, np.zeros_like(self._bitmap)])
+        self._rooms.append(room_number)
+        self._room_index[room_number] = index
+        return index
+
+    def _night_range(self, start: date, end: Optional[date], clamp: bool):
+        """
+        将日期区间 [start, end) 转换为视野内的晚次下标 (first, last)，区间为空时返回 None。
+        clamp=False 时超出视野直接报错（查询）；clamp=True 时裁剪到视野内（更新）。
+        """
+        first = (start - self.horizon_start).days
+        last = (end - self.horizon_start).days - 1 if end is not None else self.horizon_days - 1
+        if not clamp and (first < 0 or last >= self.horizon_days):
+            raise ValueError(
+                f"Date range must be within {self.horizon_start} .. "
+                f"{self.horizon_start + timedelta(days=self.horizon_days)}"
+            )
+        first, last = max(first, 0), min(last, self.horizon_days - 1)
+        return (first, last) if first <= last else None
+
+    def occupy(self, room_number: str, start: date, end: Optional[date] = None) -> None:
+        """标记房间在 [start, end) 各晚被占用，end 为 None 表示占用到视野末尾。"""
+        index = self.add_room(room_number)
+        nights = self._night_range(start, end, clamp=True)
+        if nights:
+            first, last = nights
+            self._bitmap[index, first >> 3:(last >> 3) + 1] |= _night_mask(first, last)
+
+    def release(self, room_number: str, start: date, end: Optional[date] = None) -> None:
+        """释放房间在 [start, end) 各晚的占用（退房时从退房日起释放）。"""
+        index = self._room_index.get(room_number)
+        nights = self._night_range(start, end, clamp=True)
+        if index is not None and nights:
+            first, last = nights
+            self._bitmap[index, first >> 3:(last >> 3) + 1] &= ~_night_mask(first, last)
+
+    def free_rooms(self, start: date, end: date) -> List[str]:
+        """返回 [start, end) 每晚均空闲的房间。"""
+        nights = self._night_range(start, end, clamp=False)
+        if nights is None:
+            return self.rooms
+        first, last = nights
+        window = self._bitmap[:len(self._rooms), first >> 3:(last >> 3) + 1]
+        occupied = (window & _night_mask(first, last)).any(axis=1)
+        return [self._rooms[i] for i in np.flatnonzero(~occupied)]
+
+    def is_free(self, room_number: str, start: date, end: date) -> bool:
+        index = self._room_index.get(room_number)
+        if index is None:
+            return True
+        nights = self._night_range(start, end, clamp=False)
+        if nights is None:
+            return True
+        first, last = nights
+        return not (self._bitmap[index, first >> 3:(last >> 3) + 1] & _night_mask(first, last)).any()
+
+
+class AvailabilityService:
+    """
+    进程内的可用性引擎管理：启动时从在住记录构建，入住/退房时增量更新，
+    并定期重建（同步其他节点的写入，同时将视野起点滚动到今天）。
+    """
+
+    def __init__(self):
+        self.engine = AvailabilityEngine(date.today(), settings.AVAILABILITY_HORIZON_DAYS)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        engine = AvailabilityEngine(date.today(), settings.AVAILABILITY_HORIZON_DAYS)
+        for room_number in settings.HOTEL_ROOMS:
+            engine.add_room(room_number)
+        result = await db.execute(
+            select(CheckinRecord.room_number, CheckinRecord.checkin_time, CheckinRecord.expected_checkout_date).where(
+                CheckinRecord.status == CheckinStatus.checked_in,
+                CheckinRecord.room_number.isnot(None),
+            )
+        )
+        for room_number, checkin_time, expected_checkout_date in result.all():
+            engine.occupy(room_number, checkin_time.date(), expected_checkout_date)
+        self.engine = engine
+        logger.info("Availability engine rebuilt with %s rooms", len(engine.rooms))
+
+    def record_checkin(self, room_number: Optional[str], checkin_time: datetime, expected_checkout_date: Optional[date]) -> None:
+        if room_number:
+            self.engine.occupy(room_number, checkin_time.date(), expected_checkout_date)
+
+    def record_checkouts(self, rooms: Iterable[str], checkout_time: datetime) -> None:
+        for room_number in rooms:
+            if room_number:
+                self.engine.release(room_number, checkout_time.date())
+
+    def free_rooms(self, start: date, end: date) -> List[str]:
+        return self.engine.free_rooms(start, end)
+
+
+availability_service = AvailabilityService()
+
+
+async def availability_refresh_loop(session_factory, interval: int) -> None:
+    """
+    定期从数据库重建可用性引擎，失败时保留现有位图。
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                await availability_service.rebuild(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Availability engine rebuild failed: %s", e)
+        await asyncio.sleep(interval)
@@ -1,7 +1,7 @@
 # 代码路径: CheckEasyBackend/app/modules/checkin/models.py
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Text, ForeignKey, Enum, JSON, func
+    Column, Integer, String, Date, DateTime, Text, ForeignKey, Enum, JSON, Index, func
 )
 from datetime import datetime
 import enum
@@ -21,6 +21,8 @@ class CheckinRecord(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, comment="用户ID，关联到用户表")
     certificate_id = Column(String(100), nullable=True, comment="证件记录ID")
     checkin_time = Column(DateTime, nullable=False, default=datetime.utcnow, comment="入住时间")
+    expected_checkout_date = Column(Date, nullable=True, comment="预计退房日期（最后一晚的次日）")
+    checkout_time = Column(DateTime, nullable=True, comment="退房时间")
     status = Column(Enum(CheckinStatus), nullable=False, default=CheckinStatus.checked_in, comment="入住状态")
     room_number = Column(String(50), nullable=True, comment="房间号")
     remarks = Column(Text, nullable=True, comment="备注信息")
@@ -32,4 +34,22 @@ class CheckinRecord(Base):
         return (
             f"<CheckinRecord(id={self.id}, user_id={self.user_id}, checkin_time={self.checkin_time}, "
             f"status={self.status.value}, room_number={self.room_number})>"
-        )
\ No newline at end of file
+        )
+
+
+# 按用户查询入住记录（含历史）
+Index("idx_checkin_user_status", CheckinRecord.user_id, CheckinRecord.status)
+# 部分唯一索引：每个房间、每个用户同一时间最多一条 checked_in 记录，
+# 同时覆盖房间占用检查与活跃入住检查 (room_number/user_id + status='checked_in')
+Index(
+    "uq_checkin_active_room",
+    CheckinRecord.room_number,
+    unique=True,
+    postgresql_where=CheckinRecord.status == CheckinStatus.checked_in,
+)
+Index(
+    "uq_checkin_active_user",
+    CheckinRecord.user_id,
+    unique=True,
+    postgresql_where=CheckinRecord.status == CheckinStatus.checked_in,
+)
@@ -0,0 +1,246 @@
+# File: CheckEasyBackend/app/modules/checkin/occupancy.py
+
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.modules.checkin.models import CheckinRecord, CheckinStatus
+
+logger = logging.getLogger("CheckEasyBackend.checkin.occupancy")
+
+# 房间占用热索引：room_number -> 占用标记
+#   "<checkin_id>"                     已入住（已提交到数据库）
+#   "pending:<token>:<expires_epoch>"  预占中（入住记录尚未提交），过期后可被新的预占覆盖
+# 数据库中的部分唯一索引 uq_checkin_active_room 仍是最终约束；热索引只负责 O(1) 判断与并发预占，
+# 丢失（如 Redis 清空）或残留旧条目时由 warm_occupancy_index 与数据库对账。
+OCCUPANCY_KEY = "checkin:room_occupancy"
+PENDING_PREFIX = "pending:"
+
+
+def _pending_value(token: str) -> str:
+    return f"{PENDING_PREFIX}{token}:{int(time.time()) + settings.CHECKIN_RESERVATION_TTL}"
+
+
+def _is_expired_pending(value: str) -> bool:
+    return value.startswith(PENDING_PREFIX) and int(value.rsplit(":", 1)[1]) < time.time()
+
+
+# 预占：字段不存在或为过期预占时写入，返回 1；否则返回 0（HSETNX 语义 + 过期预占回收）
+_RESERVE_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current then
+    if string.sub(current, 1, 8) ~= 'pending:' then return 0 end
+    local expires = tonumber(string.match(current, ':(%d+)$'))
+    if expires == nil or expires >= tonumber(ARGV[3]) then return 0 end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+# 比较并设置：仅当当前值等于期望值时更新（ARGV[3] 为空串表示删除）
+_COMPARE_AND_SET_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then return 0 end
+if ARGV[3] == '' then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+end
+return 1
+"""
+
+
+class RoomReservation:
+    """
+    一次房间预占。入住记录提交成功后调用 confirm()，失败时调用 release()。
+    """
+
+    def __init__(self, index: "RoomOccupancyIndex", room_number: str, value: str):
+        self.index = index
+        self.room_number = room_number
+        self.value = value
+
+    async def confirm(self, checkin_id: int) -> None:
+        await self._set(str(checkin_id))
+
+    async def release(self) -> None:
+        await self._set(None)
+
+    async def _set(self, value: Optional[str]) -> None:
+        # 入住记录已提交或已回滚，热索引写入失败不应影响结果：预占到期后自动回收，残留条目由 warm_occupancy_index 对账
+        try:
+            await self.index.compare_and_set(self.room_number, self.value, value)
+        except Exception as e:
+            logger.warning("Failed to update room occupancy index for room %s: %s", self.room_number, e)
+
+
+class RoomOccupancyIndex(ABC):
+    """
+    房间占用热索引接口，reserve() 为原子的比较并设置操作。
+    """
+
+    @abstractmethod
+    async def reserve(self, room_number: str) -> Optional[RoomReservation]:
+        ...
+
+    @abstractmethod
+    async def compare_and_set(self, room_number: str, expected: str, value: Optional[str]) -> bool:
+        ...
+
+    @abstractmethod
+    async def occupant(self, room_number: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def entries(self) -> Dict[str, str]:
+        """返回全部 room_number -> 占用标记。"""
+
+    @abstractmethod
+    async def release_room(self, room_number: str) -> None:
+        """退房后无条件释放房间。"""
+
+    @abstractmethod
+    async def fill_missing(self, occupied: Dict[str, int]) -> int:
+        ...
+
+    async def try_reserve(self, room_number: str) -> Tuple[bool, Optional[RoomReservation]]:
+        """
+        预占房间，返回 (房间是否已被占用, 预占)。
+        热索引不可用（如 Redis 故障）时记录日志并返回 (False, None)，由数据库部分唯一索引 uq_checkin_active_room 兜底。
+        """
+        try:
+            reservation = await self.reserve(room_number)
+        except Exception as e:
+            logger.warning("Room occupancy index unavailable, relying on database constraint: %s", e)
+            return False, None
+        return reservation is None, reservation
+
+    async def is_available(self, room_number: str) -> bool:
+        value = await self.occupant(room_number)
+        return value is None or _is_expired_pending(value)
+
+    async def remove_stale(self, occupied: Dict[str, int]) -> int:
+        """
+        删除已入住标记与数据库不一致的条目（confirm 丢失、或未经 bulk_checkout 的退房留下的旧 checkin_id），
+        否则这些房间会被永久占用。预占中的条目保留，由其过期时间回收；删除使用比较并设置，不覆盖并发更新。
+        """
+        active = {room: str(checkin_id) for room, checkin_id in occupied.items()}
+        removed = 0
+        for room_number, value in (await self.entries()).items():
+            if value.startswith(PENDING_PREFIX) or active.get(room_number) == value:
+                continue
+            removed += await self.compare_and_set(room_number, value, None)
+        return removed
+
+
+class RedisOccupancyIndex(RoomOccupancyIndex):
+    """
+    基于 Redis 哈希的实现，多个 API 节点共享同一份占用信息。
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._reserve = client.register_script(_RESERVE_SCRIPT)
+        self._compare_and_set = client.register_script(_COMPARE_AND_SET_SCRIPT)
+
+    async def reserve(self, room_number: str) -> Optional[RoomReservation]:
+        value = _pending_value(uuid.uuid4().hex)
+        reserved = await self._reserve(keys=[OCCUPANCY_KEY], args=[room_number, value, int(time.time())])
+        return RoomReservation(self, room_number, value) if reserved else None
+
+    async def compare_and_set(self, room_number: str, expected: str, value: Optional[str]) -> bool:
+        return bool(await self._compare_and_set(keys=[OCCUPANCY_KEY], args=[room_number, expected, value or ""]))
+
+    async def occupant(self, room_number: str) -> Optional[str]:
+        return await self.client.hget(OCCUPANCY_KEY, room_number)
+
+    async def entries(self) -> Dict[str, str]:
+        return await self.client.hgetall(OCCUPANCY_KEY)
+
+    async def release_room(self, room_number: str) -> None:
+        await self.client.hdel(OCCUPANCY_KEY, room_number)
+
+    async def fill_missing(self, occupied: Dict[str, int]) -> int:
+        pipe = self.client.pipeline(transaction=False)
+        for room_number, checkin_id in occupied.items():
+            pipe.hsetnx(OCCUPANCY_KEY, room_number, str(checkin_id))
+        return sum(await pipe.execute()) if occupied else 0
+
+
+class InMemoryOccupancyIndex(RoomOccupancyIndex):
+    """
+    进程内实现，仅适用于单节点部署或开发环境；多节点部署时请使用 Redis 实现。
+    """
+
+    def __init__(self):
+        self._rooms: Dict[str, str] = {}
+        self._lock = asyncio.Lock()
+
+    async def reserve(self, room_number: str) -> Optional[RoomReservation]:
+        value = _pending_value(uuid.uuid4().hex)
+        async with self._lock:
+            current = self._rooms.get(room_number)
+            if current is not None and not _is_expired_pending(current):
+                return None
+            self._rooms[room_number] = value
+        return RoomReservation(self, room_number, value)
+
+    async def compare_and_set(self, room_number: str, expected: str, value: Optional[str]) -> bool:
+        async with self._lock:
+            if self._rooms.get(room_number) != expected:
+                return False
+            if value is None:
+                del self._rooms[room_number]
+            else:
+                self._rooms[room_number] = value
+            return True
+
+    async def occupant(self, room_number: str) -> Optional[str]:
+        return self._rooms.get(room_number)
+
+    async def entries(self) -> Dict[str, str]:
+        return dict(self._rooms)
+
+    async def release_room(self, room_number: str) -> None:
+        async with self._lock:
+            self._rooms.pop(room_number, None)
+
+    async def fill_missing(self, occupied: Dict[str, int]) -> int:
+        async with self._lock:
+            missing = {room: str(cid) for room, cid in occupied.items() if room not in self._rooms}
+            self._rooms.update(missing)
+        return len(missing)
+
+
+def _build_index() -> RoomOccupancyIndex:
+    if settings.CHECKIN_OCCUPANCY_BACKEND == "redis":
+        from app.core.redis_client import async_r
+        return RedisOccupancyIndex(async_r)
+    return InMemoryOccupancyIndex()
+
+
+occupancy_index = _build_index()
+
+
+async def warm_occupancy_index(db: AsyncSession) -> int:
+    """
+    从数据库加载当前所有 checked_in 的房间与热索引对账：
+    先删除没有对应活跃入住记录的已入住标记，再补齐缺失的条目（已有的一致条目不覆盖）。
+    """
+    result = await db.execute(
+        select(CheckinRecord.room_number, CheckinRecord.id).where(
+            CheckinRecord.status == CheckinStatus.checked_in,
+            CheckinRecord.room_number.isnot(None),
+        )
+    )
+    occupied = {room: checkin_id for room, checkin_id in result.all()}
+    removed = await occupancy_index.remove_stale(occupied)
+    added = await occupancy_index.fill_missing(occupied)
+    logger.info("Room occupancy index warmed, %s rooms added, %s stale entries removed", added, removed)
+    return added
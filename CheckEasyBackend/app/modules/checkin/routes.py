@@ -1,20 +1,53 @@
 # File: CheckEasyBackend/app/modules/checkin/routes.py
 
 import logging
-from fastapi import APIRouter, HTTPException, Request, status, Depends
+from datetime import date
+from fastapi import APIRouter, HTTPException, Request, Query, status, Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.db import get_async_db  # 使用异步数据库依赖
-from app.modules.checkin.schemas import CheckinRequest, CheckinResponse
+from app.modules.checkin.schemas import (
+    CheckinRequest,
+    CheckinResponse,
+    BulkCheckinRequest,
+    BulkCheckinResponse,
+    BulkCheckoutRequest,
+    BulkCheckoutResponse,
+    RoomAvailabilityResponse,
+)
 from app.modules.checkin.models import CheckinRecord
-from app.modules.verification.ocr.utils import process_certificate_verification
-from app.core.dependencies import get_current_user, get_correlation_id
+from app.modules.checkin.utils import (
+    CheckinException,
+    UserBlacklistedException,
+    CertificateInvalidException,
+    validate_checkin_request,
+    active_checkin_conflict,
+    bulk_checkin,
+    bulk_checkout,
+    verify_certificate,
+)
+from app.modules.checkin.availability import availability_service
+from app.modules.checkin.occupancy import occupancy_index
+from app.modules.events.bus import publish_event, CHECKIN_CREATED, CHECKOUT_COMPLETED
+from app.core.dependencies import get_current_user, get_current_user_read, get_correlation_id, require_admin
 
 router = APIRouter()
 logger = logging.getLogger("CheckEasyBackend.checkin.routes")
 
+
+def checkin_exception_status(exc: CheckinException) -> int:
+    """
+    将入住业务异常映射为 HTTP 状态码。
+    """
+    if isinstance(exc, UserBlacklistedException):
+        return status.HTTP_403_FORBIDDEN
+    if isinstance(exc, CertificateInvalidException):
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_409_CONFLICT
+
 @router.post(
     "/checkin",
     response_model=CheckinResponse,
@@ -22,9 +55,9 @@ logger = logging.getLogger("CheckEasyBackend.checkin.routes")
     description=(
         "处理用户入住请求：\n"
         "1. 验证当前用户已登录；\n"
-        "2. 调用证件验证逻辑验证上传的证件；\n"
-        "3. 记录入住信息到数据库；\n"
-        "4. 返回入住成功响应。"
+        "2. 根据已存储的 OCR 识别与人工审核结果核验证件（带缓存）；\n"
+        "3. 原子预占房间（占用热索引），再记录入住信息到数据库（部分唯一索引兜底）；\n"
+        "4. 返回入住成功响应。房间或用户已有活跃入住时返回 409。"
     )
 )
 async def checkin(
@@ -43,25 +76,50 @@ async def checkin(
         }
     )
 
-    # 调用证件验证函数（同步函数，不使用 await）
-    verification_result = process_certificate_verification(
-        certificate_id=request_data.certificate_id,
-        user_id=current_user.id
-    )
-    
-    if not verification_result.get("valid", False):
+    # 入住业务规则校验（资格、已有入住、房间占用）决定是否写库，必须读主库：
+    # 刚退房或刚被拉黑的用户不能按副本上的旧数据判断
+    try:
+        await validate_checkin_request(
+            user_id=current_user.id,
+            room_number=request_data.room_number,
+            certificate_id=request_data.certificate_id,
+            db=db
+        )
+    except CheckinException as e:
         logger.warning(
-            "Certificate verification failed",
-            extra={
-                "user_id": current_user.id,
-                "correlation_id": correlation_id,
-                "reason": verification_result.get("message")
-            }
+            "Checkin validation failed",
+            extra={"user_id": current_user.id, "correlation_id": correlation_id, "reason": str(e)}
         )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Certificate verification failed: {verification_result.get('message')}"
+        raise HTTPException(status_code=checkin_exception_status(e), detail=str(e))
+
+    # 根据已存储的 OCR / 人工审核结果核验证件（有效性缓存，审核结论变化时失效）；
+    # 缓存未命中时在主库查询，避免把副本上滞后的审核结论写入缓存
+    try:
+        await verify_certificate(
+            certificate_id=request_data.certificate_id or request_data.certificate_number,
+            user_id=current_user.id,
+            db=db
         )
+    except CertificateInvalidException as e:
+        logger.warning(
+            "Certificate verification failed",
+            extra={"user_id": current_user.id, "correlation_id": correlation_id, "reason": str(e)}
+        )
+        raise HTTPException(status_code=checkin_exception_status(e), detail=str(e))
+
+    # 原子预占房间（比较并设置），并发请求中只有一个能拿到预占；热索引故障时直接写库，由唯一索引兜底
+    reservation = None
+    if request_data.room_number:
+        occupied, reservation = await occupancy_index.try_reserve(request_data.room_number)
+        if occupied:
+            logger.warning(
+                "Room reservation failed, room occupied",
+                extra={"room_number": request_data.room_number, "correlation_id": correlation_id}
+            )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Room {request_data.room_number} is already occupied."
+            )
 
     try:
         # 如果传入的 checkin_time 包含时区信息，将其转换为天真的（naive）datetime对象
@@ -71,17 +129,41 @@ async def checkin(
             certificate_id=request_data.certificate_id,
             checkin_time=naive_checkin_time,
             room_number=request_data.room_number,
+            expected_checkout_date=request_data.expected_checkout_date,
             remarks=request_data.remarks,
             additional_info=request_data.additional_info
         )
         db.add(new_checkin)
         await db.commit()
         await db.refresh(new_checkin)
+        if reservation is not None:
+            await reservation.confirm(new_checkin.id)
+        availability_service.record_checkin(
+            new_checkin.room_number, new_checkin.checkin_time, new_checkin.expected_checkout_date
+        )
         logger.info(
             "Checkin record created successfully",
             extra={"checkin_id": new_checkin.id, "correlation_id": correlation_id}
         )
+        await publish_event(
+            CHECKIN_CREATED,
+            {"checkin_id": new_checkin.id, "room_number": new_checkin.room_number},
+            user_id=current_user.id,
+        )
+    except IntegrityError as e:
+        # 数据库部分唯一索引兜底（热索引缺失条目或并发写入时）
+        await db.rollback()
+        if reservation is not None:
+            await reservation.release()
+        logger.warning(
+            "Checkin rejected by active checkin constraint",
+            extra={"error": str(e.orig), "correlation_id": correlation_id}
+        )
+        exc = active_checkin_conflict(e, current_user.id, request_data.room_number)
+        raise HTTPException(status_code=checkin_exception_status(exc), detail=str(exc))
     except Exception as e:
+        if reservation is not None:
+            await reservation.release()
         logger.error(
             "Failed to record checkin",
             extra={"error": str(e), "correlation_id": correlation_id},
@@ -109,4 +191,97 @@ async def checkin(
     if response_data.get("checkin_time"):
         response_data["checkin_time"] = response_data["checkin_time"].isoformat()
 
-    return JSONResponse(content=response_data)
\ No newline at end of file
+    return JSONResponse(content=response_data)
+
+@router.post(
+    "/checkin/bulk",
+    response_model=BulkCheckinResponse,
+    summary="团体批量入住接口",
+    description=(
+        "前台为团队、会议等团体批量办理入住（仅限管理员）：\n"
+        "1. 单条查询集合式校验所有入住项；\n"
+        "2. 单个事务中多行写入入住记录；\n"
+        "3. 返回逐项结果，部分房间冲突不影响其他入住项。"
+    )
+)
+async def bulk_checkin_route(
+    request_data: BulkCheckinRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+    correlation_id: str = Depends(get_correlation_id)
+):
+    require_admin(current_user, "bulk checkin")
+    logger.info(
+        "Received bulk checkin request",
+        extra={"operator_id": current_user.id, "items": len(request_data.items), "correlation_id": correlation_id}
+    )
+    results = await bulk_checkin(request_data.items, db)
+    succeeded = sum(1 for r in results if r.status == "checked_in")
+    for r in results:
+        if r.status == "checked_in":
+            await publish_event(CHECKIN_CREATED, {"checkin_id": r.checkin_id, "room_number": r.room_number}, user_id=r.user_id)
+    return BulkCheckinResponse(
+        message="Bulk check-in processed",
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
+
+
+@router.post(
+    "/checkout/bulk",
+    response_model=BulkCheckoutResponse,
+    summary="团体批量退房接口",
+    description="批量将入住记录置为已退房并释放房间（仅限管理员），返回逐项结果。"
+)
+async def bulk_checkout_route(
+    request_data: BulkCheckoutRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+    correlation_id: str = Depends(get_correlation_id)
+):
+    require_admin(current_user, "bulk checkout")
+    logger.info(
+        "Received bulk checkout request",
+        extra={"operator_id": current_user.id, "items": len(request_data.checkin_ids), "correlation_id": correlation_id}
+    )
+    results = await bulk_checkout(request_data.checkin_ids, request_data.checkout_time, db)
+    succeeded = sum(1 for r in results if r.status == "checked_out")
+    for r in results:
+        if r.status == "checked_out":
+            await publish_event(CHECKOUT_COMPLETED, {"checkin_id": r.checkin_id, "room_number": r.room_number})
+    return BulkCheckoutResponse(
+        message="Bulk check-out processed",
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
+
+
+@router.get(
+    "/availability",
+    response_model=RoomAvailabilityResponse,
+    summary="房间可用性查询接口",
+    description=(
+        "查询在 [start_date, end_date) 每晚均空闲的房间。\n"
+        "基于进程内的房间占用位图计算，不访问入住记录表；"
+        "日期需在可用性视野内（今天起 AVAILABILITY_HORIZON_DAYS 天）。"
+    )
+)
+async def room_availability(
+    start_date: date = Query(..., description="入住日期（第一晚）"),
+    end_date: date = Query(..., description="离店日期（最后一晚的次日）"),
+    current_user = Depends(get_current_user_read),
+):
+    if end_date <= start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must be after start_date")
+    try:
+        available_rooms = availability_service.free_rooms(start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return RoomAvailabilityResponse(
+        start_date=start_date,
+        end_date=end_date,
+        nights=(end_date - start_date).days,
+        available_rooms=available_rooms,
+    )
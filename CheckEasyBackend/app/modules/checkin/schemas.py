@@ -1,8 +1,8 @@
 # File: CheckEasyBackend/app/modules/checkin/schemas.py
 
 from pydantic import BaseModel, Field, constr, field_validator
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import date, datetime
+from typing import Optional, Dict, Any, List, Literal
 
 class CheckinRequest(BaseModel):
     """
@@ -40,6 +40,11 @@ class CheckinRequest(BaseModel):
         description="房间号", 
         example="101"
     )
+    expected_checkout_date: Optional[date] = Field(
+        None,
+        description="预计退房日期（用于房间可用性规划，未填写时视为长期占用）",
+        example="2025-03-08"
+    )
     remarks: Optional[str] = Field(
         None, 
         description="入住备注", 
@@ -112,4 +117,93 @@ class CheckinResponse(BaseModel):
         None, 
         description="其他附加信息", 
         example={"source": "mobile app"}
-    )
\ No newline at end of file
+    )
+
+
+class BulkCheckinRequest(BaseModel):
+    """
+    团体批量入住请求：每一项与单人入住请求格式相同，room_number 为必填。
+    """
+    items: List[CheckinRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="入住项列表（每项一位入住人）"
+    )
+
+
+class BulkCheckinItemResult(BaseModel):
+    """
+    批量入住中单项的处理结果。
+    """
+    index: int = Field(..., description="在请求 items 中的位置", example=0)
+    user_id: int = Field(..., description="用户ID", example=123)
+    room_number: Optional[str] = Field(None, description="房间号", example="101")
+    status: Literal["checked_in", "conflict", "rejected"] = Field(
+        ...,
+        description="checked_in: 入住成功；conflict: 房间或用户已有活跃入住；rejected: 不满足入住规则",
+        example="checked_in"
+    )
+    checkin_id: Optional[int] = Field(None, description="入住记录ID（成功时返回）", example=456)
+    detail: Optional[str] = Field(None, description="失败原因", example="Room 101 is already occupied.")
+
+
+class BulkCheckinResponse(BaseModel):
+    """
+    批量入住响应：部分失败不影响其他项。
+    """
+    message: str = Field(..., description="处理结果提示信息", example="Bulk check-in processed")
+    succeeded: int = Field(..., description="成功入住数", example=28)
+    failed: int = Field(..., description="失败数", example=2)
+    results: List[BulkCheckinItemResult] = Field(..., description="逐项结果，顺序与请求一致")
+
+
+class BulkCheckoutRequest(BaseModel):
+    """
+    批量退房请求。
+    """
+    checkin_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="需要退房的入住记录ID列表",
+        example=[456, 457]
+    )
+    checkout_time: Optional[datetime] = Field(
+        None,
+        description="退房时间（ISO 8601 格式），默认为当前时间",
+        example="2025-03-08T11:00:00Z"
+    )
+
+
+class BulkCheckoutItemResult(BaseModel):
+    """
+    批量退房中单项的处理结果。
+    """
+    checkin_id: int = Field(..., description="入住记录ID", example=456)
+    status: Literal["checked_out", "not_active", "not_found"] = Field(
+        ...,
+        description="checked_out: 退房成功；not_active: 记录不处于入住状态；not_found: 记录不存在",
+        example="checked_out"
+    )
+    room_number: Optional[str] = Field(None, description="房间号", example="101")
+
+
+class BulkCheckoutResponse(BaseModel):
+    """
+    批量退房响应。
+    """
+    message: str = Field(..., description="处理结果提示信息", example="Bulk check-out processed")
+    succeeded: int = Field(..., description="成功退房数", example=30)
+    failed: int = Field(..., description="失败数", example=0)
+    results: List[BulkCheckoutItemResult] = Field(..., description="逐项结果，顺序与请求一致")
+
+
+class RoomAvailabilityResponse(BaseModel):
+    """
+    房间可用性查询响应。
+    """
+    start_date: date = Field(..., description="入住日期（第一晚）", example="2025-03-05")
+    end_date: date = Field(..., description="离店日期（最后一晚的次日）", example="2025-03-08")
+    nights: int = Field(..., description="晚数", example=3)
+    available_rooms: List[str] = Field(..., description="区间内每晚均空闲的房间号", example=["101", "205"])
@@ -1,13 +1,25 @@
 # File: CheckEasyBackend/app/modules/checkin/utils.py
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import String, cast, exists, literal, null, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.db import dialect_insert
 from app.modules.checkin.models import CheckinRecord, CheckinStatus
-from app.modules.user.models import User  # 假设用户模型在这里
-# 若有证件模块，可从相应模块导入相关验证函数，如：verify_certificate()
+from app.modules.checkin.availability import availability_service
+from app.modules.checkin.occupancy import occupancy_index
+from app.modules.verification.certificates import resolve_certificate_validities, resolve_certificate_validity
+from app.modules.checkin.schemas import (
+    CheckinRequest,
+    BulkCheckinItemResult,
+    BulkCheckoutItemResult,
+)
+from app.modules.auth.register.models import User
 
 logger = logging.getLogger("CheckEasyBackend.checkin.utils")
 
@@ -36,102 +48,277 @@ class ActiveCheckinExistsException(CheckinException):
     pass
 
 
+def active_checkin_conflict(error: IntegrityError, user_id: int, room_number: str) -> CheckinException:
+    """
+    将活跃入住部分唯一索引的冲突转换为对应的业务异常。
+    """
+    if "uq_checkin_active_user" in str(error.orig):
+        return ActiveCheckinExistsException(f"User {user_id} already has an active checkin.")
+    return RoomOccupiedException(f"Room {room_number} is already occupied.")
+
+
 # ---------------------------
 # 业务规则验证函数
 # ---------------------------
-async def check_existing_active_checkin(user_id: int, db: AsyncSession) -> None:
+def _blacklisted_clause(user_id: int):
+    # User 模型若定义了 blacklisted 字段则检查黑名单，否则该规则恒为通过
+    blacklisted = getattr(User, "blacklisted", None)
+    if blacklisted is None:
+        return literal(False)
+    return exists().where(User.id == user_id, blacklisted.is_(True))
+
+
+def _active_checkin_id(*conditions):
+    return (
+        select(CheckinRecord.id)
+        .where(CheckinRecord.status == CheckinStatus.checked_in, *conditions)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def build_checkin_rules_query(user_id: int, room_number: str):
     """
-    检查用户是否已有活跃入住记录（状态为 'checked_in'）。
-    若发现，则抛出 ActiveCheckinExistsException 异常。
+    构造入住规则校验查询，一次往返返回所有规则结果：
+      - blacklisted: 用户是否在黑名单中；
+      - active_checkin_id: 用户已有的活跃入住记录 ID（无则为 NULL）；
+      - occupied_checkin_id: 占用该房间的活跃入住记录 ID（无则为 NULL）。
+    两个子查询分别命中部分唯一索引 uq_checkin_active_user / uq_checkin_active_room。
     """
-    try:
-        query = select(CheckinRecord).where(
-            CheckinRecord.user_id == user_id,
-            CheckinRecord.status == CheckinStatus.checked_in
-        )
-        result = await db.execute(query)
-        active_record = result.scalars().first()
-        if active_record:
-            raise ActiveCheckinExistsException(
-                f"User {user_id} already has an active checkin (Checkin ID: {active_record.id})."
-            )
-    except Exception as e:
-        logger.error("Error checking active checkin for user_id %s: %s", user_id, str(e), exc_info=True)
-        raise
+    room_clause = (
+        _active_checkin_id(CheckinRecord.room_number == room_number)
+        if room_number
+        else null()
+    )
+    return select(
+        _blacklisted_clause(user_id).label("blacklisted"),
+        _active_checkin_id(CheckinRecord.user_id == user_id).label("active_checkin_id"),
+        room_clause.label("occupied_checkin_id"),
+    )
 
 
-async def is_room_available(room_number: str, db: AsyncSession) -> None:
+async def validate_checkin_request(user_id: int, room_number: str, certificate_id: str, db: AsyncSession) -> None:
     """
-    检查指定房间是否可用：即是否存在状态为 'checked_in' 的入住记录。
-    若房间已被占用，则抛出 RoomOccupiedException 异常。
+    综合入口函数，用于验证入住请求（单条查询完成全部规则检查）：
+      - 验证用户资格（黑名单检查）；
+      - 验证用户是否已有活跃入住；
+      - 验证房间是否可用。
+    证件有效性由 verify_certificate 单独核验。若验证通过，则函数正常返回；否则，按上述顺序抛出第一个不满足规则对应的异常。
     """
     try:
-        query = select(CheckinRecord).where(
-            CheckinRecord.room_number == room_number,
-            CheckinRecord.status == CheckinStatus.checked_in
-        )
-        result = await db.execute(query)
-        occupied_record = result.scalars().first()
-        if occupied_record:
-            raise RoomOccupiedException(
-                f"Room {room_number} is already occupied (Checkin ID: {occupied_record.id})."
-            )
+        outcome = (await db.execute(build_checkin_rules_query(user_id, room_number))).one()
     except Exception as e:
-        logger.error("Error checking room availability for room %s: %s", room_number, str(e), exc_info=True)
+        logger.error("Error validating checkin rules for user_id %s: %s", user_id, str(e), exc_info=True)
         raise
 
+    if outcome.blacklisted:
+        raise UserBlacklistedException(f"User {user_id} is blacklisted and cannot check in.")
+    if outcome.active_checkin_id is not None:
+        raise ActiveCheckinExistsException(
+            f"User {user_id} already has an active checkin (Checkin ID: {outcome.active_checkin_id})."
+        )
+    if outcome.occupied_checkin_id is not None:
+        raise RoomOccupiedException(
+            f"Room {room_number} is already occupied (Checkin ID: {outcome.occupied_checkin_id})."
+        )
+    logger.info("All checkin business rules validated for user_id: %s", user_id)
+
 
-async def verify_user_eligibility(user_id: int, db: AsyncSession) -> None:
+async def verify_certificate(certificate_id: str, user_id: int, db: AsyncSession) -> None:
     """
-    验证用户是否符合入住资格（例如：是否在黑名单中）。
-    假设 User 模型有 'blacklisted' 字段表示用户是否被禁止入住。
-    若用户不合格，则抛出 UserBlacklistedException 异常。
+    根据已存储的 OCR 识别结果与人工审核结论核验入住证件（带有效性缓存）。
+    证件不存在、待审核、被驳回或已过期时抛出 CertificateInvalidException。
     """
-    try:
-        query = select(User).where(User.id == user_id)
-        result = await db.execute(query)
-        user = result.scalars().first()
-        if user and getattr(user, "blacklisted", False):
-            raise UserBlacklistedException(f"User {user_id} is blacklisted and cannot check in.")
-    except Exception as e:
-        logger.error("Error verifying eligibility for user_id %s: %s", user_id, str(e), exc_info=True)
-        raise
+    outcome = await resolve_certificate_validity(certificate_id, user_id, db)
+    if not outcome["valid"]:
+        raise CertificateInvalidException(f"Certificate verification failed: {outcome['message']}")
+
+
+# 兼容旧名称
+validate_checkin = validate_checkin_request
 
 
-async def validate_checkin(user_id: int, room_number: str, certificate_id: str, db: AsyncSession) -> None:
+# ---------------------------
+# 批量入住 / 退房
+# ---------------------------
+def build_bulk_rules_query(user_ids: List[int], room_numbers: List[str]):
     """
-    综合验证入住请求的业务规则：
-      1. 检查用户是否已有活跃入住记录；
-      2. 检查指定房间是否可用；
-      3. 验证用户证件有效性（此处预留调用 Verification 模块逻辑）；
-      4. 检查用户是否具备入住资格（例如不在黑名单中）。
-    若任何一项验证失败，则抛出相应异常。
+    构造批量入住的集合式规则校验查询，一次往返返回所有冲突：
+    每行为 (rule, key, checkin_id)，rule 取值 active_user / occupied_room / blacklisted。
     """
-    # 验证用户资格
-    await verify_user_eligibility(user_id, db)
-    # 检查用户是否已有活跃入住记录
-    await check_existing_active_checkin(user_id, db)
-    # 检查房间是否可用
-    await is_room_available(room_number, db)
-    # 预留：调用证件验证逻辑（例如，verify_certificate(certificate_id, user_id, db)）
-    # 如果验证不通过，抛出 CertificateInvalidException
-    logger.info("Checkin validation passed for user_id: %s, room: %s", user_id, room_number)
+    active = CheckinRecord.status == CheckinStatus.checked_in
+    queries = [
+        select(literal("active_user").label("rule"), cast(CheckinRecord.user_id, String).label("key"), CheckinRecord.id)
+        .where(active, CheckinRecord.user_id.in_(user_ids)),
+        select(literal("occupied_room").label("rule"), CheckinRecord.room_number.label("key"), CheckinRecord.id)
+        .where(active, CheckinRecord.room_number.in_(room_numbers)),
+    ]
+    blacklisted = getattr(User, "blacklisted", None)
+    if blacklisted is not None:
+        queries.append(
+            select(literal("blacklisted").label("rule"), cast(User.id, String).label("key"), null())
+            .where(User.id.in_(user_ids), blacklisted.is_(True))
+        )
+    return union_all(*queries)
 
 
-async def validate_checkin_request(user_id: int, room_number: str, certificate_id: str, db: AsyncSession) -> None:
+async def bulk_checkin(items: List[CheckinRequest], db: AsyncSession) -> List[BulkCheckinItemResult]:
     """
-    综合入口函数，用于验证入住请求：
-      - 验证用户资格（黑名单检查）；
-      - 验证用户是否已有活跃入住；
-      - 验证房间是否可用；
-      - 预留证件有效性检查。
-    若验证通过，则函数正常返回；否则，抛出相应异常。
+    团体批量入住：
+      1. 批内去重（同一房间或同一用户只保留第一项）；
+      2. 单条集合式查询校验所有规则；
+      3. 按已存储的 OCR / 人工审核结论批量核验证件，无效证件记为 rejected；
+      4. 通过占用热索引预占房间；
+      5. 多行 INSERT ... ON CONFLICT DO NOTHING RETURNING 在同一事务中写入，
+         并发写入导致的唯一索引冲突按行记为 conflict，不影响其他项；
+      6. 成功的入住项更新房间可用性位图。
+    返回与 items 顺序一致的逐项结果。
+    """
+    results: Dict[int, BulkCheckinItemResult] = {}
+
+    def fail(index: int, item: CheckinRequest, outcome: str, detail: str) -> None:
+        results[index] = BulkCheckinItemResult(
+            index=index, user_id=item.user_id, room_number=item.room_number, status=outcome, detail=detail
+        )
+
+    candidates: Dict[int, CheckinRequest] = {}
+    seen_rooms, seen_users = set(), set()
+    for index, item in enumerate(items):
+        if not item.room_number:
+            fail(index, item, "rejected", "room_number is required for group check-in.")
+        elif item.room_number in seen_rooms:
+            fail(index, item, "conflict", f"Room {item.room_number} is assigned more than once in this request.")
+        elif item.user_id in seen_users:
+            fail(index, item, "conflict", f"User {item.user_id} appears more than once in this request.")
+        else:
+            candidates[index] = item
+        seen_rooms.add(item.room_number)
+        seen_users.add(item.user_id)
+
+    if candidates:
+        conflicts = (await db.execute(build_bulk_rules_query(
+            [item.user_id for item in candidates.values()],
+            [item.room_number for item in candidates.values()],
+        ))).all()
+        blacklisted_users = {row.key for row in conflicts if row.rule == "blacklisted"}
+        active_users = {row.key: row.id for row in conflicts if row.rule == "active_user"}
+        occupied_rooms = {row.key: row.id for row in conflicts if row.rule == "occupied_room"}
+
+        for index, item in list(candidates.items()):
+            if str(item.user_id) in blacklisted_users:
+                fail(index, item, "rejected", f"User {item.user_id} is blacklisted and cannot check in.")
+            elif str(item.user_id) in active_users:
+                fail(index, item, "conflict", f"User {item.user_id} already has an active checkin "
+                                              f"(Checkin ID: {active_users[str(item.user_id)]}).")
+            elif item.room_number in occupied_rooms:
+                fail(index, item, "conflict", f"Room {item.room_number} is already occupied "
+                                              f"(Checkin ID: {occupied_rooms[item.room_number]}).")
+            else:
+                continue
+            del candidates[index]
+
+    # 证件核验，规则与单人入住的 verify_certificate 相同；缓存未命中的证件合并为一次查询
+    if candidates:
+        keys = {index: (item.certificate_id or item.certificate_number, item.user_id) for index, item in candidates.items()}
+        validities = await resolve_certificate_validities([key for key in keys.values() if key[0]], db)
+        for index, key in keys.items():
+            outcome = validities.get(key) or {"message": "certificate_id or certificate_number is required."}
+            if not outcome.get("valid"):
+                fail(index, candidates.pop(index), "rejected", f"Certificate verification failed: {outcome['message']}")
+
+    # 预占房间，与单人入住共享同一占用热索引；热索引故障时不预占，由唯一索引兜底（ON CONFLICT 按行记为 conflict）
+    attempts = dict(zip(
+        candidates.keys(),
+        await asyncio.gather(*(occupancy_index.try_reserve(item.room_number) for item in candidates.values())),
+    ))
+    reservations = {index: reservation for index, (_, reservation) in attempts.items()}
+    for index, (occupied, _) in attempts.items():
+        if occupied:
+            fail(index, candidates.pop(index), "conflict", "Room is already occupied.")
+
+    inserted: Dict[str, int] = {}
+    if candidates:
+        try:
+            statement = dialect_insert(db)(CheckinRecord).values([
+                {
+                    "user_id": item.user_id,
+                    "certificate_id": item.certificate_id,
+                    "checkin_time": item.checkin_time.replace(tzinfo=None),
+                    "status": CheckinStatus.checked_in,
+                    "room_number": item.room_number,
+                    "expected_checkout_date": item.expected_checkout_date,
+                    "remarks": item.remarks,
+                    "additional_info": item.additional_info,
+                }
+                for item in candidates.values()
+            ]).on_conflict_do_nothing().returning(CheckinRecord.id, CheckinRecord.room_number)
+            inserted = {row.room_number: row.id for row in (await db.execute(statement)).all()}
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            await asyncio.gather(*(r.release() for r in reservations.values() if r is not None))
+            raise
+
+    for index, item in candidates.items():
+        reservation = reservations[index]
+        checkin_id = inserted.get(item.room_number)
+        if checkin_id is None:
+            if reservation is not None:
+                await reservation.release()
+            fail(index, item, "conflict", f"Room {item.room_number} or user {item.user_id} was checked in concurrently.")
+            continue
+        if reservation is not None:
+            await reservation.confirm(checkin_id)
+        availability_service.record_checkin(item.room_number, item.checkin_time, item.expected_checkout_date)
+        results[index] = BulkCheckinItemResult(
+            index=index, user_id=item.user_id, room_number=item.room_number,
+            status="checked_in", checkin_id=checkin_id,
+        )
+
+    logger.info("Bulk checkin processed: %s items, %s checked in", len(items), len(inserted))
+    return [results[index] for index in range(len(items))]
+
+
+async def bulk_checkout(
+    checkin_ids: List[int], checkout_time: Optional[datetime], db: AsyncSession
+) -> List[BulkCheckoutItemResult]:
+    """
+    批量退房：单条 UPDATE ... RETURNING 将所有处于入住状态的记录置为 checked_out，
+    未更新的记录再用一条查询区分“非入住状态”与“不存在”。提交后释放占用热索引中的房间并更新可用性位图。
     """
-    await verify_user_eligibility(user_id, db)
-    await check_existing_active_checkin(user_id, db)
-    await is_room_available(room_number, db)
-    # 调用证件有效性验证逻辑（如果有），例如：
-    # certificate_valid = await verify_certificate(certificate_id, user_id, db)
-    # if not certificate_valid:
-    #     raise CertificateInvalidException("The provided certificate is invalid or expired.")
-    logger.info("All checkin business rules validated for user_id: %s", user_id)
\ No newline at end of file
+    checkout_time = (checkout_time or datetime.utcnow()).replace(tzinfo=None)
+    ids = list(dict.fromkeys(checkin_ids))
+
+    updated = {
+        row.id: row.room_number
+        for row in (await db.execute(
+            update(CheckinRecord)
+            .where(CheckinRecord.id.in_(ids), CheckinRecord.status == CheckinStatus.checked_in)
+            .values(status=CheckinStatus.checked_out, checkout_time=checkout_time)
+            .returning(CheckinRecord.id, CheckinRecord.room_number)
+        )).all()
+    }
+    missing = [checkin_id for checkin_id in ids if checkin_id not in updated]
+    existing = {}
+    if missing:
+        existing = {
+            row.id: row.room_number
+            for row in (await db.execute(
+                select(CheckinRecord.id, CheckinRecord.room_number).where(CheckinRecord.id.in_(missing))
+            )).all()
+        }
+    await db.commit()
+
+    await asyncio.gather(*(occupancy_index.release_room(room) for room in updated.values() if room))
+    availability_service.record_checkouts(updated.values(), checkout_time)
+
+    results = []
+    for checkin_id in checkin_ids:
+        if checkin_id in updated:
+            results.append(BulkCheckoutItemResult(checkin_id=checkin_id, status="checked_out", room_number=updated[checkin_id]))
+        elif checkin_id in existing:
+            results.append(BulkCheckoutItemResult(checkin_id=checkin_id, status="not_active", room_number=existing[checkin_id]))
+        else:
+            results.append(BulkCheckoutItemResult(checkin_id=checkin_id, status="not_found"))
+    logger.info("Bulk checkout processed: %s items, %s checked out", len(checkin_ids), len(updated))
+    return results
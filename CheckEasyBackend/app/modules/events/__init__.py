@@ -0,0 +1 @@
+# File: CheckEasyBackend/app/modules/events/__init__.py
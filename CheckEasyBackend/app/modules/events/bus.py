@@ -0,0 +1,70 @@
+# File: CheckEasyBackend/app/modules/events/bus.py
+
+import json
+import logging
+import time
+from typing import AsyncIterator, Iterable, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import async_r
+
+logger = logging.getLogger("CheckEasyBackend.events.bus")
+
+# 事件类型
+OCR_COMPLETED = "ocr.completed"
+REVIEW_DECIDED = "review.decided"
+CHECKIN_CREATED = "checkin.created"
+CHECKOUT_COMPLETED = "checkout.completed"
+
+
+def property_channel() -> str:
+    """前台频道：本物业的全部事件。"""
+    return f"events:property:{settings.PROPERTY_ID}"
+
+
+def user_channel(user_id: int) -> str:
+    """用户频道：与该用户相关的事件。"""
+    return f"events:user:{user_id}"
+
+
+async def publish_event(event_type: str, data: dict, user_id: Optional[int] = None) -> None:
+    """
+    通过 Redis pub/sub 发布事件到物业频道，以及（指定 user_id 时）用户频道。
+    事件推送是尽力而为的：发布失败只记录日志，不影响业务请求。
+    """
+    message = json.dumps(
+        {"type": event_type, "user_id": user_id, "data": data, "ts": time.time()},
+        ensure_ascii=False,
+        default=str,
+    )
+    try:
+        await async_r.publish(property_channel(), message)
+        if user_id is not None:
+            await async_r.publish(user_channel(user_id), message)
+        metrics.inc("events_published_total", type=event_type)
+    except Exception as e:
+        metrics.inc("events_publish_failed_total", type=event_type)
+        logger.warning("Failed to publish event %s: %s", event_type, e)
+
+
+async def listen(channels: Iterable[str], heartbeat: float) -> AsyncIterator[Optional[dict]]:
+    """
+    订阅指定频道并逐条产出事件；heartbeat 秒内无事件时产出 None，供调用方发送心跳。
+    生成器关闭时退订并释放连接。
+    """
+    pubsub = async_r.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(*channels)
+    try:
+        while True:
+            message = await pubsub.get_message(timeout=heartbeat)
+            if message is None:
+                yield None
+                continue
+            try:
+                yield json.loads(message["data"])
+            except (TypeError, ValueError):
+                logger.warning("Dropping malformed event on %s", message.get("channel"))
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
@@ -0,0 +1,85 @@
+# File: CheckEasyBackend/app/modules/events/routes.py
+
+import json
+import logging
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Request, Query, status, Depends
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.dependencies import _resolve_user, get_correlation_id
+from app.core.metrics import metrics
+from app.modules.events.bus import listen, property_channel, user_channel
+
+router = APIRouter()
+logger = logging.getLogger("CheckEasyBackend.events.routes")
+
+# 浏览器 EventSource 无法设置请求头，允许通过 access_token 查询参数传递令牌
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
+
+
+@router.get(
+    "/stream",
+    summary="前台实时事件流（SSE）",
+    description=(
+        "以 Server-Sent Events 推送 OCR 完成、人工审核结果、入住与退房事件，替代前台终端轮询。\n"
+        "- scope=me：仅推送与当前用户相关的事件；\n"
+        "- scope=property：推送本物业全部事件（仅限管理员）。\n"
+        "令牌可通过 Authorization 头或 access_token 查询参数传递。"
+    ),
+    response_class=StreamingResponse,
+)
+async def event_stream(
+    request: Request,
+    scope: Literal["me", "property"] = Query("me", description="订阅范围"),
+    access_token: Optional[str] = Query(None, description="访问令牌（无法设置请求头的客户端使用）"),
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    correlation_id: str = Depends(get_correlation_id),
+):
+    token = header_token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # 仅在建立连接时查询一次用户，避免长连接期间占用数据库连接
+    async with AsyncSessionLocal() as db:
+        current_user = await _resolve_user(token, db)
+
+    if scope == "property":
+        if not current_user.is_admin:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        channel = property_channel()
+    else:
+        channel = user_channel(current_user.id)
+
+    logger.info(
+        "Event stream opened",
+        extra={"user_id": current_user.id, "scope": scope, "correlation_id": correlation_id}
+    )
+
+    async def stream():
+        metrics.inc("events_stream_opened_total", scope=scope)
+        events = listen([channel], settings.EVENTS_HEARTBEAT_SECONDS)
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            await events.aclose()
+            metrics.inc("events_stream_closed_total", scope=scope)
+            logger.info("Event stream closed", extra={"user_id": current_user.id, "correlation_id": correlation_id})
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
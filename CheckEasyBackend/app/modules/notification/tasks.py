@@ -4,7 +4,7 @@ import os
 import logging
 from celery import Celery, Task
 from celery.utils.log import get_task_logger
-from app.core.email import send_email  # 企业级邮件发送函数
+from app.core.email import send_email, send_email_batch  # 企业级邮件发送函数
 
 # 从环境变量或全局配置中加载 Celery 配置
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
@@ -13,8 +13,11 @@ CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:63
 # 初始化 Celery 应用
 celery_app = Celery("notification_tasks", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
 celery_app.conf.task_routes = {
-    "app.modules.notification.tasks.send_email_notification": {"queue": "notification"}
+    "app.modules.notification.tasks.send_email_notification": {"queue": "notification"},
+    "app.modules.notification.tasks.send_email_batch_notification": {"queue": "notification"},
 }
+# 其他模块的任务在 worker 启动时加载（各模块在自身 tasks.py 中追加路由与定时配置）
+celery_app.conf.include = ["app.modules.verification.ocr.tasks"]
 
 # 使用 Celery 内置日志记录器
 logger = get_task_logger(__name__)
@@ -62,4 +65,22 @@ def send_email_notification(self, notification_data):
             extra={"notification_data": notification_data, "error": str(exc)},
             exc_info=True
         )
-        raise self.retry(exc=exc)
\ No newline at end of file
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(bind=True, base=BaseTaskWithRetry, name="app.modules.notification.tasks.send_email_batch_notification")
+def send_email_batch_notification(self, messages):
+    """
+    异步任务函数：批量发送邮件通知（单个 SMTP 会话）
+
+    Args:
+        messages: 邮件列表，每项为包含 to、subject、body 的字典。
+
+    连接失败时整批重试；个别收件人失败时仅重试失败的邮件，已发送的不会重复发送。
+    """
+    logger.info("Starting batch email notification task", extra={"count": len(messages)})
+    failed = send_email_batch(messages)
+    if failed:
+        logger.warning("Retrying failed emails in batch", extra={"failed": [m["to"] for m in failed]})
+        raise self.retry(args=(failed,))
+    logger.info("Batch email notification sent successfully", extra={"count": len(messages)})
@@ -0,0 +1,158 @@
+# 代码路径: app/modules/verification/certificates.py
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.db import PrimarySession
+from app.core.metrics import metrics
+from app.modules.events.bus import OCR_COMPLETED, REVIEW_DECIDED, listen, property_channel
+from app.modules.verification.manual.models import ManualReview, ReviewStatus
+from app.modules.verification.ocr.models import OCRResult, OCRStatus
+
+logger = logging.getLogger("CheckEasyBackend.verification.certificates")
+
+
+@dataclass(frozen=True)
+class CertificateRecord:
+    """
+    证件核验所需的已存储结果：最近一次 OCR 记录及其人工审核结论。
+    有效期按查询当天判断，因此缓存条目无需随日期变化失效。
+    """
+    ocr_result_id: int
+    document_number: str
+    expiry_date: Optional[date]
+    ocr_status: OCRStatus
+    review_required: bool
+    review_status: Optional[ReviewStatus]
+
+    def validity(self, today: date) -> Dict[str, Any]:
+        if self.review_status == ReviewStatus.rejected:
+            return {"valid": False, "status": "rejected", "message": "Certificate was rejected in manual review."}
+        if self.ocr_status == OCRStatus.failed and self.review_status != ReviewStatus.approved:
+            return {"valid": False, "status": "failed", "message": "Certificate could not be recognized."}
+        if self.review_required and self.review_status != ReviewStatus.approved:
+            return {"valid": False, "status": "pending_review", "message": "Certificate is awaiting manual review."}
+        if self.expiry_date is None:
+            return {"valid": False, "status": "unknown_expiry", "message": "Certificate expiry date is unknown."}
+        if self.expiry_date < today:
+            return {"valid": False, "status": "expired", "message": "Certificate is expired."}
+        return {"valid": True, "status": "valid", "message": "Certificate is valid."}
+
+
+# 证件号 -> {用户ID: CertificateRecord}；未找到的结果不缓存，避免刚上传的证件在 TTL 内查不到
+_certificate_cache: TTLCache = TTLCache(maxsize=10000, ttl=settings.CERTIFICATE_CACHE_TTL)
+
+
+async def fetch_certificate_records(
+    keys: List[Tuple[str, int]], db: AsyncSession
+) -> Dict[Tuple[str, int], CertificateRecord]:
+    """
+    一次查询取得多个 (证件号, 用户ID) 各自最近一次上传的 OCR 记录，并左连接其最新的人工审核结论。
+    通过证件号码索引过滤，ROW_NUMBER() 按上传时间、审核时间倒序取每组第一行。
+    """
+    ranked = (
+        select(
+            OCRResult.id,
+            OCRResult.document_number,
+            OCRResult.user_id,
+            OCRResult.expiry_date,
+            OCRResult.status,
+            OCRResult.review_required,
+            ManualReview.status.label("review_status"),
+            func.row_number().over(
+                partition_by=(OCRResult.document_number, OCRResult.user_id),
+                order_by=(OCRResult.upload_time.desc(), ManualReview.reviewed_at.desc().nulls_last()),
+            ).label("rank"),
+        )
+        .outerjoin(ManualReview, ManualReview.ocr_result_id == OCRResult.id)
+        .where(tuple_(OCRResult.document_number, OCRResult.user_id).in_(keys))
+        .subquery()
+    )
+    rows = (await db.execute(select(ranked).where(ranked.c.rank == 1))).all()
+    return {
+        (row.document_number, row.user_id): CertificateRecord(
+            ocr_result_id=row.id,
+            document_number=row.document_number,
+            expiry_date=row.expiry_date,
+            ocr_status=row.status,
+            review_required=bool(row.review_required),
+            review_status=row.review_status,
+        )
+        for row in rows
+    }
+
+
+async def resolve_certificate_validities(
+    keys: List[Tuple[str, int]], db: AsyncSession
+) -> Dict[Tuple[str, int], Dict[str, Any]]:
+    """
+    批量核验证件（团体入住）：先读有效性缓存，所有未命中的 (证件号, 用户ID) 合并为一次查询；
+    仅当 db 为主库会话时写入缓存。
+    返回每个 key 的 {"valid": bool, "status": str, "message": str}。
+    """
+    records: Dict[Tuple[str, int], Optional[CertificateRecord]] = {}
+    misses = []
+    for key in dict.fromkeys(keys):
+        records[key] = _certificate_cache.get(key[0], {}).get(key[1])
+        if records[key] is None:
+            misses.append(key)
+    if len(records) > len(misses):
+        metrics.inc("certificate_cache_total", len(records) - len(misses), result="hit")
+    if misses:
+        metrics.inc("certificate_cache_total", len(misses), result="miss")
+        fetched = await fetch_certificate_records(misses, db)
+        # 只缓存主库读到的结果：副本可能滞后于刚做出的审核结论，而失效通知已在此之前发出
+        if isinstance(db.sync_session, PrimarySession):
+            for key, record in fetched.items():
+                _certificate_cache.setdefault(key[0], {})[key[1]] = record
+        records.update(fetched)
+
+    today = datetime.utcnow().date()
+    return {
+        key: record.validity(today) if record is not None
+        else {"valid": False, "status": "not_found", "message": f"Certificate {key[0]} not found."}
+        for key, record in records.items()
+    }
+
+
+async def resolve_certificate_validity(certificate_id: str, user_id: int, db: AsyncSession) -> Dict[str, Any]:
+    """
+    入住时核验证件：优先读取有效性缓存，未命中时查库（主库会话时写入缓存）。
+    返回 {"valid": bool, "status": str, "message": str}，与 process_certificate_verification 的结果格式一致。
+    """
+    key = (certificate_id, user_id)
+    return (await resolve_certificate_validities([key], db))[key]
+
+
+def invalidate_certificate(document_number: Optional[str]) -> None:
+    """
+    使某证件号的缓存失效（人工审核结论变化或重新上传证件时调用）。
+    """
+    if document_number:
+        _certificate_cache.pop(document_number, None)
+
+
+async def certificate_invalidation_loop() -> None:
+    """
+    订阅物业事件频道，收到其他 worker 发布的审核结论或证件上传事件时同步失效本进程缓存。
+    事件推送为尽力而为，缓存 TTL（CERTIFICATE_CACHE_TTL）兜底。
+    """
+    while True:
+        try:
+            async for event in listen([property_channel()], settings.EVENTS_HEARTBEAT_SECONDS):
+                if event and event.get("type") in (REVIEW_DECIDED, OCR_COMPLETED):
+                    invalidate_certificate(event.get("data", {}).get("document_number"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Certificate invalidation listener failed, retrying: %s", e)
+            await asyncio.sleep(5)
@@ -0,0 +1,137 @@
+# 代码路径: app/modules/verification/images.py
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger("CheckEasyBackend.verification.images")
+
+DOCUMENT_STORE_DIR = Path(settings.DOCUMENT_STORE_DIR).resolve()
+DERIVATIVE_DIR = DOCUMENT_STORE_DIR / "derivatives"
+
+
+@dataclass(frozen=True)
+class DerivativeSpec:
+    """
+    派生图片规格：最长边像素、JPEG 质量，以及可选的相对裁剪区域 (左, 上, 右, 下)。
+    """
+    max_side: int
+    quality: int
+    crop: Optional[Tuple[float, float, float, float]] = None
+    grayscale: bool = False
+
+
+# thumbnail：列表缩略图；review：审核页查看大小；
+# mrz：护照数据页底部机读区（TD3 版式下 MRZ 约占页面高度的下 25%），灰度便于核对字符
+DERIVATIVES: Dict[str, DerivativeSpec] = {
+    "thumbnail": DerivativeSpec(max_side=settings.IMAGE_THUMBNAIL_SIZE, quality=80),
+    "review": DerivativeSpec(max_side=settings.IMAGE_REVIEW_SIZE, quality=85),
+    "mrz": DerivativeSpec(max_side=settings.IMAGE_REVIEW_SIZE, quality=90, crop=(0.0, 0.75, 1.0, 1.0), grayscale=True),
+}
+
+# 同一进程内同一派生图只生成一次；多进程并发生成时依靠原子重命名保证文件完整。
+# 弱引用字典：只要还有请求持有或等待某把锁，它就留在字典中，最后一个请求结束后自动移除
+_generation_locks: "weakref.WeakValueDictionary[Tuple[int, str], asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+class ImageNotAvailable(Exception):
+    """原图不存在或不在文档存储目录内"""
+    pass
+
+
+def resolve_source(image_path: Optional[str]) -> Path:
+    """
+    解析数据库中保存的原图路径，并确认其位于文档存储目录内，防止路径穿越。
+    """
+    if not image_path:
+        raise ImageNotAvailable("No image stored for this record.")
+    source = Path(image_path).resolve()
+    if DOCUMENT_STORE_DIR not in source.parents or not source.is_file():
+        raise ImageNotAvailable("Stored image is missing.")
+    return source
+
+
+def _find_derivative(directory: Path, variant: str) -> Optional[Tuple[Path, str]]:
+    # 文件名形如 review.<etag>.jpg，ETag 为内容摘要，无需每次请求重新计算
+    for candidate in directory.glob(f"{variant}.*.jpg"):
+        return candidate, candidate.name.split(".")[1]
+    return None
+
+
+def _render_derivative(source: Path, directory: Path, variant: str) -> Tuple[Path, str]:
+    from PIL import Image, ImageOps  # 延迟导入：只在生成派生图时需要
+
+    spec = DERIVATIVES[variant]
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if spec.crop:
+            left, top, right, bottom = spec.crop
+            width, height = image.size
+            image = image.crop((int(width * left), int(height * top), int(width * right), int(height * bottom)))
+        image = image.convert("L" if spec.grayscale else "RGB")
+        image.thumbnail((spec.max_side, spec.max_side), Image.Resampling.LANCZOS)
+
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                image.save(tmp, format="JPEG", quality=spec.quality, optimize=True, progressive=True)
+            with open(tmp_name, "rb") as tmp:
+                etag = hashlib.sha256(tmp.read()).hexdigest()[:32]
+            # 先原子替换再删除旧版本：其他请求刚拿到的旧路径在新文件就位前一直有效
+            target = directory / f"{variant}.{etag}.jpg"
+            os.replace(tmp_name, target)
+            for stale in directory.glob(f"{variant}.*.jpg"):
+                if stale != target:
+                    stale.unlink(missing_ok=True)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    return target, etag
+
+
+async def get_derivative(ocr_result_id: int, image_path: Optional[str], variant: str) -> Tuple[Path, str]:
+    """
+    返回 (派生图片路径, 强 ETag)。首次访问时由原图生成并保存在 DOCUMENT_STORE_DIR/derivatives/<OCR记录ID>/，
+    之后的请求直接命中磁盘文件；原图比派生图新时重新生成。
+    """
+    source = resolve_source(image_path)
+    directory = DERIVATIVE_DIR / str(ocr_result_id)
+    found = _find_derivative(directory, variant)
+    if found and found[0].stat().st_mtime >= source.stat().st_mtime:
+        metrics.inc("image_derivative_total", variant=variant, result="hit")
+        return found
+
+    key = (ocr_result_id, variant)
+    lock = _generation_locks.get(key)
+    if lock is None:
+        lock = _generation_locks[key] = asyncio.Lock()
+    async with lock:
+        found = _find_derivative(directory, variant)
+        if found and found[0].stat().st_mtime >= source.stat().st_mtime:
+            metrics.inc("image_derivative_total", variant=variant, result="hit")
+            return found
+        started = time.perf_counter()
+        found = await asyncio.to_thread(_render_derivative, source, directory, variant)
+        metrics.observe("image_derivative_render_seconds", time.perf_counter() - started, variant=variant)
+    metrics.inc("image_derivative_total", variant=variant, result="generated")
+    logger.info("Generated %s derivative for OCR result %s", variant, ocr_result_id)
+    return found
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 是否命中当前强 ETag（支持逗号分隔的多个值与 *）。"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or f'"{etag}"' in candidates or f'W/"{etag}"' in candidates
@@ -0,0 +1,49 @@
+# 文件路径: CheckEasyBackend/app/modules/verification/manual/models.py
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Index
+from datetime import datetime
+from enum import Enum
+from app.models.base import Base
+
+
+class ReviewStatus(str, Enum):
+    pending = "pending"
+    approved = "approved"
+    rejected = "rejected"
+
+
+class ManualReview(Base):
+    """
+    人工审核记录模型：
+    记录管理员对某条 OCR 识别结果的审核结论、审核人、备注及时间。
+    """
+    __tablename__ = "manual_reviews"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # ocr_results 按月分区后主键为 (id, upload_time)，无法再被外键引用（迁移 cd60ed3ca624 已删除该外键）
+    ocr_result_id = Column(Integer, nullable=False, comment="关联的OCR结果ID")
+    reviewer_id = Column(Integer, ForeignKey("users.id"), nullable=True, comment="审核人ID")
+    # 初始迁移中 reviewstatus 枚举标签为大写（PENDING/APPROVED/REJECTED），此处保持一致
+    status = Column(
+        SQLEnum(ReviewStatus, name="reviewstatus", values_callable=lambda e: [m.name.upper() for m in e]),
+        nullable=False,
+        default=ReviewStatus.pending,
+        comment="审核状态"
+    )
+    remarks = Column(String(500), nullable=True, comment="审核备注信息")
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, comment="审核创建时间")
+    reviewed_at = Column(DateTime, nullable=True, comment="审核完成时间")
+
+    def __repr__(self):
+        return (
+            f"<ManualReview(id={self.id}, ocr_result_id={self.ocr_result_id}, "
+            f"status='{self.status.value}', reviewer_id={self.reviewer_id})>"
+        )
+
+
+# 与列表接口的键集分页 (created_at, id) 及筛选条件对应的复合索引
+Index("idx_manual_reviews_created_id", ManualReview.created_at, ManualReview.id)
+Index("idx_manual_reviews_status_created_id", ManualReview.status, ManualReview.created_at, ManualReview.id)
+Index("idx_manual_reviews_reviewer_created_id", ManualReview.reviewer_id, ManualReview.created_at, ManualReview.id)
+# 每条 OCR 结果只有一条审核记录，批量审核依赖该唯一索引做 upsert
+Index("uq_manual_reviews_ocr_result_id", ManualReview.ocr_result_id, unique=True)
@@ -1,21 +1,50 @@
 # 文件路径: CheckEasyBackend/app/modules/verification/manual/routes.py
 
 import logging
+from typing import Literal, Optional
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.core.db import get_async_db
-from app.core.dependencies import get_current_user
+from app.core.config import settings
+from app.core.db import get_async_db, get_async_read_db
+from app.core.dependencies import get_current_user, get_current_user_read, require_admin
 from app.core.email import send_email  # <-- 引入send_email
 from app.modules.auth.register.models import User
+from app.modules.events.bus import publish_event, REVIEW_DECIDED
+from app.modules.notification.tasks import send_email_batch_notification
+from app.modules.verification.certificates import invalidate_certificate
+from app.modules.verification.images import ImageNotAvailable, etag_matches, get_derivative
 from app.modules.verification.manual.models import ManualReview, ReviewStatus
 from app.modules.verification.manual.schemas import (
     ManualReviewCreate,
     ManualReviewResponse,
-    ManualReviewListResponse
+    ManualReviewListResponse,
+    ReviewStatusEnum,
+    ReviewQueueItem,
+    ReviewClaimRequest,
+    ReviewClaimResponse,
+    ReviewReassignRequest,
+    ReviewDueRequest,
+    BulkReviewDecisionRequest,
+    BulkReviewDecisionResponse,
+    OCRPayloadResponse,
 )
+from app.modules.verification.manual.utils import (
+    fetch_review_page,
+    count_manual_reviews,
+    ReviewLeaseError,
+    check_review_lease,
+    claim_reviews,
+    renew_review_lease,
+    release_review_lease,
+    reassign_review_lease,
+    set_review_due,
+    bulk_decide_reviews,
+)
+from app.modules.verification.ocr.archive import load_ocr_payload
 from app.modules.verification.ocr.models import OCRResult
 
 router = APIRouter()
@@ -58,6 +87,13 @@ async def submit_manual_review(
             detail="OCR record not found"
         )
 
+    # 记录被其他审核员通过队列租用时拒绝提交，避免重复审核
+    try:
+        check_review_lease(ocr_result, current_user.id)
+    except ReviewLeaseError as e:
+        logger.warning(str(e), extra={"user_id": current_user.id, "ocr_result_id": ocr_result.id})
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
     # 查询是否已有审核记录
     existing_review = await db.execute(
         select(ManualReview).where(ManualReview.ocr_result_id == review_request.ocr_result_id)
@@ -101,6 +137,11 @@ async def submit_manual_review(
 
     # 同步更新 OCRResult 状态
     ocr_result.status = review_request.status
+    if review_request.status != ReviewStatusEnum.pending:
+        # 出队并释放租约
+        ocr_result.review_decided_at = current_time.replace(tzinfo=None)
+        ocr_result.review_lease_owner_id = None
+        ocr_result.review_lease_expires_at = None
 
     # 获取关联用户
     user = await db.get(User, ocr_result.user_id)
@@ -142,6 +183,13 @@ async def submit_manual_review(
 
     await db.commit()
     await db.refresh(manual_review)
+    invalidate_certificate(ocr_result.document_number)
+    await publish_event(
+        REVIEW_DECIDED,
+        {"review_id": manual_review.id, "ocr_result_id": ocr_result.id, "status": manual_review.status.value,
+         "verification_status": user.verification_status, "document_number": ocr_result.document_number},
+        user_id=user.id,
+    )
 
     logger.info(
         f"Manual review completed: review_id={manual_review.id}, user_id={user.id}, final_status={manual_review.status}"
@@ -171,7 +219,7 @@ async def submit_manual_review(
 
 
 @router.get("/me/verification-status", summary="获取当前用户审核状态", response_model=dict)
-async def get_verification_status(current_user: User = Depends(get_current_user)):
+async def get_verification_status(current_user: User = Depends(get_current_user_read)):
     """
     获取当前用户的 `verification_status` 状态。
     """
@@ -183,20 +231,225 @@ async def get_verification_status(current_user: User = Depends(get_current_user)
 
 @router.get("/reviews", response_model=ManualReviewListResponse, summary="获取所有人工审核记录")
 async def list_manual_reviews(
-    db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_user),
-    page: int = Query(1, alias="page", ge=1, description="页码"),
-    page_size: int = Query(10, alias="page_size", le=100, description="每页记录数")
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_read),
+    cursor: Optional[str] = Query(None, description="分页游标，取上一页响应中的 next_cursor，首页不传"),
+    page_size: int = Query(10, alias="page_size", ge=1, le=100, description="每页记录数"),
+    review_status: Optional[ReviewStatusEnum] = Query(None, alias="status", description="按审核状态筛选"),
+    reviewer_id: Optional[int] = Query(None, description="按审核人筛选")
 ):
     """
-    允许管理员查询所有人工审核记录，带分页功能。
+    允许管理员查询所有人工审核记录，按创建时间倒序，使用游标（键集）分页。
     """
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="无权限")
-    
-    offset = (page - 1) * page_size
-    query = select(ManualReview).offset(offset).limit(page_size)
-    result = await db.execute(query)
-    reviews = result.scalars().all()
-    
-    return ManualReviewListResponse(reviews=reviews, total=len(reviews))
\ No newline at end of file
+
+    status_filter = ReviewStatus(review_status.value) if review_status else None
+    try:
+        reviews, next_cursor = await fetch_review_page(
+            db,
+            page_size=page_size,
+            cursor=cursor,
+            status=status_filter,
+            reviewer_id=reviewer_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    total = await count_manual_reviews(db, status=status_filter, reviewer_id=reviewer_id)
+
+    return ManualReviewListResponse(reviews=reviews, total=total, next_cursor=next_cursor)
+
+
+# ---------------------------
+# 审核队列
+# ---------------------------
+async def _lease_action(action, *args) -> ReviewQueueItem:
+    try:
+        row = await action(*args)
+    except ReviewLeaseError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return ReviewQueueItem.model_validate(row)
+
+
+@router.post("/queue/claim", response_model=ReviewClaimResponse, summary="领取待审核记录")
+async def claim_review_queue(
+    claim_request: ReviewClaimRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    按审核截止时间（客人到店越早越优先）与上传时间领取待审核的 OCR 记录，并获得限时租约。
+    租约到期前需提交结论或续约，否则记录回到队列可被其他审核员领取。
+    """
+    require_admin(current_user, "review queue")
+    rows = await claim_reviews(db, current_user.id, claim_request.count)
+    return ReviewClaimResponse(items=[ReviewQueueItem.model_validate(row) for row in rows])
+
+
+@router.post("/queue/{ocr_result_id}/renew", response_model=ReviewQueueItem, summary="续约审核租约")
+async def renew_review_queue_lease(
+    ocr_result_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    require_admin(current_user, "review queue")
+    return await _lease_action(renew_review_lease, db, ocr_result_id, current_user.id)
+
+
+@router.post("/queue/{ocr_result_id}/release", response_model=ReviewQueueItem, summary="放弃审核租约")
+async def release_review_queue_lease(
+    ocr_result_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    require_admin(current_user, "review queue")
+    return await _lease_action(release_review_lease, db, ocr_result_id, current_user.id)
+
+
+@router.post("/queue/{ocr_result_id}/reassign", response_model=ReviewQueueItem, summary="改派审核记录")
+async def reassign_review_queue_lease(
+    ocr_result_id: int,
+    reassign_request: ReviewReassignRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    require_admin(current_user, "review queue")
+    return await _lease_action(reassign_review_lease, db, ocr_result_id, reassign_request.reviewer_id)
+
+
+@router.put("/queue/{ocr_result_id}/due", response_model=ReviewQueueItem, summary="设置审核截止时间")
+async def set_review_queue_due(
+    ocr_result_id: int,
+    due_request: ReviewDueRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    require_admin(current_user, "review queue")
+    due_at = due_request.review_due_at
+    if due_at is not None and due_at.tzinfo is not None:
+        due_at = due_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return await _lease_action(set_review_due, db, ocr_result_id, due_at)
+
+
+# ---------------------------
+# 批量审核
+# ---------------------------
+# 与单条审核接口发送的邮件内容一致
+_DECISION_EMAILS = {
+    ReviewStatus.approved: ("证件审核通过", "您的证件已成功通过审核。"),
+    ReviewStatus.rejected: ("证件审核未通过", "您的证件审核未通过，请重新上传。"),
+}
+
+
+@router.post("/reviews/bulk", response_model=BulkReviewDecisionResponse, summary="批量提交审核结论")
+async def bulk_review_decision(
+    bulk_request: BulkReviewDecisionRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    对多条 OCR 记录批量通过或拒绝，审核记录、OCR 出队与用户审核状态在同一事务中以集合式语句更新。
+    不存在、不在待审核状态或被其他审核员租用的记录逐项跳过；审核结果邮件作为一个批量任务入队，在同一 SMTP 会话中发送。
+    """
+    require_admin(current_user, "bulk review")
+    decision = ReviewStatus(bulk_request.status)
+    results, decided = await bulk_decide_reviews(
+        db, current_user.id, bulk_request.ocr_result_ids, decision, bulk_request.remarks
+    )
+
+    subject, body = _DECISION_EMAILS[decision]
+    messages = []
+    for item in decided:
+        invalidate_certificate(item["document_number"])
+        await publish_event(
+            REVIEW_DECIDED,
+            {"review_id": item["review_id"], "ocr_result_id": item["ocr_result_id"], "status": decision.value,
+             "verification_status": item["verification_status"], "document_number": item["document_number"]},
+            user_id=item["user_id"],
+        )
+        if item["email"]:
+            messages.append({"to": item["email"], "subject": subject, "body": body})
+    # 同一用户的多条记录只通知一次
+    messages = list({message["to"]: message for message in messages}.values())
+    if messages:
+        send_email_batch_notification.delay(messages)
+
+    logger.info(
+        "Bulk manual review completed",
+        extra={"user_id": current_user.id, "status": decision.value, "decided": len(decided), "notified": len(messages)}
+    )
+    return BulkReviewDecisionResponse(decided=len(decided), skipped=len(results) - len(decided), results=results)
+
+
+# ---------------------------
+# 审核图片
+# ---------------------------
+@router.get(
+    "/images/{ocr_result_id}/{variant}",
+    summary="获取证件派生图片",
+    response_class=FileResponse,
+    responses={304: {"description": "Not Modified"}},
+)
+async def get_review_image(
+    ocr_result_id: int,
+    variant: Literal["thumbnail", "review", "mrz"],
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    返回证件图片的派生版本（thumbnail 缩略图 / review 审核图 / mrz 机读区裁剪），首次访问时生成并保存在文档存储中。
+    响应带强 ETag 与私有缓存头，客户端重新验证时返回 304；支持 Range 请求，文件由服务器零拷贝发送。
+    仅限管理员或证件上传者本人访问。
+    """
+    row = (await db.execute(
+        select(OCRResult.user_id, OCRResult.passport_image_path).where(OCRResult.id == ocr_result_id)
+    )).first()
+    if row is None or (not current_user.is_admin and row.user_id != current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OCR record not found")
+
+    try:
+        path, etag = await get_derivative(ocr_result_id, row.passport_image_path, variant)
+    except ImageNotAvailable as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": f"private, max-age={settings.IMAGE_CACHE_MAX_AGE}",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+
+# ---------------------------
+# OCR 原始数据
+# ---------------------------
+@router.get("/ocr/{ocr_result_id}", response_model=OCRPayloadResponse, summary="获取OCR识别原文与提取数据")
+async def get_ocr_payload(
+    ocr_result_id: int,
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    返回 OCR 记录的识别原文与提取数据；超过保留期的记录已冷归档，透明地从归档文件读取。
+    仅限管理员或证件上传者本人访问。
+    """
+    ocr_result = (await db.execute(select(OCRResult).where(OCRResult.id == ocr_result_id))).scalars().first()
+    if ocr_result is None or (not current_user.is_admin and ocr_result.user_id != current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OCR record not found")
+
+    try:
+        payload = await load_ocr_payload(ocr_result)
+    except Exception as e:
+        logger.error(
+            "Failed to read archived OCR payload",
+            extra={"ocr_result_id": ocr_result_id, "archive_ref": ocr_result.archive_ref, "error": str(e)}
+        )
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Archived OCR data is unavailable")
+    return OCRPayloadResponse(
+        ocr_result_id=ocr_result.id,
+        recognized_text=payload.get("recognized_text"),
+        extracted_data=payload.get("extracted_data"),
+        archived=ocr_result.archive_ref is not None,
+    )
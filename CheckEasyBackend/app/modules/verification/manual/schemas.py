@@ -3,7 +3,7 @@
 from pydantic import BaseModel, Field
 from enum import Enum
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 
 class ReviewStatusEnum(str, Enum):
@@ -40,7 +40,67 @@ class ManualReviewResponse(BaseModel):
 
 class ManualReviewListResponse(BaseModel):
     reviews: List[ManualReviewResponse]
-    total: int
+    total: int = Field(..., description="符合条件的记录总数（缓存的近似值）")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多记录")
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ReviewQueueItem(BaseModel):
+    ocr_result_id: int = Field(..., validation_alias="id", description="OCR结果ID")
+    user_id: Optional[int] = Field(None, description="上传证件的用户ID")
+    doc_type: str = Field(..., description="证件类型")
+    country: str = Field(..., description="证件所属国家")
+    document_number: Optional[str] = Field(None, description="证件号码")
+    upload_time: datetime = Field(..., description="上传时间")
+    review_due_at: Optional[datetime] = Field(None, description="审核截止时间")
+    review_lease_owner_id: Optional[int] = Field(None, description="租约持有人ID")
+    review_lease_expires_at: Optional[datetime] = Field(None, description="租约到期时间（UTC）")
+
+    class Config:
+        from_attributes = True
+
+
+class ReviewClaimRequest(BaseModel):
+    count: int = Field(1, ge=1, le=20, description="本次领取的记录数")
+
+
+class ReviewClaimResponse(BaseModel):
+    items: List[ReviewQueueItem] = Field(..., description="领取到的记录，队列为空时为空列表")
+
+
+class ReviewReassignRequest(BaseModel):
+    reviewer_id: int = Field(..., description="接手的审核员ID")
+
+
+class ReviewDueRequest(BaseModel):
+    review_due_at: Optional[datetime] = Field(None, description="审核截止时间（如客人预计到店时间），为空表示取消")
+
+
+class BulkReviewDecisionRequest(BaseModel):
+    ocr_result_ids: List[int] = Field(..., min_length=1, max_length=200, description="待审核的OCR结果ID列表", example=[101, 102, 103])
+    status: Literal["approved", "rejected"] = Field(..., description="批量审核结论", example="approved")
+    remarks: Optional[str] = Field(None, max_length=500, description="审核备注信息")
+
+
+class BulkReviewDecisionItemResult(BaseModel):
+    ocr_result_id: int = Field(..., description="OCR结果ID")
+    outcome: Literal["decided", "not_found", "skipped", "leased"] = Field(
+        ..., description="处理结果：decided 已审核；not_found 记录不存在；skipped 不在待审核状态；leased 被其他审核员租用"
+    )
+    review_id: Optional[int] = Field(None, description="审核记录ID")
+    message: Optional[str] = Field(None, description="失败原因")
+
+
+class BulkReviewDecisionResponse(BaseModel):
+    decided: int = Field(..., description="成功审核的记录数")
+    skipped: int = Field(..., description="跳过的记录数")
+    results: List[BulkReviewDecisionItemResult] = Field(..., description="与请求顺序一致的逐项结果")
+
+
+class OCRPayloadResponse(BaseModel):
+    ocr_result_id: int = Field(..., description="OCR结果ID")
+    recognized_text: Optional[str] = Field(None, description="OCR 识别出的完整文本")
+    extracted_data: Optional[Dict[str, Any]] = Field(None, description="OCR 提取的结构化数据")
+    archived: bool = Field(..., description="原始数据是否已冷归档（从归档文件读取）")
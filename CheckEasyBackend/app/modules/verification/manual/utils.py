@@ -1,11 +1,20 @@
 # 文件路径: CheckEasyBackend/app/modules/verification/manual/utils.py
 
+import base64
 import logging
+from typing import Any, Dict, List, Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy import func, or_, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from app.modules.verification.manual.models import ManualReview, ReviewStatusEnum
+from app.core.config import settings
+from app.core.db import dialect_insert
+from app.modules.auth.register.models import User
+from app.modules.verification.manual.models import ManualReview, ReviewStatus
+from app.modules.verification.manual.schemas import BulkReviewDecisionItemResult
+from app.modules.verification.ocr.models import OCRResult, OCRStatus
 
 logger = logging.getLogger("CheckEasyBackend.verification.manual")
 
@@ -32,16 +41,16 @@ async def review_record(
     try:
         # 查询审核记录
         result = await db.execute(
-            select(ManualReview).where(ManualReview.id == review_record_id)
+            select(ManualReview).where(ManualReview.id == review_id)
         )
         review = result.scalar_one_or_none()
 
-        if not review_record:
-            logger.warning(f"Manual review record not found: id={review_record_id}")
+        if not review:
+            logger.warning(f"Manual review record not found: id={review_id}")
             return False
 
         # 设置审核状态
-        review.status = ReviewStatusEnum.approved if approve else ReviewStatusEnum.rejected
+        review.status = ReviewStatus.approved if approve else ReviewStatus.rejected
         review.reviewer_id = reviewer_id
         review.reviewed_at = datetime.now(timezone.utc)
 
@@ -63,4 +72,368 @@ async def review_record(
     except Exception as e:
         await db.rollback()
         logger.error(f"Error during manual review process: {str(e)}", exc_info=True)
-        return False
\ No newline at end of file
+        return False
+
+
+# ---------------------------
+# 审核列表：键集分页与总数
+# ---------------------------
+# (status, reviewer_id) -> 总数；列表翻页时不再重复 COUNT
+_review_count_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.REVIEW_COUNT_CACHE_TTL)
+
+
+def encode_review_cursor(created_at: datetime, review_id: int) -> str:
+    """
+    将最后一条记录的 (created_at, id) 编码为不透明的游标字符串。
+    """
+    raw = f"{created_at.isoformat()}|{review_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_review_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    解析游标，格式非法时抛出 ValueError。
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, review_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(review_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def fetch_review_page(
+    db: AsyncSession,
+    page_size: int,
+    cursor: Optional[str] = None,
+    status: Optional[ReviewStatus] = None,
+    reviewer_id: Optional[int] = None
+) -> Tuple[List[ManualReview], Optional[str]]:
+    """
+    按 (created_at DESC, id DESC) 键集分页查询审核记录。
+    借助复合索引直接定位到游标位置，任意深度的翻页代价相同。
+
+    Returns:
+        (当前页记录, 下一页游标)；没有更多记录时游标为 None。
+    """
+    query = select(ManualReview)
+    if status is not None:
+        query = query.where(ManualReview.status == status)
+    if reviewer_id is not None:
+        query = query.where(ManualReview.reviewer_id == reviewer_id)
+    if cursor:
+        cursor_created_at, cursor_id = decode_review_cursor(cursor)
+        query = query.where(tuple_(ManualReview.created_at, ManualReview.id) < tuple_(cursor_created_at, cursor_id))
+
+    # 多取一条用于判断是否还有下一页
+    query = query.order_by(ManualReview.created_at.desc(), ManualReview.id.desc()).limit(page_size + 1)
+    result = await db.execute(query)
+    reviews = list(result.scalars().all())
+
+    next_cursor = None
+    if len(reviews) > page_size:
+        reviews = reviews[:page_size]
+        last = reviews[-1]
+        next_cursor = encode_review_cursor(last.created_at, last.id)
+    return reviews, next_cursor
+
+
+async def count_manual_reviews(
+    db: AsyncSession,
+    status: Optional[ReviewStatus] = None,
+    reviewer_id: Optional[int] = None
+) -> int:
+    """
+    获取审核记录总数（带缓存的近似值）：
+    - 无筛选条件时，PostgreSQL 下读取 pg_class.reltuples 统计估算值，不扫描表；
+    - 有筛选条件时执行 COUNT（走复合索引），结果缓存 REVIEW_COUNT_CACHE_TTL 秒。
+    """
+    cache_key = (status, reviewer_id)
+    cached = _review_count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    total = None
+    if status is None and reviewer_id is None and db.bind.dialect.name == "postgresql":
+        estimate = (await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'manual_reviews'::regclass")
+        )).scalar()
+        # 表从未 ANALYZE 时 reltuples 为 -1（PG14+）或 0，回退到精确计数
+        if estimate and estimate > 0:
+            total = int(estimate)
+
+    if total is None:
+        query = select(func.count()).select_from(ManualReview)
+        if status is not None:
+            query = query.where(ManualReview.status == status)
+        if reviewer_id is not None:
+            query = query.where(ManualReview.reviewer_id == reviewer_id)
+        total = (await db.execute(query)).scalar_one()
+
+    _review_count_cache[cache_key] = total
+    return total
+
+
+
+# ---------------------------
+# 审核队列：限时租约
+# ---------------------------
+class ReviewLeaseError(Exception):
+    """审核租约操作失败（记录不在队列中，或租约由其他审核员持有）"""
+    pass
+
+
+def _utc_now():
+    # 与其他 DateTime 列一致，使用不带时区的 UTC 时间；取数据库时间，避免多节点时钟偏差
+    return func.timezone("UTC", func.now())
+
+
+def _queue_filter():
+    return (OCRResult.review_required.is_(True)) & (OCRResult.review_decided_at.is_(None))
+
+
+_QUEUE_COLUMNS = (
+    OCRResult.id,
+    OCRResult.user_id,
+    OCRResult.doc_type,
+    OCRResult.country,
+    OCRResult.document_number,
+    OCRResult.upload_time,
+    OCRResult.review_due_at,
+    OCRResult.review_lease_owner_id,
+    OCRResult.review_lease_expires_at,
+)
+
+
+async def claim_reviews(db: AsyncSession, reviewer_id: int, count: int = 1) -> List[Any]:
+    """
+    领取待审核记录：按 (review_due_at, upload_time) 顺序选取未被租用或租约已过期的记录，
+    使用 FOR UPDATE SKIP LOCKED 跳过其他审核员正在领取的行，并在同一条语句中写入租约。
+    多个审核员并发领取时互不等待，也不会领到同一条记录。
+    """
+    lease_seconds = timedelta(seconds=settings.REVIEW_LEASE_SECONDS)
+    candidates = (
+        select(OCRResult.id)
+        .where(
+            _queue_filter(),
+            or_(OCRResult.review_lease_expires_at.is_(None), OCRResult.review_lease_expires_at < _utc_now()),
+        )
+        .order_by(OCRResult.review_due_at.asc().nulls_last(), OCRResult.upload_time, OCRResult.id)
+        .limit(count)
+        .with_for_update(skip_locked=True)
+        .cte("candidates")
+    )
+    result = await db.execute(
+        update(OCRResult)
+        .where(OCRResult.id.in_(select(candidates.c.id)))
+        .values(review_lease_owner_id=reviewer_id, review_lease_expires_at=_utc_now() + lease_seconds)
+        .returning(*_QUEUE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    # RETURNING 不保证顺序，按队列顺序重新排序
+    claimed = sorted(result.all(), key=lambda row: (row.review_due_at is None, row.review_due_at or datetime.min, row.upload_time, row.id))
+    await db.commit()
+    logger.info("Reviewer %s claimed %s review(s)", reviewer_id, len(claimed))
+    return claimed
+
+
+async def _update_lease(db: AsyncSession, ocr_result_id: int, conditions, values) -> Any:
+    row = (await db.execute(
+        update(OCRResult)
+        .where(OCRResult.id == ocr_result_id, _queue_filter(), *conditions)
+        .values(**values)
+        .returning(*_QUEUE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if row is None:
+        await db.rollback()
+        raise ReviewLeaseError(f"OCR result {ocr_result_id} is not in the review queue or the lease is held by another reviewer.")
+    await db.commit()
+    return row
+
+
+async def renew_review_lease(db: AsyncSession, ocr_result_id: int, reviewer_id: int) -> Any:
+    """续约：仅当前租约持有人可以续约（租约已过期但尚未被他人领取时也可续约）。"""
+    return await _update_lease(
+        db, ocr_result_id,
+        [OCRResult.review_lease_owner_id == reviewer_id],
+        {"review_lease_expires_at": _utc_now() + timedelta(seconds=settings.REVIEW_LEASE_SECONDS)},
+    )
+
+
+async def release_review_lease(db: AsyncSession, ocr_result_id: int, reviewer_id: int) -> Any:
+    """放弃租约，记录立即回到队列。"""
+    return await _update_lease(
+        db, ocr_result_id,
+        [OCRResult.review_lease_owner_id == reviewer_id],
+        {"review_lease_owner_id": None, "review_lease_expires_at": None},
+    )
+
+
+async def reassign_review_lease(db: AsyncSession, ocr_result_id: int, reviewer_id: int) -> Any:
+    """改派：将记录的租约直接转给指定审核员（覆盖当前持有人），重新计算到期时间。"""
+    return await _update_lease(
+        db, ocr_result_id, [],
+        {"review_lease_owner_id": reviewer_id,
+         "review_lease_expires_at": _utc_now() + timedelta(seconds=settings.REVIEW_LEASE_SECONDS)},
+    )
+
+
+async def set_review_due(db: AsyncSession, ocr_result_id: int, due_at: Optional[datetime]) -> Any:
+    """设置审核截止时间（如客人预计到店时间），用于队列排序。"""
+    return await _update_lease(db, ocr_result_id, [], {"review_due_at": due_at})
+
+
+def check_review_lease(ocr_result: OCRResult, reviewer_id: int) -> None:
+    """
+    提交审核结论前检查租约：记录被其他审核员持有未过期租约时拒绝提交。
+    未进入队列（没有租约）的记录保持原有行为。
+    """
+    if (
+        ocr_result.review_lease_owner_id is not None
+        and ocr_result.review_lease_owner_id != reviewer_id
+        and ocr_result.review_lease_expires_at is not None
+        and ocr_result.review_lease_expires_at > datetime.utcnow()
+    ):
+        raise ReviewLeaseError(
+            f"OCR result {ocr_result.id} is leased by reviewer {ocr_result.review_lease_owner_id} "
+            f"until {ocr_result.review_lease_expires_at.isoformat()}."
+        )
+
+
+# ---------------------------
+# 批量审核
+# ---------------------------
+# 审核结论对应的用户审核状态（与单条审核接口一致：拒绝后需重新上传）
+_VERIFICATION_STATUS = {ReviewStatus.approved: "approved", ReviewStatus.rejected: "none"}
+# 审核结论同步到 OCR 记录的状态（OCRStatus 枚举中对应的取值）
+_OCR_STATUS = {ReviewStatus.approved: OCRStatus.success, ReviewStatus.rejected: OCRStatus.failed}
+
+
+async def bulk_decide_reviews(
+    db: AsyncSession,
+    reviewer_id: int,
+    ocr_result_ids: List[int],
+    decision: ReviewStatus,
+    remarks: Optional[str] = None,
+) -> Tuple[List[BulkReviewDecisionItemResult], List[Dict[str, Any]]]:
+    """
+    批量提交审核结论，在同一事务中以集合式语句完成：
+      1. 一次查询锁定全部 OCR 记录并取得关联用户邮箱；
+      2. 跳过不存在的记录、不在待审核状态的记录（已有结论或无需审核）及被其他审核员持有未过期租约的记录；
+      3. INSERT ... ON CONFLICT (ocr_result_id) DO UPDATE 写入全部审核记录；
+      4. 一条 UPDATE 同步 OCR 记录状态、出队并释放租约；
+      5. 一条 UPDATE 更新所有相关用户的审核状态。
+    返回 (与请求顺序一致的逐项结果, 已审核记录信息列表)，后者供调用方发送事件与通知。
+    """
+    ids = list(dict.fromkeys(ocr_result_ids))
+    rows = (await db.execute(
+        select(
+            OCRResult.id,
+            OCRResult.user_id,
+            OCRResult.document_number,
+            OCRResult.review_required,
+            OCRResult.review_decided_at,
+            OCRResult.review_lease_owner_id,
+            OCRResult.review_lease_expires_at,
+            User.email,
+        )
+        .outerjoin(User, User.id == OCRResult.user_id)
+        .where(OCRResult.id.in_(ids))
+        .with_for_update(of=OCRResult)
+    )).all()
+    found = {row.id: row for row in rows}
+
+    now = datetime.utcnow()
+    outcomes: Dict[int, BulkReviewDecisionItemResult] = {}
+    eligible = []
+    for ocr_result_id in ids:
+        row = found.get(ocr_result_id)
+        if row is None:
+            outcomes[ocr_result_id] = BulkReviewDecisionItemResult(
+                ocr_result_id=ocr_result_id, outcome="not_found", message="OCR record not found"
+            )
+        elif row.review_decided_at is not None or not row.review_required:
+            outcomes[ocr_result_id] = BulkReviewDecisionItemResult(
+                ocr_result_id=ocr_result_id, outcome="skipped",
+                message="Review already decided" if row.review_decided_at is not None else "Review not required",
+            )
+        elif (
+            row.review_lease_owner_id is not None
+            and row.review_lease_owner_id != reviewer_id
+            and row.review_lease_expires_at is not None
+            and row.review_lease_expires_at > now
+        ):
+            outcomes[ocr_result_id] = BulkReviewDecisionItemResult(
+                ocr_result_id=ocr_result_id, outcome="leased",
+                message=f"Leased by reviewer {row.review_lease_owner_id} until {row.review_lease_expires_at.isoformat()}",
+            )
+        else:
+            eligible.append(row)
+
+    decided = []
+    if eligible:
+        statement = dialect_insert(db)(ManualReview).values([
+            {
+                "ocr_result_id": row.id,
+                "reviewer_id": reviewer_id,
+                "status": decision,
+                "remarks": remarks,
+                "created_at": now,
+                "reviewed_at": now,
+            }
+            for row in eligible
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[ManualReview.ocr_result_id],
+            set_={
+                "reviewer_id": statement.excluded.reviewer_id,
+                "status": statement.excluded.status,
+                "remarks": statement.excluded.remarks,
+                "reviewed_at": statement.excluded.reviewed_at,
+            },
+        ).returning(ManualReview.id, ManualReview.ocr_result_id)
+        review_ids = {row.ocr_result_id: row.id for row in (await db.execute(statement)).all()}
+
+        await db.execute(
+            update(OCRResult)
+            .where(OCRResult.id.in_([row.id for row in eligible]))
+            .values(
+                status=_OCR_STATUS[decision],
+                review_decided_at=now,
+                review_lease_owner_id=None,
+                review_lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        user_ids = {row.user_id for row in eligible if row.user_id is not None}
+        verification_status = _VERIFICATION_STATUS[decision]
+        if user_ids:
+            await db.execute(
+                update(User)
+                .where(User.id.in_(user_ids))
+                .values(verification_status=verification_status)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+
+        for row in eligible:
+            outcomes[row.id] = BulkReviewDecisionItemResult(
+                ocr_result_id=row.id, outcome="decided", review_id=review_ids.get(row.id)
+            )
+            decided.append({
+                "review_id": review_ids.get(row.id),
+                "ocr_result_id": row.id,
+                "user_id": row.user_id,
+                "email": row.email,
+                "document_number": row.document_number,
+                "verification_status": verification_status,
+            })
+    else:
+        await db.rollback()
+
+    logger.info(
+        "Bulk review by reviewer %s: %s decided, %s skipped",
+        reviewer_id, len(decided), len(ids) - len(decided),
+    )
+    return [outcomes[ocr_result_id] for ocr_result_id in ids], decided
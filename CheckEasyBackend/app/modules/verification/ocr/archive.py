@@ -0,0 +1,169 @@
+# 代码路径: app/modules/verification/ocr/archive.py
+
+import os
+import json
+import asyncio
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import zstandard
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.modules.verification.ocr.models import OCRResult
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.archive")
+
+ARCHIVE_DIR = Path(settings.DOCUMENT_STORE_DIR) / "ocr_archive"
+ARCHIVE_BATCH_SIZE = 500
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"ocr_results_{month.year}_{month.month:02d}"
+
+
+async def ensure_partitions(db: AsyncSession, months_ahead: int = None) -> List[str]:
+    """
+    预建从当前月起 months_ahead 个月的月度分区（已存在则跳过），返回新建的分区名。
+    如果 DEFAULT 分区中已有落在该月范围内的数据，创建会失败，需要人工迁移这些行。
+    """
+    if months_ahead is None:
+        months_ahead = settings.OCR_PARTITION_PREMAKE_MONTHS
+    this_month = date.today().replace(day=1)
+    existing = set((await db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'ocr_results'::regclass"
+    ))).scalars().all())
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(this_month, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF ocr_results "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        ))
+        created.append(name)
+    await db.commit()
+    if created:
+        logger.info("Created OCR result partitions: %s", ", ".join(created))
+    return created
+
+
+def _append_frames(archive_path: Path, payloads: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, str]]:
+    """
+    将每行数据压缩为独立的 zstd 帧追加到归档文件，返回 (id, archive_ref)。
+    每行单独成帧，读取时只需定位并解压对应的一帧。
+    """
+    compressor = zstandard.ZstdCompressor(level=settings.OCR_ARCHIVE_ZSTD_LEVEL)
+    refs = []
+    with archive_path.open("ab") as archive_file:
+        offset = archive_file.tell()
+        for row_id, payload in payloads:
+            frame = compressor.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+            archive_file.write(frame)
+            refs.append((row_id, f"{archive_path.name}:{offset}:{len(frame)}"))
+            offset += len(frame)
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+    return refs
+
+
+async def archive_partition(db: AsyncSession, month: date) -> int:
+    """
+    归档指定月份分区：将 recognized_text 与 extracted_data 写入压缩归档文件后在库中置空，
+    只保留结构化列。按 id 分批处理，可重复执行（已归档的行会被跳过）。
+
+    Returns:
+        int: 本次归档的行数。
+    """
+    name = partition_name(month)
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    archive_path = ARCHIVE_DIR / f"{name}.zst"
+
+    archived = 0
+    last_id = 0
+    while True:
+        rows = (await db.execute(
+            text(
+                f"SELECT id, recognized_text, extracted_data FROM {name} "
+                "WHERE id > :last_id AND archived_at IS NULL "
+                "AND (recognized_text IS NOT NULL OR extracted_data IS NOT NULL) "
+                "ORDER BY id LIMIT :batch"
+            ),
+            {"last_id": last_id, "batch": ARCHIVE_BATCH_SIZE},
+        )).all()
+        if not rows:
+            break
+
+        payloads = [
+            (row.id, {"recognized_text": row.recognized_text, "extracted_data": row.extracted_data})
+            for row in rows
+        ]
+        # 先落盘再更新数据库；若中途失败，重跑只会在归档文件中留下未引用的帧
+        refs = await asyncio.to_thread(_append_frames, archive_path, payloads)
+        await db.execute(
+            text(
+                f"UPDATE {name} SET recognized_text = NULL, extracted_data = NULL, "
+                "archived_at = now(), archive_ref = :ref WHERE id = :id"
+            ),
+            [{"id": row_id, "ref": ref} for row_id, ref in refs],
+        )
+        await db.commit()
+
+        archived += len(rows)
+        last_id = rows[-1].id
+
+    logger.info("Archived %s OCR rows from partition %s", archived, name)
+    return archived
+
+
+async def archive_old_partitions(db: AsyncSession) -> Dict[str, int]:
+    """
+    归档任务入口：预建未来分区，并归档所有早于 OCR_ARCHIVE_AFTER_MONTHS 个月的月度分区。
+    """
+    await ensure_partitions(db)
+
+    cutoff = _add_months(date.today().replace(day=1), -settings.OCR_ARCHIVE_AFTER_MONTHS)
+    partitions = (await db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'ocr_results'::regclass AND c.relname ~ '^ocr_results_[0-9]{4}_[0-9]{2}$'"
+    ))).scalars().all()
+
+    results = {}
+    for name in sorted(partitions):
+        year, month = int(name[-7:-3]), int(name[-2:])
+        partition_month = date(year, month, 1)
+        if partition_month < cutoff:
+            results[name] = await archive_partition(db, partition_month)
+    return results
+
+
+def read_archived_payload(archive_ref: str) -> Dict[str, Any]:
+    """
+    根据 archive_ref（文件名:偏移:长度）读取并解压单行归档数据。
+    """
+    filename, offset, length = archive_ref.rsplit(":", 2)
+    with (ARCHIVE_DIR / filename).open("rb") as archive_file:
+        archive_file.seek(int(offset))
+        frame = archive_file.read(int(length))
+    return json.loads(zstandard.ZstdDecompressor().decompress(frame))
+
+
+async def load_ocr_payload(ocr_result: OCRResult) -> Dict[str, Any]:
+    """
+    透明读取 OCR 记录的原始文本与提取数据：未归档时直接返回列值，已归档时从归档文件读取。
+    """
+    if ocr_result.archive_ref:
+        return await asyncio.to_thread(read_archived_payload, ocr_result.archive_ref)
+    return {"recognized_text": ocr_result.recognized_text, "extracted_data": ocr_result.extracted_data}
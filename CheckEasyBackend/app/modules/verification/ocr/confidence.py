@@ -0,0 +1,80 @@
+# 代码路径: app/modules/verification/ocr/confidence.py
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.modules.verification.ocr.mrz import check_results, parse_mrz
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.confidence")
+
+
+def mrz_check_results(lines: List[str]) -> Optional[Dict[str, bool]]:
+    """
+    对原始 MRZ 行执行 ICAO 9303 校验位验证，支持 TD1（3×30）、TD2（2×36）与 TD3（2×44，护照）；
+    解析与校验统一由 ocr.mrz 完成。返回 {document_number, birth_date, expiry_date, composite: 是否通过}；
+    版式无法识别时返回 None。
+    """
+    parsed = parse_mrz(lines)
+    return check_results(parsed) if parsed else None
+
+
+def weighted_word_confidence(words: List[Tuple[str, float]]) -> Optional[float]:
+    """将逐词 (文本, 置信度 0~100) 按字符数加权平均为 0~1；没有任何词时返回 None。"""
+    total = weight = 0.0
+    for text, conf in words:
+        total += conf * len(text)
+        weight += len(text)
+    return round(total / weight / 100, 4) if weight else None
+
+
+def word_confidence(image) -> Optional[float]:
+    """
+    使用共享的 Tesseract 引擎（见 ocr.engine）识别图片，返回按字符数加权的平均词置信度（0~1）；
+    没有识别出任何词时返回 None。已有识别结果时应直接调用 weighted_word_confidence，避免重复识别。
+    """
+    from app.modules.verification.ocr.engine import recognize
+    return weighted_word_confidence(recognize(image).words)
+
+
+def score_confidence(check_results: Optional[Dict[str, bool]], word_conf: Optional[float]) -> Optional[float]:
+    """
+    综合置信度：校验位通过率与 Tesseract 词置信度按 OCR_CHECK_DIGIT_WEIGHT 加权；
+    只有其中一项可用时直接使用该项。
+    """
+    check_score = sum(check_results.values()) / len(check_results) if check_results else None
+    if check_score is None:
+        return word_conf
+    if word_conf is None:
+        return check_score
+    weight = settings.OCR_CHECK_DIGIT_WEIGHT
+    return round(weight * check_score + (1 - weight) * word_conf, 4)
+
+
+def requires_review(data: Dict) -> bool:
+    """
+    判断识别结果是否需要人工审核，以下任一情况进入审核：
+      - 证件状态不是 valid（已过期、有效期未识别）；
+      - 带 MRZ 的证件没有任何校验位结果（has_mrz 且 check_digits 为 None）；
+      - MRZ 中有字段按校验位替换过字符（corrected_fields，替换结果可能是另一个号码）；
+      - 置信度缺失或低于 OCR_REVIEW_CONFIDENCE_THRESHOLD；
+      - OCR_REVIEW_ON_CHECK_DIGIT_FAILURE 开启时任一校验位未通过。
+    """
+    score = data.get("confidence_score")
+    check_results = data.get("check_digits") or {}
+    if data.get("document_status") != "valid":
+        reason = "document_status"
+    elif data.get("has_mrz") and data.get("check_digits") is None:
+        reason = "mrz_unverified"
+    elif data.get("corrected_fields"):
+        reason = "mrz_corrected"
+    elif score is None or score < settings.OCR_REVIEW_CONFIDENCE_THRESHOLD:
+        reason = "low_confidence"
+    elif settings.OCR_REVIEW_ON_CHECK_DIGIT_FAILURE and not all(check_results.values()):
+        reason = "check_digit_failed"
+    else:
+        metrics.inc("ocr_review_routing_total", result="auto_accepted")
+        return False
+    metrics.inc("ocr_review_routing_total", result=reason)
+    return True
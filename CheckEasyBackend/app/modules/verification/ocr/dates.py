@@ -0,0 +1,99 @@
+# 代码路径: app/modules/verification/ocr/dates.py
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# 英文月份：全称与三字母缩写（OCR 文本统一转为大写后匹配）
+_MONTHS = {
+    name: index
+    for index, full in enumerate(
+        ("JANUARY", "FEBRUARY", "MARCH", "APRIL", "MAY", "JUNE",
+         "JULY", "AUGUST", "SEPTEMBER", "OCTOBER", "NOVEMBER", "DECEMBER"),
+        start=1,
+    )
+    for name in (full, full[:3])
+}
+_MONTHS["SEPT"] = 9
+
+_TOKENS = re.compile(r"\d+|[A-Z]+")
+
+
+def _expand_year(year: int, digits: int, today: date) -> int:
+    # 两位年份：不超过当前年份 + 10 的视为本世纪，否则为上世纪（护照有效期最长 10 年）
+    if digits > 2:
+        return year
+    current = today.year % 100
+    century = today.year - current
+    return century + year if year <= current + 10 else century - 100 + year
+
+
+def _build(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _numeric(parts: Tuple[str, str, str], today: date) -> Optional[date]:
+    first, second, third = parts
+    if len(first) == 4:
+        # YYYY-MM-DD
+        return _build(int(first), int(second), int(third))
+    if len(third) not in (2, 4):
+        return None
+    year = _expand_year(int(third), len(third), today)
+    a, b = int(first), int(second)
+    # 日在前（DD-MM-YYYY）优先；首段大于 12 时只能是日，次段大于 12 时按 MM-DD-YYYY
+    if b > 12 and a <= 12:
+        return _build(year, a, b)
+    return _build(year, b, a)
+
+
+def _compact(digits: str, today: date) -> Optional[date]:
+    if len(digits) == 8:
+        # YYYYMMDD，不合法时尝试 DDMMYYYY
+        return _build(int(digits[:4]), int(digits[4:6]), int(digits[6:])) or \
+            _build(int(digits[4:]), int(digits[2:4]), int(digits[:2]))
+    if len(digits) == 6:
+        # YYMMDD（MRZ 定宽日期）
+        return _build(_expand_year(int(digits[:2]), 2, today), int(digits[2:4]), int(digits[4:]))
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse(value: str, today: date) -> Optional[str]:
+    tokens = _TOKENS.findall(value.upper())
+    # 由各段的字符类别（数字 / 字母）与长度推断格式，只做一次日期构造，不逐个尝试格式
+    shape = "".join("D" if token.isdigit() else "A" for token in tokens)
+    parsed = None
+    if shape == "D":
+        parsed = _compact(tokens[0], today)
+    elif shape == "DDD":
+        parsed = _numeric(tuple(tokens), today)
+    elif shape in ("DAD", "ADD"):
+        day, name, year = (tokens[0], tokens[1], tokens[2]) if shape == "DAD" else (tokens[1], tokens[0], tokens[2])
+        month = _MONTHS.get(name)
+        if month and len(year) in (2, 4) and len(day) <= 2:
+            parsed = _build(_expand_year(int(year), len(year), today), month, int(day))
+    return parsed.isoformat() if parsed else None
+
+
+def parse_date(value: Optional[str], today: Optional[date] = None) -> Optional[str]:
+    """
+    解析 OCR 文本中的日期，返回 ISO 格式字符串，无法解析时返回 None。
+
+    支持 2023-12-31、31.12.2023、12/31/2023、31 Dec 2023、Dec 31 2023、20231231、231231（MRZ）等写法；
+    分隔符任意，两位年份按当前年份 + 10 划分世纪。结果按 (字符串, 当天日期) 缓存，重复出现的日期不再重复解析。
+    """
+    if not value:
+        return None
+    return _parse(value.strip(), today or date.today())
+
+
+def parse_mrz_date(value: Optional[str]) -> Optional[str]:
+    """解析 MRZ 中的 6 位 YYMMDD 日期。"""
+    if not value or len(value) != 6 or not value.isdigit():
+        return None
+    return parse_date(value)
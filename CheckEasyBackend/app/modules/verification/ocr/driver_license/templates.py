@@ -0,0 +1,47 @@
+# 代码路径: app/modules/verification/ocr/driver_license/templates.py
+
+from typing import Any, Dict, Optional
+
+from app.modules.verification.ocr.id_card.templates import chn_identity_number
+from app.modules.verification.ocr.templates import DIGITS, UPPER, CardTemplate, FieldRegion
+
+
+def gbr_name(extracted: Dict[str, Any]) -> Optional[Dict[str, bool]]:
+    """英国驾照的姓（第 1 项）与名（第 2 项）分行印刷，合并为 name。"""
+    info = extracted["additional_info"]
+    name = " ".join(part for part in (info.pop("surname", None), info.pop("given_names", None)) if part)
+    if name:
+        extracted["name"] = name
+    return None
+
+
+# (国家, 证件面) -> 模板；区域坐标为相对卡片宽高的比例，按样张标定
+TEMPLATES = {
+    # 英国照片卡驾照正面：字段按 1、2、3、4b、5 编号印在照片右侧
+    ("GBR", "front"): CardTemplate(
+        doc_type="driver_license",
+        country="GBR",
+        side="front",
+        fields=(
+            FieldRegion("surname", (0.36, 0.16, 0.97, 0.25), whitelist=UPPER + "-"),
+            FieldRegion("given_names", (0.36, 0.25, 0.97, 0.34), whitelist=UPPER + "-"),
+            FieldRegion("birth_date", (0.36, 0.34, 0.97, 0.43), kind="date", whitelist=DIGITS + "."),
+            FieldRegion("expiry_date", (0.36, 0.50, 0.70, 0.58), kind="date", whitelist=DIGITS + "."),
+            FieldRegion("document_number", (0.36, 0.58, 0.97, 0.66), whitelist=UPPER + DIGITS),
+        ),
+        postprocess=gbr_name,
+    ),
+    # 中国机动车驾驶证正页（88×60mm）：证号即公民身份号码，有效期限形如 2015-01-01 至 2021-01-01
+    ("CHN", "front"): CardTemplate(
+        doc_type="driver_license",
+        country="CHN",
+        side="front",
+        size=(1320, 900),
+        fields=(
+            FieldRegion("document_number", (0.18, 0.17, 0.72, 0.26), whitelist=DIGITS + "X"),
+            FieldRegion("name", (0.18, 0.27, 0.48, 0.36), language="chi_sim"),
+            FieldRegion("expiry_date", (0.28, 0.84, 0.98, 0.93), kind="validity", whitelist=DIGITS + "-"),
+        ),
+        postprocess=chn_identity_number,
+    ),
+}
@@ -0,0 +1,156 @@
+# 代码路径: app/modules/verification/ocr/engine.py
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.engine")
+
+
+@dataclass
+class OCRText:
+    """一次识别的结果：全文及逐词 (文本, 置信度 0~100)。"""
+    text: str
+    words: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def _text_from_data(data: Dict[str, List[Any]]) -> str:
+    """按 image_to_data 的 block / par / line 编号把词拼回文本：同行以空格连接，换行分行，换段空一行。"""
+    lines: List[str] = []
+    current: List[str] = []
+    previous = None
+    for text, block, par, line in zip(data["text"], data["block_num"], data["par_num"], data["line_num"]):
+        text = text.strip()
+        if not text:
+            continue
+        key = (block, par, line)
+        if previous is not None and key != previous:
+            lines.append(" ".join(current))
+            if key[:2] != previous[:2]:
+                lines.append("")
+            current = []
+        current.append(text)
+        previous = key
+    if current:
+        lines.append(" ".join(current))
+    return "\n".join(lines)
+
+
+class TesserocrEngine:
+    """
+    通过 tesserocr（Tesseract C API 绑定）在进程内常驻识别：
+      - 每个线程按语言持有 PyTessBaseAPI，首次使用时初始化（加载 traineddata），之后复用；
+        PyTessBaseAPI 不是线程安全的，线程池中的每个线程各用各的实例；
+      - fork 出的子进程（Celery / uvicorn worker）检测到 pid 变化时重新初始化，不沿用父进程的实例；
+      - 图片直接以 PIL 对象传入，不写临时文件。
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, language: str, tessdata_dir: str = None):
+        import tesserocr  # 延迟导入：只在真正识别时加载 libtesseract
+        self._tesserocr = tesserocr
+        self.language = language
+        self.tessdata_dir = tessdata_dir
+        self._local = threading.local()
+
+    def _api(self, language: str):
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.apis, self._local.pid = {}, os.getpid()
+        api = self._local.apis.get(language)
+        if api is None:
+            started = time.perf_counter()
+            options = {"lang": language, "oem": self._tesserocr.OEM.DEFAULT, "psm": self._tesserocr.PSM.AUTO}
+            if self.tessdata_dir:
+                options["path"] = self.tessdata_dir
+            api = self._local.apis[language] = self._tesserocr.PyTessBaseAPI(**options)
+            metrics.observe("ocr_engine_init_seconds", time.perf_counter() - started, engine=self.name)
+            logger.info("Tesseract API initialised for thread %s (lang=%s)", threading.get_ident(), language)
+        return api
+
+    def recognize(self, image, psm: int = None, whitelist: str = None, language: str = None) -> OCRText:
+        api = self._api(language or self.language)
+        # 页面分割模式与字符白名单按次设置，空字符串即取消白名单
+        api.SetPageSegMode(psm if psm is not None else self._tesserocr.PSM.AUTO)
+        api.SetVariable("tessedit_char_whitelist", whitelist or "")
+        try:
+            api.SetImage(image)
+            text = api.GetUTF8Text()
+            words = [(word, float(conf)) for word, conf in api.MapWordConfidences()]
+        finally:
+            # 释放图片与识别结果，保留已加载的语言数据
+            api.Clear()
+        return OCRText(text, words)
+
+
+class PytesseractEngine:
+    """
+    pytesseract 兜底实现：每次识别仍会启动一个 tesseract 子进程并写临时文件，
+    但只调用一次 image_to_data，同时得到文本和逐词置信度。
+    """
+
+    name = "pytesseract"
+
+    def __init__(self, language: str, tessdata_dir: str = None):
+        import pytesseract  # 延迟导入，避免 API 进程启动时加载
+        self._pytesseract = pytesseract
+        self.language = language
+        self.config = f'--tessdata-dir "{tessdata_dir}"' if tessdata_dir else ""
+
+    def recognize(self, image, psm: int = None, whitelist: str = None, language: str = None) -> OCRText:
+        config = self.config
+        if psm is not None:
+            config += f" --psm {psm}"
+        if whitelist:
+            config += f" -c tessedit_char_whitelist={whitelist}"
+        data = self._pytesseract.image_to_data(
+            image, lang=language or self.language, config=config, output_type=self._pytesseract.Output.DICT
+        )
+        # conf 为 -1 表示非词级别的布局块
+        words = [(text.strip(), float(conf)) for text, conf in zip(data["text"], data["conf"])
+                 if text.strip() and float(conf) >= 0]
+        return OCRText(_text_from_data(data), words)
+
+
+def create_engine(name: str = None, language: str = None, tessdata_dir: str = None):
+    """
+    按 OCR_ENGINE 创建识别引擎：tesserocr、pytesseract，或 auto（已安装 tesserocr 时优先使用，否则回退）。
+    """
+    name = name or settings.OCR_ENGINE
+    language = language or settings.OCR_LANGUAGE
+    tessdata_dir = tessdata_dir or settings.OCR_TESSDATA_DIR
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine(language, tessdata_dir)
+        except ImportError:
+            if name == "tesserocr":
+                raise
+            logger.info("tesserocr is not installed, falling back to pytesseract.")
+    elif name != "pytesseract":
+        raise ValueError(f"Unknown OCR engine: {name}")
+    return PytesseractEngine(language, tessdata_dir)
+
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """进程内共享的识别引擎（首次调用时创建）。"""
+    return create_engine()
+
+
+def recognize(image, psm: int = None, whitelist: str = None, language: str = None) -> OCRText:
+    """
+    使用共享引擎识别图片，返回全文与逐词置信度，并按引擎记录耗时。
+    psm 为 Tesseract 页面分割模式（如 7 表示单行），whitelist 限定可识别字符，language 覆盖 OCR_LANGUAGE。
+    """
+    engine = get_engine()
+    started = time.perf_counter()
+    result = engine.recognize(image, psm=psm, whitelist=whitelist, language=language)
+    metrics.observe("ocr_engine_seconds", time.perf_counter() - started, engine=engine.name)
+    return result
@@ -0,0 +1,53 @@
+# 代码路径: app/modules/verification/ocr/fields.py
+
+import re
+from typing import Dict, List
+
+from app.modules.verification.ocr.dates import parse_date
+
+_DATE_VALUE = (
+    r"\d{4}[-./]\d{1,2}[-./]\d{1,2}"
+    r"|\d{1,2}[-./]\d{1,2}[-./]\d{2,4}"
+    r"|\d{1,2}\s+[A-Za-z]{3,9}\.?,?\s+\d{2,4}"
+    r"|[A-Za-z]{3,9}\.?\s+\d{1,2},?\s+\d{4}"
+    r"|\d{8}"
+)
+
+# 字段名 -> (标签, 取值) 正则；所有字段合并为一个预编译的交替模式，一次扫描找出全部带标签字段
+FIELD_PATTERNS = {
+    "name": (r"Name", r"[^\n]+"),
+    "document_number": (r"\b(?:ID|Passport\s+No\.?)", r"[\w\d]+"),
+    "birth_date": (r"(?:Birth(?:\s*date)?|Date\s+of\s+birth|DOB)", _DATE_VALUE),
+    "expiry_date": (r"(?:Expiry(?:\s*Date)?|Date\s+of\s+expiry|Expires|Valid\s+until)", _DATE_VALUE),
+}
+# 标签与取值之间的分隔：姓名要求有冒号，其余字段冒号可选
+_SEPARATORS = {"name": r"\s*[:：]\s*", "document_number": r"[\s:：]*"}
+_DEFAULT_SEPARATOR = r"[:：]?\s*"
+
+_SCANNER = re.compile(
+    "|".join(
+        f"(?P<{field}>{label}{_SEPARATORS.get(field, _DEFAULT_SEPARATOR)}(?P<{field}_value>{value}))"
+        for field, (label, value) in FIELD_PATTERNS.items()
+    ),
+    re.IGNORECASE,
+)
+
+DATE_FIELDS = ("birth_date", "expiry_date")
+
+# 不带标签的日期取值（模板区域识别出的整段文本中查找日期）
+DATE_VALUE = re.compile(_DATE_VALUE)
+
+
+def scan_fields(text: str) -> Dict[str, List[str]]:
+    """
+    一次扫描文本，返回每个字段按出现顺序的全部候选值（日期字段已解析为 ISO 格式，无法解析的丢弃）。
+    """
+    candidates: Dict[str, List[str]] = {field: [] for field in FIELD_PATTERNS}
+    for match in _SCANNER.finditer(text):
+        field = match.lastgroup
+        value = match.group(f"{field}_value").strip()
+        if field in DATE_FIELDS:
+            value = parse_date(value)
+        if value:
+            candidates[field].append(value)
+    return candidates
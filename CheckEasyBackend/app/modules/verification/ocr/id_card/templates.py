@@ -0,0 +1,73 @@
+# 代码路径: app/modules/verification/ocr/id_card/templates.py
+
+from typing import Any, Dict, Optional
+
+from app.modules.verification.ocr.dates import parse_date
+from app.modules.verification.ocr.templates import (
+    DIGITS, MRZ_CHARS, PSM_SINGLE_BLOCK, CardTemplate, FieldRegion,
+)
+
+# GB 11643 公民身份号码校验（ISO 7064 MOD 11-2）：前 17 位加权求和模 11 后查表得到第 18 位
+_GB11643_WEIGHTS = (7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2)
+_GB11643_CHECK = "10X98765432"
+
+
+def gb11643_valid(number: str) -> bool:
+    """校验 18 位公民身份号码的最后一位校验码。"""
+    if len(number) != 18 or not number[:17].isdigit():
+        return False
+    total = sum(int(char) * weight for char, weight in zip(number, _GB11643_WEIGHTS))
+    return _GB11643_CHECK[total % 11] == number[17]
+
+
+def chn_identity_number(extracted: Dict[str, Any]) -> Optional[Dict[str, bool]]:
+    """
+    由公民身份号码推导出生日期（第 7~14 位）与性别（第 17 位奇数为男），返回号码校验结果；
+    出生日期因此不必单独识别中文“年月日”区域。中国驾驶证的证号即公民身份号码，同样适用。
+    """
+    number = "".join((extracted.get("document_number") or "").split()).upper()
+    if not number:
+        return None
+    extracted["document_number"] = number
+    valid = gb11643_valid(number)
+    if valid:
+        birth_date = parse_date(number[6:14])
+        if birth_date:
+            extracted["birth_date"] = birth_date
+        extracted["additional_info"]["sex"] = "M" if int(number[16]) % 2 else "F"
+    return {"document_number": valid}
+
+
+# (国家, 证件面) -> 模板；区域坐标为相对卡片宽高的比例，按样张标定
+TEMPLATES = {
+    # 第二代居民身份证人像面：只识别姓名与号码，出生日期、性别由号码推导
+    ("CHN", "front"): CardTemplate(
+        doc_type="id_card",
+        country="CHN",
+        side="front",
+        fields=(
+            FieldRegion("name", (0.17, 0.09, 0.60, 0.21), language="chi_sim"),
+            FieldRegion("document_number", (0.33, 0.79, 0.95, 0.91), whitelist=DIGITS + "X"),
+        ),
+        postprocess=chn_identity_number,
+    ),
+    # 国徽面：签发机关与有效期限（如 2015.06.01-2035.06.01，取后一个日期；“长期”则无有效期）
+    ("CHN", "back"): CardTemplate(
+        doc_type="id_card",
+        country="CHN",
+        side="back",
+        fields=(
+            FieldRegion("issuing_authority", (0.38, 0.66, 0.92, 0.77), language="chi_sim"),
+            FieldRegion("expiry_date", (0.38, 0.79, 0.92, 0.90), kind="validity", whitelist=DIGITS + ".-"),
+        ),
+    ),
+    # 背面印有 TD1 机读区（3×30）的身份证：只识别 MRZ，字段与校验位均由 MRZ 得到
+    ("*", "back"): CardTemplate(
+        doc_type="id_card",
+        country="*",
+        side="back",
+        fields=(
+            FieldRegion("mrz", (0.02, 0.60, 0.98, 0.97), kind="mrz", whitelist=MRZ_CHARS, psm=PSM_SINGLE_BLOCK),
+        ),
+    ),
+}
@@ -0,0 +1,18 @@
+# 代码路径: app/modules/verification/ocr/id_card/utils.py
+
+from typing import Optional
+
+from app.modules.verification.ocr.id_card.templates import TEMPLATES
+from app.modules.verification.ocr.templates import find_template, process_card
+
+
+async def process_id_card(file, country: str, side: Optional[str] = None) -> dict:
+    template = find_template(TEMPLATES, country, side)
+    if template is None:
+        return {
+            "success": False,
+            "data": None,
+            "next_action": None,
+            "message": f"ID card OCR is not supported for country {country} ({side or 'front'} side)."
+        }
+    return await process_card(file, template)
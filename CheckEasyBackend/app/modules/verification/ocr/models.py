@@ -43,6 +43,12 @@ class OCRResult(Base):
     error_message = Column(Text, nullable=True, comment="OCR 识别失败时的错误描述")
     review_required = Column(Boolean, nullable=False, default=False, comment="是否需要人工审核")
 
+    # 人工审核队列：审核员通过限时租约领取待审核记录（见 manual.utils.claim_reviews）
+    review_due_at = Column(DateTime, nullable=True, comment="审核截止时间（如客人预计到店时间），越早越优先")
+    review_lease_owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, comment="当前持有审核租约的审核员ID")
+    review_lease_expires_at = Column(DateTime, nullable=True, comment="审核租约到期时间（UTC），过期后可被其他审核员领取")
+    review_decided_at = Column(DateTime, nullable=True, comment="人工审核结论提交时间，非空表示已出队")
+
     upload_time = Column(DateTime, nullable=False, default=datetime.utcnow, comment="证件上传时间")
     process_time = Column(DateTime, nullable=True, comment="OCR 处理完成时间")
 
@@ -53,6 +59,12 @@ class OCRResult(Base):
     
     # ✅ 新增这一行来保存护照图片的路径
     passport_image_path = Column(String, nullable=True, comment="护照图片路径")
+
+    # 冷归档：表按 upload_time 月度分区（见迁移 cd60ed3ca624），
+    # 超过保留期的分区中 recognized_text / extracted_data 会被移入压缩归档文件并置空，
+    # 读取时使用 archive.load_ocr_payload() 透明获取
+    archived_at = Column(DateTime, nullable=True, comment="原始文本归档时间")
+    archive_ref = Column(String(255), nullable=True, comment="归档位置：文件名:偏移:长度")
     
     def __repr__(self):
         return (
@@ -74,6 +86,18 @@ class OCRResult(Base):
         )
     
 # 添加索引以提升常用查询的性能
-Index("idx_ocr_doc_type", OCRResult.doc_type)
-Index("idx_ocr_country", OCRResult.country)
-Index("idx_ocr_status", OCRResult.status)
\ No newline at end of file
+Index("idx_ocr_status", OCRResult.status)
+# 按用户查询其上传记录（最新优先）
+Index("idx_ocr_user_created", OCRResult.user_id, OCRResult.created_at)
+# 按证件号码查找（入住时的证件核验）
+Index("idx_ocr_document_number", OCRResult.document_number)
+# 按时间范围扫描（统计、归档）
+Index("idx_ocr_created_at", OCRResult.created_at)
+# 审核队列：仅包含待审核记录的部分索引，按领取顺序排列
+Index(
+    "idx_ocr_review_queue",
+    OCRResult.review_due_at,
+    OCRResult.upload_time,
+    OCRResult.id,
+    postgresql_where=(OCRResult.review_required.is_(True)) & (OCRResult.review_decided_at.is_(None)),
+)
\ No newline at end of file
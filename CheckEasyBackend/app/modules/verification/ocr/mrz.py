@@ -0,0 +1,204 @@
+# 代码路径: app/modules/verification/ocr/mrz.py
+
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+
+# ICAO 9303 校验位权重
+_WEIGHTS = (7, 3, 1)
+
+# OCR 常见混淆字符：数字字段中的字母按形近改为数字，字母字段中的数字改回字母
+_TO_DIGIT = str.maketrans({"O": "0", "Q": "0", "D": "0", "I": "1", "L": "1", "Z": "2", "S": "5", "G": "6", "B": "8"})
+_TO_LETTER = str.maketrans({"0": "O", "1": "I", "2": "Z", "5": "S", "6": "G", "8": "B"})
+# 字母数字混合字段（证件号、可选数据）中可能互相混淆的字符
+_AMBIGUOUS = {"0": "O", "O": "0", "1": "I", "I": "1", "2": "Z", "Z": "2", "5": "S", "S": "5", "8": "B", "B": "8"}
+# 单个字段最多尝试的替换位置数（2^n 种组合）
+_MAX_AMBIGUOUS = 6
+
+_LENGTHS = {"TD1": (30, 3), "TD2": (36, 2), "TD3": (44, 2)}
+
+
+def _char_value(char: str) -> int:
+    if char.isdigit():
+        return ord(char) - 48
+    if "A" <= char <= "Z":
+        return ord(char) - 55
+    # '<' 填充符及无法识别的字符按 0 计
+    return 0
+
+
+def icao_check_digit(value: str) -> int:
+    """按 ICAO 9303 计算校验位：字符值依次乘以 7、3、1 循环权重后求和取模 10。"""
+    total = 0
+    for index, char in enumerate(value):
+        total += _char_value(char) * _WEIGHTS[index % 3]
+    return total % 10
+
+
+def _check_char(check: str) -> str:
+    # 校验位只能是数字；'<' 表示字段未使用，按 0 处理
+    check = check.translate(_TO_DIGIT)
+    return "0" if check == "<" else check
+
+
+def _valid(value: str, check: str) -> bool:
+    check = _check_char(check)
+    return check.isdigit() and icao_check_digit(value) == ord(check) - 48
+
+
+def _correct_numeric(value: str, check: str) -> Tuple[str, bool]:
+    # 日期等纯数字字段：字母一律按形近改为数字
+    value = value.translate(_TO_DIGIT)
+    return value, _valid(value, check)
+
+
+def _correct_alphanumeric(value: str, check: str) -> Tuple[str, bool, bool]:
+    """
+    证件号等字母数字字段：校验失败时按校验位逐一尝试混淆字符的替换组合，替换最少者优先。
+    返回 (值, 是否通过校验, 是否经过替换)。一位校验位只能排除约九成的误读，替换得到的值可能是另一个号码，
+    调用方应将其视为待人工核对，而不是已校验通过。
+    """
+    if _valid(value, check):
+        return value, True, False
+    positions = [i for i, char in enumerate(value) if char in _AMBIGUOUS][:_MAX_AMBIGUOUS]
+    candidates = []
+    for mask in product((False, True), repeat=len(positions)):
+        if not any(mask):
+            continue
+        chars = list(value)
+        for position, swap in zip(positions, mask):
+            if swap:
+                chars[position] = _AMBIGUOUS[chars[position]]
+        candidate = "".join(chars)
+        if _valid(candidate, check):
+            candidates.append((sum(mask), candidate))
+    if candidates:
+        return min(candidates)[1], True, True
+    return value, False, False
+
+
+def _normalize_lines(lines: List[str]) -> Optional[Tuple[str, List[str]]]:
+    compact = [line.replace(" ", "").upper() for line in lines]
+    compact = [line for line in compact if "<" in line and len(line) >= 28]
+    for layout in ("TD1", "TD3", "TD2"):
+        length, count = _LENGTHS[layout]
+        tail = compact[-count:]
+        # 允许 OCR 多识别或漏识别末尾的 1~2 个字符
+        if len(tail) == count and all(abs(len(line) - length) <= 2 for line in tail):
+            return layout, [line[:length].ljust(length, "<") for line in tail]
+    return None
+
+
+def _split_names(field: str) -> Tuple[str, str]:
+    surname, _, names = field.translate(_TO_LETTER).partition("<<")
+    return surname.replace("<", " ").strip(), names.replace("<", " ").strip()
+
+
+def parse_mrz(lines: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    解析文本形式的 MRZ（TD1 3×30、TD2 2×36、TD3 2×44），返回与 PassportEye mrz.to_dict() 相同结构的字典；
+    无法识别版式时返回 None。
+
+    日期、校验位按数字纠正 OCR 混淆字符（O/0、I/1、B/8 等），证件号在校验失败时按校验位搜索替换组合
+    （corrected_number 标记是否替换过），姓名、国家代码按字母纠正。valid_score 为通过的校验位百分比。
+    """
+    normalized = _normalize_lines(lines)
+    if normalized is None:
+        return None
+    layout, rows = normalized
+
+    if layout == "TD1":
+        line1, line2, line3 = rows
+        number, check_number = line1[5:14], line1[14]
+        optional1 = line1[15:30]
+        date_of_birth, check_date_of_birth = line2[0:6], line2[6]
+        sex = line2[7]
+        expiration_date, check_expiration_date = line2[8:14], line2[14]
+        nationality = line2[15:18]
+        optional2 = line2[18:29]
+        check_composite = line2[29]
+        name_field = line3
+    else:
+        line1, line2 = rows
+        end = len(line2) - 1
+        number, check_number = line2[0:9], line2[9]
+        nationality = line2[10:13]
+        date_of_birth, check_date_of_birth = line2[13:19], line2[19]
+        sex = line2[20]
+        expiration_date, check_expiration_date = line2[21:27], line2[27]
+        check_composite = line2[end]
+        name_field = line1[5:]
+        if layout == "TD3":
+            optional1, check_personal_number = line2[28:42], line2[42]
+        else:
+            optional1 = line2[28:35]
+        optional2 = ""
+
+    number, valid_number, corrected_number = _correct_alphanumeric(number, check_number)
+    date_of_birth, valid_date_of_birth = _correct_numeric(date_of_birth, check_date_of_birth)
+    expiration_date, valid_expiration_date = _correct_numeric(expiration_date, check_expiration_date)
+
+    if layout == "TD1":
+        composite = number + _check_char(check_number) + optional1 + date_of_birth + _check_char(check_date_of_birth) \
+            + expiration_date + _check_char(check_expiration_date) + optional2
+    else:
+        composite = number + _check_char(check_number) + date_of_birth + _check_char(check_date_of_birth) \
+            + expiration_date + _check_char(check_expiration_date) + optional1
+        if layout == "TD3":
+            composite += _check_char(check_personal_number)
+    valid_composite = _valid(composite, check_composite)
+
+    checks = [valid_number, valid_date_of_birth, valid_expiration_date, valid_composite]
+    surname, names = _split_names(name_field)
+    result = {
+        "mrz_type": layout,
+        "type": line1[0:2].replace("<", ""),
+        "country": line1[2:5].translate(_TO_LETTER),
+        "number": number.replace("<", ""),
+        "date_of_birth": date_of_birth,
+        "expiration_date": expiration_date,
+        "nationality": nationality.translate(_TO_LETTER),
+        "sex": sex if sex in ("M", "F") else "<",
+        "names": names,
+        "surname": surname,
+        "check_number": _check_char(check_number),
+        "check_date_of_birth": _check_char(check_date_of_birth),
+        "check_expiration_date": _check_char(check_expiration_date),
+        "check_composite": _check_char(check_composite),
+        "valid_number": valid_number,
+        "valid_date_of_birth": valid_date_of_birth,
+        "valid_expiration_date": valid_expiration_date,
+        "valid_composite": valid_composite,
+        "corrected_number": corrected_number,
+        "raw_text": "\n".join(rows),
+        "method": "native",
+    }
+    if layout == "TD3":
+        valid_personal_number = _valid(optional1, check_personal_number)
+        checks.append(valid_personal_number)
+        result.update({
+            "personal_number": optional1,
+            "check_personal_number": _check_char(check_personal_number),
+            "valid_personal_number": valid_personal_number,
+        })
+    else:
+        result.update({"optional1": optional1, "optional2": optional2})
+    result["valid_score"] = round(100 * sum(checks) / len(checks))
+    return result
+
+
+def check_results(parsed: Dict[str, Any]) -> Dict[str, bool]:
+    """
+    将 parse_mrz 的结果转换为校验位结果 {document_number, birth_date, expiry_date, composite}（按纠错后的字段计算）。
+    证件号经过替换才通过校验时记为未通过：复合校验位与证件号校验位覆盖相同位置、权重相同，无法发现替换错误。
+    """
+    return {
+        "document_number": parsed["valid_number"] and not parsed.get("corrected_number", False),
+        "birth_date": parsed["valid_date_of_birth"],
+        "expiry_date": parsed["valid_expiration_date"],
+        "composite": parsed["valid_composite"],
+    }
+
+
+def corrected_fields(parsed: Dict[str, Any]) -> List[str]:
+    """按校验位搜索替换过的字母数字字段（识别结果中的字段名），这些字段需要人工核对。"""
+    return ["document_number"] if parsed.get("corrected_number") else []
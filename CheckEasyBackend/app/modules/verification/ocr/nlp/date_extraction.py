@@ -0,0 +1,142 @@
+# File: app/modules/verification/ocr/nlp/date_extraction.py
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.modules.verification.ocr.dates import parse_date, parse_mrz_date
+from app.modules.verification.ocr.fields import DATE_FIELDS, scan_fields
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.nlp.date_extraction")
+
+FIELDS = DATE_FIELDS
+
+# ---------------------------
+# 第一层：确定性扫描（预编译正则）
+# ---------------------------
+# MRZ 第二行（TD3 为 44 字符、TD2 为 36 字符）：出生日期位于 13~19，有效期位于 21~27
+_MRZ_TD2_TD3_LINE = re.compile(r"[A-Z0-9<]{9}[0-9<][A-Z<]{3}(\d{6})[0-9<][MFX<](\d{6})[0-9<][A-Z0-9<]{8,16}")
+# TD1 第二行（30 字符）：出生日期位于 0~6，有效期位于 8~14
+_MRZ_TD1_LINE = re.compile(r"(\d{6})[0-9<][MFX<](\d{6})[0-9<][A-Z<]{3}[A-Z0-9<]{11}[0-9<]")
+
+
+@dataclass
+class DateExtraction:
+    """级联日期抽取结果：各字段的 ISO 日期及给出答案的层级（mrz / rules / ner / none）。"""
+    dates: Dict[str, Optional[str]] = field(default_factory=lambda: dict.fromkeys(FIELDS))
+    tier: str = "none"
+
+
+def _scan_mrz(text: str) -> Dict[str, Set[str]]:
+    candidates: Dict[str, Set[str]] = {name: set() for name in FIELDS}
+    for line in text.splitlines():
+        compact = line.replace(" ", "").upper()
+        match = None
+        if len(compact) in (36, 44):
+            match = _MRZ_TD2_TD3_LINE.fullmatch(compact)
+        elif len(compact) == 30:
+            match = _MRZ_TD1_LINE.fullmatch(compact)
+        if match:
+            for name, raw in zip(FIELDS, match.groups()):
+                parsed = parse_mrz_date(raw)
+                if parsed:
+                    candidates[name].add(parsed)
+    return candidates
+
+
+# ---------------------------
+# 第二层：NER 兜底
+# ---------------------------
+def _local_ner_dates(text: str) -> List[str]:
+    from app.modules.verification.ocr.nlp.entity_extraction import extract_dates
+    return extract_dates(text)
+
+
+def _remote_ner_dates(text: str) -> List[str]:
+    # 通过 Celery 在 OCR worker 中执行 NER，API 进程不加载模型
+    from app.modules.verification.ocr.tasks import extract_entities
+    timeout = settings.DATE_NER_REMOTE_TIMEOUT
+    entities = extract_entities.apply_async((text, ["DATE"]), expires=timeout).get(timeout=timeout)
+    return [entity["text"] for entity in entities]
+
+
+def default_ner() -> Optional[Callable[[str], List[str]]]:
+    """按 DATE_NER_FALLBACK 选择 NER 兜底方式：remote（OCR worker）、local（本进程）或 off。"""
+    return {"remote": _remote_ner_dates, "local": _local_ner_dates}.get(settings.DATE_NER_FALLBACK)
+
+
+def _unique(candidates: Dict[str, Set[str]]) -> Dict[str, Optional[str]]:
+    # 只有一个候选的字段直接采用，没有候选或候选互相矛盾的字段为 None
+    return {name: next(iter(values)) if len(values) == 1 else None for name, values in candidates.items()}
+
+
+def _tier(dates: Dict[str, Optional[str]], mrz: Dict[str, Set[str]]) -> str:
+    if not any(dates.values()):
+        return "none"
+    return "mrz" if all(value in mrz[name] for name, value in dates.items() if value) else "rules"
+
+
+def _resolve_with_ner(candidates: Dict[str, Set[str]], ner_dates: List[str]) -> Dict[str, Optional[str]]:
+    found = sorted({parsed for parsed in (parse_date(text) for text in ner_dates) if parsed})
+    resolved = _unique(candidates)
+    for name in FIELDS:
+        # 只裁决规则层有多个候选的字段：保留 NER 同样识别出的那一个
+        if len(candidates[name]) > 1:
+            agreed = candidates[name] & set(found)
+            if len(agreed) == 1:
+                resolved[name] = agreed.pop()
+    today = date.today().isoformat()
+    # 规则层没有候选时：最早的过去日期视为出生日期，最晚的未来日期视为有效期
+    if resolved["birth_date"] is None and not candidates["birth_date"]:
+        past = [value for value in found if value < today]
+        resolved["birth_date"] = past[0] if past else None
+    if resolved["expiry_date"] is None and not candidates["expiry_date"]:
+        future = [value for value in found if value >= today]
+        resolved["expiry_date"] = future[-1] if future else None
+    return resolved
+
+
+def extract_dates_cascade(
+    text: str,
+    ner: Optional[Callable[[str], List[str]]] = None,
+    labelled: Optional[Dict[str, List[str]]] = None,
+) -> DateExtraction:
+    """
+    级联抽取出生日期与有效期：
+      1. MRZ 定宽字段与带标签日期的预编译正则扫描（labelled 为 fields.scan_fields 的结果，已扫描过时传入以免重复扫描）；
+      2. 仅当扫描没有结果，或同一字段出现互相矛盾的候选时，才调用 NER（ner 参数，默认按 DATE_NER_FALLBACK）；
+         NER 只裁决矛盾的字段，扫描得到唯一候选的字段原样保留（NER 不可用或失败时同样保留）。
+    每次调用按答案来源层级计数（date_extraction_tier_total），用于观察避免了多少次模型推理。
+    """
+    mrz = _scan_mrz(text)
+    if labelled is None:
+        labelled = scan_fields(text)
+    candidates = {name: mrz[name] | set(labelled[name]) for name in FIELDS}
+    kept = _unique(candidates)
+
+    conflict = any(len(values) > 1 for values in candidates.values())
+    if not conflict and any(kept.values()):
+        tier = _tier(kept, mrz)
+        metrics.inc("date_extraction_tier_total", tier=tier)
+        return DateExtraction(kept, tier)
+
+    reason = "conflict" if conflict else "empty"
+    ner = ner if ner is not None else default_ner()
+    if ner is None:
+        tier = _tier(kept, mrz)
+        metrics.inc("date_extraction_tier_total", tier=tier, reason=reason)
+        return DateExtraction(kept, tier)
+    try:
+        resolved = _resolve_with_ner(candidates, ner(text))
+    except Exception as e:
+        logger.warning("NER date fallback failed: %s", e)
+        tier = _tier(kept, mrz)
+        metrics.inc("date_extraction_tier_total", tier=tier, reason="ner_error")
+        return DateExtraction(kept, tier)
+    tier = "ner" if resolved != kept else _tier(kept, mrz)
+    metrics.inc("date_extraction_tier_total", tier=tier, reason=reason)
+    return DateExtraction(resolved, tier)
@@ -0,0 +1,18 @@
+# File: app/modules/verification/ocr/nlp/entity_extraction.py
+
+import logging
+from typing import List
+
+from app.modules.verification.ocr.nlp.ner_service import ner_service
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.nlp.entity_extraction")
+
+def extract_dates(text: str) -> List[str]:
+    """
+    使用共享的 Stanza NER 服务抽取 DATE 实体（模型只加载一次，并发请求合并为批次）
+    """
+    try:
+        return [entity["text"] for entity in ner_service.extract_entities(text, types=["DATE"])]
+    except Exception as e:
+        logger.error("Error in extract_dates: %s", str(e), exc_info=True)
+        return []
@@ -0,0 +1,173 @@
+# File: app/modules/verification/ocr/nlp/ner_service.py
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.nlp.ner_service")
+
+
+class StanzaBackend:
+    """Stanza（torch）推理后端。"""
+
+    def __init__(self, language: str):
+        import stanza  # 延迟导入：torch 与模型只在真正使用 NER 的进程中加载
+        self.pipeline = stanza.Pipeline(language, processors="tokenize,ner", verbose=False)
+
+    def predict(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        return [
+            [{"text": ent.text, "type": ent.type, "start_char": ent.start_char, "end_char": ent.end_char}
+             for ent in document.ents]
+            for document in self.pipeline.bulk_process(texts)
+        ]
+
+
+def create_backend(name: str = None, language: str = None):
+    """
+    按 NER_BACKEND 创建推理后端：stanza（默认）或 onnx（int8 量化模型，见 onnx_ner.py）。
+    """
+    name = name or settings.NER_BACKEND
+    if name == "onnx":
+        from app.modules.verification.ocr.nlp.onnx_ner import OnnxNERBackend
+        return OnnxNERBackend(settings.NER_ONNX_MODEL_DIR, intra_op_threads=settings.NER_ONNX_INTRA_OP_THREADS)
+    if name == "stanza":
+        return StanzaBackend(language or settings.NER_LANGUAGE)
+    raise ValueError(f"Unknown NER backend: {name}")
+
+
+class NERService:
+    """
+    进程内共享的 NER 服务（后端由 NER_BACKEND 选择）：
+      - 首次使用时才加载模型（线程安全，只加载一次），导入本模块不会加载 stanza / onnxruntime；
+      - 并发请求由后台线程合并为微批次，一次前向计算处理多个文本：
+        收到第一个请求后最多等待 NER_BATCH_MAX_WAIT_MS 毫秒或凑满 NER_BATCH_SIZE 条；
+      - status() 报告 cold / loading / warm / failed 状态及批处理统计。
+    应在 OCR worker 进程中使用（见 ocr.tasks），API 进程通过 Celery 任务调用，不加载模型。
+    """
+
+    def __init__(self, language: str = None, batch_size: int = None, max_wait_ms: int = None, backend: str = None):
+        self.language = language or settings.NER_LANGUAGE
+        self.backend_name = backend or settings.NER_BACKEND
+        self.batch_size = batch_size or settings.NER_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.NER_BATCH_MAX_WAIT_MS) / 1000
+        self._pipeline = None
+        self._state = "cold"
+        self._load_seconds: Optional[float] = None
+        self._error: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._batches = 0
+        self._documents = 0
+
+    # ---------------------------
+    # 模型加载
+    # ---------------------------
+    def _load(self):
+        if self._pipeline is not None:
+            return self._pipeline
+        with self._load_lock:
+            if self._pipeline is None:
+                self._state = "loading"
+                started = time.perf_counter()
+                try:
+                    self._pipeline = create_backend(self.backend_name, self.language)
+                except Exception as e:
+                    self._state = "failed"
+                    self._error = str(e)
+                    logger.error("Error initializing %s NER backend: %s", self.backend_name, str(e), exc_info=True)
+                    raise
+                self._load_seconds = round(time.perf_counter() - started, 3)
+                self._state = "warm"
+                self._error = None
+                metrics.observe("ner_pipeline_load_seconds", self._load_seconds, backend=self.backend_name)
+                logger.info("%s NER backend loaded in %.2fs", self.backend_name, self._load_seconds)
+        return self._pipeline
+
+    def warm(self) -> None:
+        """预加载模型（worker 启动时调用），失败时只记录日志，首次请求时会重试。"""
+        try:
+            self._load()
+        except Exception:
+            pass
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self._state,
+            "backend": self.backend_name,
+            "language": self.language,
+            "load_seconds": self._load_seconds,
+            "error": self._error,
+            "batches": self._batches,
+            "documents": self._documents,
+            "avg_batch_size": round(self._documents / self._batches, 2) if self._batches else None,
+        }
+
+    # ---------------------------
+    # 微批处理
+    # ---------------------------
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._load_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+                    self._worker.start()
+
+    def _collect_batch(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            try:
+                pipeline = self._load()
+                started = time.perf_counter()
+                results = pipeline.predict(texts)
+                metrics.observe("ner_batch_seconds", time.perf_counter() - started, backend=self.backend_name)
+                metrics.observe("ner_batch_size", len(batch), backend=self.backend_name)
+                self._batches += 1
+                self._documents += len(batch)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), entities in zip(batch, results):
+                future.set_result(entities)
+
+    def submit(self, text: str) -> Future:
+        """提交一个文本，返回结果为实体列表的 Future。"""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def extract_entities(self, text: str, types: Optional[List[str]] = None, timeout: float = None) -> List[Dict[str, Any]]:
+        """
+        识别文本中的命名实体（阻塞直到所在批次完成），可按实体类型过滤。
+        """
+        if not text or not text.strip():
+            return []
+        entities = self.submit(text).result(timeout=timeout or settings.NER_REQUEST_TIMEOUT)
+        if types:
+            entities = [entity for entity in entities if entity["type"] in types]
+        return entities
+
+
+ner_service = NERService()
@@ -0,0 +1,87 @@
+# File: app/modules/verification/ocr/nlp/onnx_ner.py
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import onnxruntime
+from tokenizers import Tokenizer
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.nlp.onnx_ner")
+
+
+class OnnxNERBackend:
+    """
+    基于 ONNX Runtime 的 int8 量化 NER 推理后端（CPU），只依赖 onnxruntime、tokenizers 与 numpy，
+    不加载 torch / transformers。
+
+    模型目录由 scripts/export_onnx_ner.py 生成，包含：
+      - model.int8.onnx：动态量化后的 token 分类模型；
+      - tokenizer.json：快速分词器；
+      - config.json：含 id2label 的模型配置（BIO 标签，如 B-DATE / I-DATE）。
+    输出格式与 Stanza 后端一致：[{"text", "type", "start_char", "end_char"}, ...]。
+    """
+
+    def __init__(self, model_dir: str, intra_op_threads: int = 1, max_length: int = 512):
+        model_dir = Path(model_dir)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / "model.int8.onnx"), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        config = json.loads((model_dir / "config.json").read_text(encoding="utf-8"))
+        self.id2label = {int(index): label for index, label in config["id2label"].items()}
+        if not any(label.endswith("DATE") for label in self.id2label.values()):
+            logger.warning("ONNX NER model %s has no DATE label; extract_dates will return nothing", model_dir)
+
+    def predict(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """对一个批次的文本做一次前向计算，返回每个文本的实体列表。"""
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+        }
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        logits = self.session.run(None, feeds)[0]
+        predictions = logits.argmax(axis=-1)
+        return [
+            self._aggregate(text, encoding, labels)
+            for text, encoding, labels in zip(texts, encodings, predictions)
+        ]
+
+    def _aggregate(self, text: str, encoding, labels) -> List[Dict[str, Any]]:
+        # 按 BIO 标签把子词合并为实体：B- 开始新实体，同类型的 I- 延续当前实体
+        entities: List[Dict[str, Any]] = []
+        current = None
+        for label_id, (start, end), special, word_id in zip(
+            labels, encoding.offsets, encoding.special_tokens_mask, encoding.word_ids
+        ):
+            if special or word_id is None:
+                continue
+            label = self.id2label[int(label_id)]
+            prefix, _, entity_type = label.partition("-")
+            if label == "O" or not entity_type:
+                current = None
+                continue
+            if current is not None and current["type"] == entity_type and (prefix == "I" or current["word_id"] == word_id):
+                current["end_char"] = end
+                current["word_id"] = word_id
+                continue
+            current = {"type": entity_type, "start_char": start, "end_char": end, "word_id": word_id}
+            entities.append(current)
+        return [
+            {"text": text[e["start_char"]:e["end_char"]], "type": e["type"],
+             "start_char": e["start_char"], "end_char": e["end_char"]}
+            for e in entities
+        ]
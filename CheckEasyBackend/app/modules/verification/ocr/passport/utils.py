@@ -1,12 +1,16 @@
 # 代码路径: app/modules/verification/ocr/passport/utils.py
 
+import asyncio
 import io
 import logging
 from datetime import datetime, date
-from passporteye import read_mrz
 from PIL import Image, ImageEnhance, ImageFilter
-import pytesseract
-from typing import Optional
+from typing import Dict, Optional
+
+from app.modules.verification.ocr.confidence import score_confidence, weighted_word_confidence, word_confidence
+from app.modules.verification.ocr.dates import parse_date, parse_mrz_date
+from app.modules.verification.ocr.engine import recognize
+from app.modules.verification.ocr.mrz import check_results, corrected_fields, parse_mrz
 
 logger = logging.getLogger("CheckEasyBackend.verification.ocr.passport.utils")
 
@@ -22,105 +26,60 @@ def preprocess_image(image: Image.Image) -> Image.Image:
         raise
 
 
-# 在 passport/utils.py中明确定义 match_date()
-
-from datetime import datetime
-from typing import Optional
-
-def match_date(date_str: str) -> Optional[str]:
-    date_str = date_str.strip()
-    date_formats = [
-        "%Y-%m-%d",   # 2023-12-31
-        "%d-%m-%Y",   # 31-12-2023
-        "%m-%d-%Y",   # 12-31-2023
-        "%Y%m%d",     # 20231231
-        "%y%m%d",     # 231231 (YYMMDD)
-        "%d %b %Y",   # 31 Dec 2023
-        "%b %d %Y",   # Dec 31 2023
-        "%d/%m/%Y",   # 31/12/2023
-        "%m/%d/%Y",   # 12/31/2023
-        "%d.%m.%Y",   # 31.12.2023
-        "%m.%d.%Y",   # 12.31.2023
-    ]
-
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt).date()
-
-            # 自动修正YY年份问题 (护照日期逻辑)
-            if fmt == "%y%m%d":
-                current_year = datetime.now().year % 100
-                century = datetime.now().year - current_year
-                if dt.year % 100 > current_year + 10:
-                    dt = dt.replace(year=dt.year + century - 100)
-                else:
-                    dt = dt.replace(year=dt.year + century)
-            return dt.isoformat()
-        except ValueError:
-            continue
-    return None
-
-def parse_mrz_date(date_str: str) -> Optional[str]:
-    try:
-        current_year = datetime.now().year % 100  # 新增这一行，解决未定义的问题
-        if len(date_str) == 6:
-            year, month, day = int(date_str[:2]), int(date_str[2:4]), int(date_str[4:6])
-            century = datetime.now().year - current_year
-            if year > current_year + 10:
-                year += century - 100
-            else:
-                year += century
-            return datetime(year, month, day).date().isoformat()
-        else:
-            return None
-    except ValueError as e:
-        logger.error("Invalid MRZ date format: %s", date_str, exc_info=True)
+# 日期解析统一使用 ocr.dates（按字符类别推断格式并缓存），保留旧名称供调用方使用
+match_date = parse_date
+
+def _roi_image(mrz) -> Optional[Image.Image]:
+    # PassportEye 保存的 MRZ 区域为 0~1 浮点灰度数组
+    roi = mrz.aux.get("roi")
+    if roi is None:
         return None
+    if roi.dtype != "uint8":
+        roi = (roi * 255).clip(0, 255).astype("uint8")
+    return Image.fromarray(roi)
+
+# PassportEye to_dict() 中的校验结果字段，与 check_results 的结构对应
+_PASSPORTEYE_CHECKS = {
+    "document_number": "valid_number",
+    "birth_date": "valid_date_of_birth",
+    "expiry_date": "valid_expiration_date",
+    "composite": "valid_composite",
+}
+
 
-def parse_date(date_str: str) -> Optional[str]:
-    date_str = date_str.strip()
-    formats = ["%y%m%d", "%Y%m%d"]
-    for fmt in formats:
-        try:
-            parsed_date = datetime.strptime(date_str, fmt).date()
-            # YY年份特殊处理
-            if fmt == "%y%m%d":
-                current_year = datetime.now().year % 100
-                year = parsed_date.year % 100
-                century = datetime.now().year - current_year
-                if year > current_year + 50:
-                    parsed_date = parsed_date.replace(year=century - 100 + year)
-                else:
-                    parsed_date = parsed_date.replace(year=century + year)
-            return parsed_date.isoformat()
-        except ValueError:
-            continue
-    return None
+def _passporteye_checks(mrz_data: dict) -> Optional[Dict[str, bool]]:
+    if not all(key in mrz_data for key in _PASSPORTEYE_CHECKS.values()):
+        return None
+    return {name: bool(mrz_data[key]) for name, key in _PASSPORTEYE_CHECKS.items()}
 
 async def process_passport(file) -> dict:
+    # 延迟导入：passporteye 依赖 scikit-image/scipy，只在真正识别护照时加载
+    from passporteye import read_mrz
+
     try:
         # 确保只执行一次
         await file.seek(0)
         file_bytes = await file.read()
 
+        # PassportEye 与 Tesseract 识别都是同步的 CPU 密集调用，放到线程池执行，不阻塞事件循环
+        loop = asyncio.get_running_loop()
+
         # 第一次读取 MRZ
         image_stream = io.BytesIO(file_bytes)
-        mrz = read_mrz(image_stream)
-
+        mrz = await loop.run_in_executor(None, lambda: read_mrz(image_stream, save_roi=True))
         if mrz is None or mrz.to_dict() is None:
             # 备用方案前明确重新创建image_stream对象
-            logger.warning("PassportEye failed, fallback to preprocessing+pytesseract OCR.")
+            logger.warning("PassportEye failed, fallback to preprocessing+Tesseract OCR.")
             fallback_image_stream = io.BytesIO(file_bytes)  # 重新创建image_stream，而非使用旧的
             image = Image.open(fallback_image_stream)
             processed_image = preprocess_image(image)
 
-            ocr_text = pytesseract.image_to_string(processed_image)
-            lines = [line for line in ocr_text.split('\n') if len(line.strip()) > 20 and '<' in line]
+            # 一次识别同时得到文本与逐词置信度
+            ocr_result = await loop.run_in_executor(None, recognize, processed_image)
+            word_conf = weighted_word_confidence(ocr_result.words)
+            lines = [line for line in ocr_result.text.split('\n') if len(line.strip()) > 20 and '<' in line]
 
-            if len(lines) >= 2:
-                mrz_text = '\n'.join(lines[-2:])
-                mrz = read_mrz(mrz_text, extra_cmdline_params="--oem 1")
-            else:
+            if len(lines) < 2:
                 return {
                     "success": False,
                     "data": None,
@@ -128,15 +87,33 @@ async def process_passport(file) -> dict:
                     "message": "Passport MRZ not detected clearly after fallback OCR."
                 }
 
-            if mrz is None or mrz.to_dict() is None:
+            # 文本已经识别出来，直接用原生解析器按校验位纠错并解析，无需再次调用 OCR 引擎
+            mrz_data = parse_mrz(lines)
+            if mrz_data is None:
                 return {
                     "success": False,
                     "data": None,
                     "next_action": None,
                     "message": "Passport MRZ not recognized after fallback method."
                 }
+            check_digits = check_results(mrz_data)
+            corrected = corrected_fields(mrz_data)
+        else:
+            mrz_data = mrz.to_dict()
+            # 词置信度优先在 PassportEye 定位的 MRZ 区域上计算
+            confidence_image = _roi_image(mrz) or preprocess_image(Image.open(io.BytesIO(file_bytes)))
+            word_conf = await loop.run_in_executor(None, word_confidence, confidence_image)
+            raw_mrz = mrz_data.get("raw_text") or mrz.aux.get("text") or ""
+            parsed = parse_mrz(raw_mrz.split("\n"))
+            if parsed:
+                check_digits = check_results(parsed)
+                corrected = corrected_fields(parsed)
+            else:
+                # 原生解析器读不出 PassportEye 的原始文本时，使用 PassportEye 自身的校验结果
+                check_digits = _passporteye_checks(mrz_data)
+                corrected = []
 
-        mrz_data = mrz.to_dict()
+        confidence_score = score_confidence(check_digits, word_conf)
 
         extracted_data = {
             "document_number": mrz_data.get("number"),
@@ -148,6 +125,10 @@ async def process_passport(file) -> dict:
                 "sex": mrz_data.get("sex"),
             },
             "extracted_text": str(mrz_data),
+            "has_mrz": True,
+            "check_digits": check_digits,
+            "corrected_fields": corrected,
+            "confidence_score": confidence_score,
         }
 
         expiry_date_str = extracted_data.get("expiry_date")
@@ -9,9 +9,12 @@ from datetime import date, datetime
 
 from app.modules.verification.ocr.schemas import OCRResponse
 from app.modules.verification.ocr.utils import process_document
+from app.modules.verification.ocr.confidence import requires_review
 from app.core.dependencies import get_correlation_id, get_current_user
 from app.modules.verification.ocr.models import OCRResult, OCRStatus
 from app.core.db import get_async_db
+from app.modules.events.bus import publish_event, OCR_COMPLETED
+from app.modules.verification.certificates import invalidate_certificate
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -110,7 +113,7 @@ async def upload_document(
                 extracted_data=serialized_data.get("extracted_data"),
                 upload_time=datetime.utcnow(),
                 process_time=datetime.utcnow(),
-                review_required=False,
+                review_required=requires_review(serialized_data),  # 证件无效或低置信度结果进入人工审核
                 passport_image_path=str(saved_filepath),
                 uploader_ip=request.client.host
             )
@@ -121,6 +124,13 @@ async def upload_document(
             await db.refresh(new_ocr_result)
 
             logger.info("OCR data successfully saved to database.", extra={"record_id": new_ocr_result.id})
+            invalidate_certificate(new_ocr_result.document_number)
+            await publish_event(
+                OCR_COMPLETED,
+                {"ocr_result_id": new_ocr_result.id, "doc_type": doc_type, "status": new_ocr_result.status.value,
+                 "document_number": new_ocr_result.document_number},
+                user_id=current_user.id,
+            )
         except Exception as e:
             logger.error("Failed to save OCR data: %s", str(e), exc_info=True)
             raise HTTPException(
@@ -0,0 +1,107 @@
+# File: CheckEasyBackend/app/modules/verification/ocr/tasks.py
+
+import asyncio
+from celery.schedules import crontab
+from celery.signals import celeryd_after_setup, worker_process_init, worker_ready
+from celery.utils.log import get_task_logger
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.modules.notification.tasks import celery_app, BaseTaskWithRetry
+from app.modules.verification.ocr.archive import archive_old_partitions
+from app.modules.verification.ocr.nlp.ner_service import ner_service
+
+logger = get_task_logger(__name__)
+
+celery_app.conf.task_routes = {
+    **(celery_app.conf.task_routes or {}),
+    "app.modules.verification.ocr.tasks.archive_ocr_partitions": {"queue": "maintenance"},
+    "app.modules.verification.ocr.tasks.extract_entities": {"queue": "ocr"},
+    # 状态查询需由加载模型的 ocr worker 回答
+    "app.modules.verification.ocr.tasks.ner_status": {"queue": "ocr"},
+}
+# 每月 1 日凌晨执行：预建未来分区并归档过期分区的原始文本
+celery_app.conf.beat_schedule = {
+    **(celery_app.conf.beat_schedule or {}),
+    "archive-ocr-partitions-monthly": {
+        "task": "app.modules.verification.ocr.tasks.archive_ocr_partitions",
+        "schedule": crontab(minute=0, hour=3, day_of_month=1),
+    },
+}
+
+
+async def _run_archive():
+    # worker 进程中每次任务单独建连，避免与 FastAPI 进程的连接池共享事件循环
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            return await archive_old_partitions(db)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(bind=True, base=BaseTaskWithRetry, name="app.modules.verification.ocr.tasks.archive_ocr_partitions")
+def archive_ocr_partitions(self):
+    """
+    定时任务：维护 ocr_results 月度分区并冷归档旧分区的 recognized_text / extracted_data。
+    """
+    logger.info("Starting OCR partition archival")
+    results = asyncio.run(_run_archive())
+    logger.info("OCR partition archival finished", extra={"archived": results})
+    return results
+
+
+# ---------------------------
+# NER：模型只在消费 ocr 队列的 worker 中加载
+#
+# 微批合并依赖同一进程内的并发任务，ocr 队列的 worker 需使用 threads（或 gevent）池启动，例如：
+#   celery -A app.modules.notification.tasks worker -Q ocr --pool threads --concurrency 16
+# concurrency 建议不小于 NER_BATCH_SIZE；prefork / solo 池每个进程同时只执行一个任务，批大小恒为 1。
+# ---------------------------
+_consumes_ocr_queue = False
+# prefork / solo 池：在 worker_process_init 中预加载；threads / gevent 池不发送该信号，改在 worker_ready 中预加载
+_process_pool = True
+
+
+@celeryd_after_setup.connect
+def _record_worker_queues(sender, instance, **kwargs):
+    global _consumes_ocr_queue, _process_pool
+    _consumes_ocr_queue = "ocr" in instance.app.amqp.queues.consume_from
+    pool = getattr(instance.pool_cls, "__module__", "").rsplit(".", 1)[-1]
+    _process_pool = pool in ("prefork", "solo")
+    if _consumes_ocr_queue and _process_pool:
+        logger.warning(
+            "Worker %s consumes the ocr queue with the %s pool; NER micro-batching needs --pool threads or gevent.",
+            sender, pool,
+        )
+
+
+@worker_process_init.connect
+def _warm_ner_pipeline(**kwargs):
+    # prefork 子进程启动时预加载，避免第一个任务承担数秒的模型加载时间
+    if settings.NER_PRELOAD_IN_WORKER and _consumes_ocr_queue and _process_pool:
+        ner_service.warm()
+
+
+@worker_ready.connect
+def _warm_ner_pipeline_in_threads(**kwargs):
+    # threads / gevent 池的任务在 worker 主进程中执行，就绪时预加载一次，所有并发任务共享同一模型
+    if settings.NER_PRELOAD_IN_WORKER and _consumes_ocr_queue and not _process_pool:
+        ner_service.warm()
+
+
+@celery_app.task(bind=True, base=BaseTaskWithRetry, name="app.modules.verification.ocr.tasks.extract_entities")
+def extract_entities(self, text, types=None):
+    """
+    识别 OCR 文本中的命名实体（可按类型过滤，如 ["DATE"]）。
+    同一 worker 进程内的并发任务（threads/gevent 池）由 NER 服务合并为一次前向计算。
+    """
+    return ner_service.extract_entities(text, types=types)
+
+
+@celery_app.task(name="app.modules.verification.ocr.tasks.ner_status")
+def ner_status():
+    """返回当前 worker 进程中 NER 模型的 cold / loading / warm / failed 状态及批处理统计。"""
+    return ner_service.status()
@@ -0,0 +1,285 @@
+# 代码路径: app/modules/verification/ocr/templates.py
+
+import asyncio
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.modules.verification.ocr.confidence import score_confidence, weighted_word_confidence
+from app.modules.verification.ocr.dates import parse_date, parse_mrz_date
+from app.modules.verification.ocr.engine import OCRText, recognize
+from app.modules.verification.ocr.fields import DATE_VALUE
+from app.modules.verification.ocr.mrz import check_results, corrected_fields, parse_mrz
+
+logger = logging.getLogger("CheckEasyBackend.verification.ocr.templates")
+
+# Tesseract 页面分割模式：单个文本块 / 单行
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+
+# 常用字符白名单（不含空格与引号，pytesseract 以命令行参数传递）
+DIGITS = "0123456789"
+UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MRZ_CHARS = UPPER + DIGITS + "<"
+
+# 直接放在识别结果顶层的字段，其余字段放入 additional_info
+_TOP_LEVEL = ("document_number", "name", "birth_date", "expiry_date")
+
+_DOC_LABELS = {"id_card": "ID card", "driver_license": "Driver license"}
+
+_COUNTRY_ALIASES = {"CN": "CHN", "CHINA": "CHN", "GB": "GBR", "UK": "GBR", "UNITED KINGDOM": "GBR"}
+
+
+@dataclass(frozen=True)
+class FieldRegion:
+    """
+    模板中的一个字段区域：box 为相对卡片宽高的 (左, 上, 右, 下) 比例坐标；
+    kind 为 text、date（取第一个日期）、validity（有效期限，取最后一个日期）或 mrz。
+    """
+    name: str
+    box: Tuple[float, float, float, float]
+    kind: str = "text"
+    whitelist: Optional[str] = None
+    psm: int = PSM_SINGLE_LINE
+    language: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CardTemplate:
+    """
+    某国某类证件某一面的版式：对齐后的画布尺寸（默认 ID-1 卡 85.6×54mm，约 15 像素/毫米）、字段区域，
+    以及可选的后处理（就地补充字段，返回校验结果或 None）。
+    """
+    doc_type: str
+    country: str
+    side: str
+    fields: Tuple[FieldRegion, ...]
+    size: Tuple[int, int] = (1284, 810)
+    postprocess: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, bool]]]] = None
+
+
+def find_template(
+    templates: Dict[Tuple[str, str], CardTemplate], country: str, side: Optional[str] = None
+) -> Optional[CardTemplate]:
+    """按国家（ISO 3166 三字母代码，兼容常见别名）与证件面查找模板，找不到时使用通用模板（国家为 *）。"""
+    code = country.strip().upper()
+    code = _COUNTRY_ALIASES.get(code, code)
+    side = (side or "front").strip().lower()
+    return templates.get((code, side)) or templates.get(("*", side))
+
+
+# ---------------------------
+# 卡片对齐
+# ---------------------------
+def _quad_area(corners) -> float:
+    xs, ys = corners[:, 0], corners[:, 1]
+    return abs(float((xs * (ys[[1, 2, 3, 0]]) - ys * (xs[[1, 2, 3, 0]])).sum())) / 2
+
+
+def find_card_corners(image: Image.Image, contrast: int = None, max_side: int = 480):
+    """
+    在缩小的灰度图上定位卡片四角（左上、右上、右下、左下），返回原图坐标的 4×2 数组；找不到时返回 None。
+    以图像边缘像素的中位数作为背景灰度，与之相差超过 contrast 的像素视为卡片，
+    腐蚀去掉噪点后取 x+y、x−y 的极值点作为四角；适用于背景较均匀、倾斜不大的拍摄。
+    """
+    import numpy as np  # 延迟导入，避免 API 进程启动时加载
+
+    scale = min(1.0, max_side / max(image.size))
+    small = image.convert("L")
+    if scale < 1.0:
+        small = small.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))))
+    gray = np.asarray(small, dtype=np.int16)
+    border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+    threshold = contrast if contrast is not None else settings.OCR_CARD_CONTRAST
+    mask = np.abs(gray - int(np.median(border))) > threshold
+    # 两次十字形腐蚀，避免极值点落在杂散像素上
+    for _ in range(2):
+        eroded = mask.copy()
+        eroded[1:, :] &= mask[:-1, :]
+        eroded[:-1, :] &= mask[1:, :]
+        eroded[:, 1:] &= mask[:, :-1]
+        eroded[:, :-1] &= mask[:, 1:]
+        mask = eroded
+
+    ys, xs = np.nonzero(mask)
+    if xs.size < mask.size * 0.2:
+        return None
+    total, diff = xs + ys, xs - ys
+    picks = (total.argmin(), diff.argmax(), total.argmax(), diff.argmin())
+    corners = np.array([(xs[i], ys[i]) for i in picks], dtype=float) / scale
+    if _quad_area(corners) < 0.2 * image.width * image.height:
+        return None
+    return corners
+
+
+def perspective_coefficients(source: Sequence[Sequence[float]], size: Tuple[int, int]) -> List[float]:
+    """
+    4 点 DLT：求把 size 画布四角映射到 source 四角（左上、右上、右下、左下）的单应矩阵，
+    返回 Image.transform(PERSPECTIVE) 所需的 8 个系数。
+    """
+    import numpy as np
+
+    width, height = size
+    target = ((0, 0), (width, 0), (width, height), (0, height))
+    rows, values = [], []
+    for (x, y), (u, v) in zip(target, source):
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+        values.extend((u, v))
+    return np.linalg.solve(np.array(rows, dtype=float), np.array(values, dtype=float)).tolist()
+
+
+def align_card(image: Image.Image, size: Tuple[int, int]) -> Tuple[Image.Image, bool]:
+    """将拍摄的卡片透视校正到模板画布；找不到卡片边缘时视为已裁剪好的卡片，直接缩放。返回 (图像, 是否校正)。"""
+    corners = find_card_corners(image)
+    if corners is not None:
+        try:
+            coefficients = perspective_coefficients(corners, size)
+            return image.transform(size, Image.Transform.PERSPECTIVE, coefficients, Image.Resampling.BILINEAR), True
+        except Exception as e:
+            logger.warning("Card homography failed, falling back to resize: %s", e)
+    return image.resize(size, Image.Resampling.BILINEAR), False
+
+
+# ---------------------------
+# 字段区域识别
+# ---------------------------
+@lru_cache(maxsize=1)
+def _region_pool() -> ThreadPoolExecutor:
+    # 每个线程在 ocr.engine 中各自持有常驻的 Tesseract 实例
+    return ThreadPoolExecutor(max_workers=settings.OCR_REGION_WORKERS, thread_name_prefix="ocr-region")
+
+
+def _recognize_region(card: Image.Image, region: FieldRegion) -> OCRText:
+    width, height = card.size
+    left, top, right, bottom = region.box
+    crop = ImageOps.autocontrast(card.crop((round(left * width), round(top * height),
+                                            round(right * width), round(bottom * height))))
+    return recognize(crop, psm=region.psm, whitelist=region.whitelist, language=region.language)
+
+
+def read_regions(card: Image.Image, template: CardTemplate) -> Dict[str, OCRText]:
+    """并行识别模板中的全部字段区域。"""
+    card.load()
+    pool = _region_pool()
+    futures = {region.name: pool.submit(_recognize_region, card, region) for region in template.fields}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _dates(text: str) -> List[str]:
+    return [parsed for parsed in (parse_date(match.group()) for match in DATE_VALUE.finditer(text)) if parsed]
+
+
+def _from_mrz(extracted: Dict[str, Any], parsed: Dict[str, Any]) -> None:
+    extracted.update({
+        "document_number": parsed["number"],
+        "name": f"{parsed['surname']} {parsed['names']}".strip(),
+        "birth_date": parse_mrz_date(parsed["date_of_birth"]),
+        "expiry_date": parse_mrz_date(parsed["expiration_date"]),
+    })
+    extracted["additional_info"].update({"nationality": parsed["nationality"], "sex": parsed["sex"]})
+
+
+def extract_card(image: Image.Image, template: CardTemplate) -> Dict[str, Any]:
+    """
+    按模板识别一张卡片：透视校正后只对各字段的小区域做 OCR（带字符白名单，线程池并行），
+    再按字段类型解析日期 / MRZ，执行模板后处理，并计算综合置信度。
+    """
+    started = time.perf_counter()
+    card, aligned = align_card(image.convert("L"), template.size)
+    metrics.inc("ocr_template_alignment_total", result="aligned" if aligned else "resized")
+    results = read_regions(card, template)
+
+    # 模板包含 MRZ 区域时，识别结果必须带有校验位结果才能自动通过
+    extracted: Dict[str, Any] = {
+        "additional_info": {},
+        "has_mrz": any(region.kind == "mrz" for region in template.fields),
+    }
+    check_digits: Optional[Dict[str, bool]] = None
+    words = []
+    for region in template.fields:
+        result = results[region.name]
+        words.extend(result.words)
+        text = " ".join(result.text.split())
+        if region.kind == "mrz":
+            parsed = parse_mrz(result.text.splitlines())
+            if parsed:
+                _from_mrz(extracted, parsed)
+                check_digits = check_results(parsed)
+                extracted["corrected_fields"] = corrected_fields(parsed)
+            continue
+        if region.kind == "date":
+            value = next(iter(_dates(text)), None)
+        elif region.kind == "validity":
+            value = next(reversed(_dates(text)), None)
+        else:
+            value = text or None
+        if value:
+            (extracted if region.name in _TOP_LEVEL else extracted["additional_info"])[region.name] = value
+
+    if template.postprocess:
+        check_digits = template.postprocess(extracted) or check_digits
+    extracted["extracted_text"] = "\n".join(f"{name}: {result.text.strip()}" for name, result in results.items())
+    extracted["check_digits"] = check_digits
+    extracted["confidence_score"] = score_confidence(check_digits, weighted_word_confidence(words))
+    metrics.observe("ocr_template_seconds", time.perf_counter() - started,
+                    doc_type=template.doc_type, country=template.country)
+    return extracted
+
+
+async def process_card(file, template: CardTemplate) -> dict:
+    """读取上传的卡片图片并按模板识别，返回与 process_passport 相同结构的结果。"""
+    label = _DOC_LABELS.get(template.doc_type, template.doc_type)
+    try:
+        await file.seek(0)
+        file_bytes = await file.read()
+        # 手机拍摄的照片按 EXIF 方向摆正
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(file_bytes)))
+        loop = asyncio.get_running_loop()
+        extracted_data = await loop.run_in_executor(None, extract_card, image, template)
+
+        if not any(extracted_data.get(name) for name in _TOP_LEVEL):
+            return {
+                "success": False,
+                "data": None,
+                "next_action": None,
+                "message": f"{label} fields could not be recognized. Please upload a clearer image."
+            }
+
+        expiry_date_str = extracted_data.get("expiry_date")
+        if expiry_date_str:
+            expiry_date = datetime.fromisoformat(expiry_date_str).date()
+            if expiry_date < datetime.utcnow().date():
+                extracted_data["document_status"] = "expired"
+                message = f"{label} recognized successfully, but it is expired."
+            else:
+                extracted_data["document_status"] = "valid"
+                message = f"{label} recognized successfully."
+        else:
+            extracted_data["document_status"] = "unknown"
+            message = f"{label} recognized, but expiry date not found."
+
+        return {
+            "success": True,
+            "data": extracted_data,
+            "next_action": None,
+            "message": message
+        }
+
+    except Exception as e:
+        logger.error("Error in %s processing: %s", template.doc_type, str(e), exc_info=True)
+        return {
+            "success": False,
+            "data": None,
+            "next_action": None,
+            "message": f"{label} processing failed: {str(e)}"
+        }
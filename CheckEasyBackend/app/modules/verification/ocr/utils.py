@@ -1,16 +1,20 @@
 # 代码路径: app/modules/verification/ocr/utils.py
 
 import io
-import re
 import logging
 import asyncio
 from datetime import datetime
 from typing import Optional, Dict, Any
 from app.modules.verification.ocr.passport.utils import process_passport
+from app.modules.verification.ocr.id_card.utils import process_id_card
+from app.modules.verification.ocr.driver_license.utils import process_driver_license
+from app.modules.verification.ocr.confidence import score_confidence, weighted_word_confidence
+from app.modules.verification.ocr.dates import parse_date
+from app.modules.verification.ocr.engine import recognize
+from app.modules.verification.ocr.fields import DATE_FIELDS, scan_fields
+from app.modules.verification.ocr.nlp.date_extraction import extract_dates_cascade
 
-import pytesseract
 from PIL import Image, ImageEnhance, ImageFilter
-from passporteye import read_mrz
 
 from app.modules.verification.ocr.schemas import OCRResponse
 
@@ -27,29 +31,23 @@ def preprocess_image(image: Image.Image) -> Image.Image:
         raise
 
 def extract_fields(text: str) -> Dict[str, Any]:
-    extracted = {}
-    patterns = {
-        "name": r"Name\s*[:：]\s*(.+)",
-        "document_number": r"(?:ID|Passport No\.?)[\s:：]*([\w\d]+)",
-        "birth_date": r"(?:Birth(?:date)?|Date of birth)[:：]?\s*(\d{4}-\d{2}-\d{2}|\d{1,2}\s+[A-Za-z]{3}\s+\d{4})",
-        "expiry_date": r"(?:Expiry(?: Date)?|Date of expiry)[:：]?\s*(\d{4}-\d{2}-\d{2}|\d{1,2}\s+[A-Za-z]{3}\s+\d{4})"
+    """
+    从 OCR 文本中抽取姓名、证件号与日期：一次扫描取得所有带标签字段，日期再经级联抽取（必要时调用 NER）。
+    """
+    candidates = scan_fields(text)
+    extracted = {
+        field: values[0]
+        for field, values in candidates.items()
+        if values and field not in DATE_FIELDS
     }
-
-    extracted = {}
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            extracted[field] = match_date(match.group(1).strip()) if 'date' in field else match.group(1).strip()
-
+    dates = extract_dates_cascade(text, labelled=candidates)
+    for field, value in dates.dates.items():
+        if value:
+            extracted[field] = value
     return extracted
 
-def match_date(date_str: str) -> Optional[str]:
-    for fmt in ("%Y-%m-%d", "%d %b %Y", "%Y%m%d"):
-        try:
-            return datetime.strptime(date_str.strip(), fmt).date().isoformat()
-        except ValueError:
-            continue
-    return None
+# 保留旧名称，统一使用 ocr.dates 中的日期解析
+match_date = parse_date
 
 async def process_document(
     file, doc_type: str, country: str, side: Optional[str] = None, user_id: Optional[int] = None
@@ -57,19 +55,27 @@ async def process_document(
     try:
         if doc_type.lower() == "passport":
             return await process_passport(file)
-        elif doc_type.lower() in ["driver_license", "id_card"]:
-            return {"success": False, "message": f"OCR for {doc_type} is not implemented."}
+        elif doc_type.lower() == "id_card":
+            # 按国家模板只识别字段区域，而非整页 OCR
+            return await process_id_card(file, country, side)
+        elif doc_type.lower() == "driver_license":
+            return await process_driver_license(file, country, side)
         else:
             file_bytes = await file.read()
             image = Image.open(io.BytesIO(file_bytes))
             processed_image = preprocess_image(image)
             loop = asyncio.get_running_loop()
-            ocr_text = await loop.run_in_executor(None, pytesseract.image_to_string, processed_image)
+            # 常驻引擎的 API 实例按线程复用；一次识别同时得到文本与逐词置信度
+            ocr_result = await loop.run_in_executor(None, recognize, processed_image)
+            ocr_text = ocr_result.text
 
             if not ocr_text.strip():
                 return {"success": False, "message": "OCR could not recognize any text. Please upload a clearer image."}
 
-            extracted_data = extract_fields(ocr_text)
+            # NER 兜底可能需要等待 OCR worker，放到线程池中执行
+            extracted_data = await loop.run_in_executor(None, extract_fields, ocr_text)
+            # 非 MRZ 证件没有校验位，仅使用 Tesseract 词置信度
+            extracted_data["confidence_score"] = score_confidence(None, weighted_word_confidence(ocr_result.words))
             cert_result = process_certificate_verification(extracted_data.get("expiry_date", ""), extracted_data.get("document_number", "unknown"))
             extracted_data["document_status"] = cert_result["status"]
 
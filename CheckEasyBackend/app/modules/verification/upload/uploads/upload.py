@@ -7,16 +7,19 @@ import shutil
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.db import get_async_db
 from app.core.dependencies import get_current_user
 from app.modules.verification.ocr.routes import process_document, serialize_dates
 from app.modules.verification.ocr.models import OCRResult, OCRStatus
+from app.modules.verification.ocr.confidence import requires_review
 from app.core.email import send_email  # 引入邮件发送功能
 from app.modules.auth.register.models import User
 
 router = APIRouter()
 
-UPLOAD_DIR = Path("app/modules/verification/upload/uploaded_passport")
+# 原图保存在文档存储目录下，审核图片接口只读取该目录内的文件
+UPLOAD_DIR = Path(settings.DOCUMENT_STORE_DIR) / "uploaded_passport"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @router.post(
@@ -58,6 +61,7 @@ async def upload_passport(
         )
 
     serialized_data = serialize_dates(ocr_result["data"])
+    review_required = requires_review(serialized_data)
 
     # 存入OCR结果及文件路径到数据库
     new_ocr_result = OCRResult(
@@ -67,15 +71,15 @@ async def upload_passport(
         side=side,
         document_number=serialized_data.get("document_number"),
         name=serialized_data.get("name"),
-        birth_date=datetime.strptime(serialized_data.get("birth_date"), '%Y-%m-%d').date(),
-        expiry_date=datetime.strptime(serialized_data.get("expiry_date"), '%Y-%m-%d').date(),
+        birth_date=datetime.strptime(serialized_data.get("birth_date"), '%Y-%m-%d').date() if serialized_data.get("birth_date") else None,
+        expiry_date=datetime.strptime(serialized_data.get("expiry_date"), '%Y-%m-%d').date() if serialized_data.get("expiry_date") else None,
         status=OCRStatus.success,
         confidence_score=serialized_data.get("confidence_score"),
         recognized_text=serialized_data.get("recognized_text"),
         extracted_data=serialized_data.get("extracted_data"),
         upload_time=datetime.utcnow(),
         process_time=datetime.utcnow(),
-        review_required=False,
+        review_required=review_required,  # 证件无效或低置信度结果进入人工审核队列
         uploader_ip=request.client.host,
         passport_image_path=str(saved_filepath)  # 保存文件路径
     )
@@ -86,7 +90,8 @@ async def upload_passport(
 
     # --- 更新用户的审核状态 ---
     try:
-        current_user.verification_status = "pending"
+        # 高置信度（校验位全部通过）的结果自动通过，无需等待人工审核
+        current_user.verification_status = "pending" if review_required else "approved"
         await db.commit()
     except Exception as e:
         raise HTTPException(
@@ -97,14 +102,21 @@ async def upload_passport(
     # --- 发送邮件通知 ---
     try:
         subject = "护照上传成功"
-        body = "您的护照已成功上传，请等待5-10分钟进行人工审核。"
+        if review_required:
+            body = "您的护照已成功上传，请等待5-10分钟进行人工审核。"
+        else:
+            body = "您的护照已成功上传并通过自动审核。"
         send_email(to=current_user.email, subject=subject, body=body, is_html=False)
     except Exception as e:
         # 记录错误，但不阻止上传成功
         print("Failed to send notification email:", e)
 
+    if review_required:
+        message = "Passport uploaded successfully. Please wait 5-10 minutes for manual verification."
+    else:
+        message = "Passport uploaded and verified automatically."
     return {
-        "message": "Passport uploaded successfully. Please wait 5-10 minutes for manual verification.",
+        "message": message,
         "ocr_data": serialized_data,
         "image_saved_as": saved_filename,
         "verification_status": current_user.verification_status
@@ -0,0 +1,126 @@
+# File: CheckEasyBackend/scripts/bench_email.py
+"""
+邮件发送吞吐基准：线程池（run_in_threadpool + smtplib）对比原生异步（aiosmtplib）。
+
+在本地启动一个最小化的 SMTP 替身服务（不落盘、不转发），每条 SMTP 命令的响应前
+人为加入固定延迟以模拟真实网络往返，然后分别用两种方式并发发送同样数量的邮件。
+
+用法（在 CheckEasyBackend 目录下）:
+    python scripts/bench_email.py --count 200 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+
+from app.core import email as email_module  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+class SMTPStandIn:
+    """
+    最小化 SMTP 替身：支持 EHLO/HELO、AUTH PLAIN、MAIL、RCPT、DATA、RSET、NOOP、QUIT。
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.delivered = 0
+        self.server = None
+
+    async def _reply(self, writer: asyncio.StreamWriter, text: str) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(text.encode("ascii"))
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._reply(writer, "220 localhost SMTP stand-in ready\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+                if command == "EHLO":
+                    await self._reply(writer, "250-localhost\r\n250-PIPELINING\r\n250-AUTH PLAIN\r\n250 8BITMIME\r\n")
+                elif command == "AUTH":
+                    await self._reply(writer, "235 2.7.0 Authentication successful\r\n")
+                elif command == "DATA":
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>\r\n")
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    self.delivered += 1
+                    await self._reply(writer, "250 2.0.0 Ok: queued\r\n")
+                elif command == "QUIT":
+                    await self._reply(writer, "221 2.0.0 Bye\r\n")
+                    break
+                elif command in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                    await self._reply(writer, "250 2.0.0 Ok\r\n")
+                else:
+                    await self._reply(writer, "502 5.5.2 Command not recognized\r\n")
+        finally:
+            writer.close()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def _bench_threadpool(count: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_in_threadpool(email_module.send_email, to=f"guest{i}@example.com", subject="bench", body="bench")
+        for i in range(count)
+    ))
+    return time.perf_counter() - start
+
+
+async def _bench_async(count: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        email_module.send_email_async(to=f"guest{i}@example.com", subject="bench", body="bench")
+        for i in range(count)
+    ))
+    return time.perf_counter() - start
+
+
+async def main(count: int, latency_ms: float, concurrency: int) -> None:
+    stand_in = SMTPStandIn(latency=latency_ms / 1000)
+    port = await stand_in.start()
+
+    # 指向本地替身，关闭 STARTTLS
+    settings.SMTP_SERVER = "127.0.0.1"
+    settings.SMTP_PORT = port
+    settings.SMTP_USE_TLS = False
+    settings.SMTP_ASYNC_MAX_CONCURRENCY = concurrency
+
+    try:
+        results = {
+            "threadpool (smtplib)": await _bench_threadpool(count),
+            "native async (aiosmtplib)": await _bench_async(count),
+        }
+    finally:
+        await stand_in.stop()
+
+    print(f"emails={count} latency_per_reply={latency_ms}ms async_concurrency={concurrency} delivered={stand_in.delivered}")
+    for name, elapsed in results.items():
+        print(f"{name:<28} {elapsed:8.3f}s  {count / elapsed:8.1f} emails/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SMTP delivery throughput benchmark")
+    parser.add_argument("--count", type=int, default=200, help="发送邮件数量")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="替身服务每条响应前的延迟（毫秒）")
+    parser.add_argument("--concurrency", type=int, default=settings.SMTP_ASYNC_MAX_CONCURRENCY, help="异步路径最大并发会话数")
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.latency_ms, args.concurrency))
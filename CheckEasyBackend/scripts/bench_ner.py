@@ -0,0 +1,146 @@
+# File: CheckEasyBackend/scripts/bench_ner.py
+"""
+NER 推理后端基准：int8 ONNX（onnxruntime）对比 torch 路径（Stanza，或同一 Hugging Face 模型的 fp32 torch 版本）。
+
+- 延迟：逐条推理的 p50 / p95，以及按批推理的吞吐（条/秒）；
+- 准确度：DATE 实体解析成 ISO 日期后的精确率 / 召回率 / F1。
+  提供 --gold（JSONL，每行 {"text": ..., "dates": ["1995-03-02", ...]}）时与标注比较，
+  否则以 --reference 后端的输出为基准计算一致度。
+
+用法（在 CheckEasyBackend 目录下）:
+    python scripts/bench_ner.py --backends stanza onnx --corpus samples.txt --threads 1 2 4
+    python scripts/bench_ner.py --backends hf onnx --hf-model <导出 ONNX 时使用的模型> --gold gold.jsonl
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+from app.modules.verification.ocr.dates import parse_date  # noqa: E402
+
+SAMPLES = [
+    "PASSPORT P CHN EJ4391314\nCHEN, JIAHAO Sex M Nationality CHINESE Date of birth 02 MAR 1995\n"
+    "Date of issue 14 JUN 2019 Date of expiry 13 JUN 2029",
+    "DRIVER LICENSE  DOB 08/31/1988  EXP 08/31/2027  ISS 09/01/2019  CLASS C",
+    "Name: Anna Maria Eriksson\nBirth: 1974-08-12\nExpiry Date: 2031-04-15\nAuthority: Passport Office",
+    "The Ministry of Foreign Affairs requests all civil and military authorities to allow the bearer "
+    "to pass freely. Valid until 3 January 2030.",
+]
+
+
+def load_backend(name: str, threads: int, hf_model: Optional[str]) -> Callable[[List[str]], List[List[Dict]]]:
+    if name == "onnx":
+        from app.modules.verification.ocr.nlp.onnx_ner import OnnxNERBackend
+        return OnnxNERBackend(settings.NER_ONNX_MODEL_DIR, intra_op_threads=threads).predict
+    if name == "stanza":
+        import torch
+        from app.modules.verification.ocr.nlp.ner_service import StanzaBackend
+        torch.set_num_threads(threads)
+        return StanzaBackend(settings.NER_LANGUAGE).predict
+    if name == "hf":
+        import torch
+        from transformers import pipeline
+        if not hf_model:
+            raise SystemExit("--hf-model is required for the hf backend")
+        torch.set_num_threads(threads)
+        ner = pipeline("ner", model=hf_model, aggregation_strategy="simple", device=-1)
+
+        def predict(texts: List[str]) -> List[List[Dict]]:
+            return [
+                [{"text": e["word"], "type": e["entity_group"], "start_char": e["start"], "end_char": e["end"]}
+                 for e in entities]
+                for entities in ner(texts)
+            ]
+        return predict
+    raise SystemExit(f"unknown backend: {name}")
+
+
+def parsed_dates(entities: List[Dict]) -> Set[str]:
+    return {parsed for parsed in (parse_date(e["text"]) for e in entities if e["type"] == "DATE") if parsed}
+
+
+def score(predicted: List[Set[str]], expected: List[Set[str]]) -> Dict[str, float]:
+    tp = sum(len(p & e) for p, e in zip(predicted, expected))
+    fp = sum(len(p - e) for p, e in zip(predicted, expected))
+    fn = sum(len(e - p) for p, e in zip(predicted, expected))
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def bench(predict, texts: List[str], batch_size: int, rounds: int) -> Dict[str, float]:
+    predict(texts[:1])  # 预热
+    latencies = []
+    for _ in range(rounds):
+        for text in texts:
+            started = time.perf_counter()
+            predict([text])
+            latencies.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for offset in range(0, len(texts), batch_size):
+            predict(texts[offset:offset + batch_size])
+    throughput = rounds * len(texts) / (time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "docs_per_s": throughput,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark NER backends (latency and DATE accuracy)")
+    parser.add_argument("--backends", nargs="+", default=["stanza", "onnx"], choices=["stanza", "hf", "onnx"])
+    parser.add_argument("--reference", default=None, help="无标注时作为基准的后端（默认 --backends 中第一个）")
+    parser.add_argument("--hf-model", default=None, help="hf 后端使用的模型（应与导出 ONNX 的模型一致）")
+    parser.add_argument("--corpus", default=None, help="文本文件，每个空行分隔一个文档")
+    parser.add_argument("--gold", default=None, help="JSONL 标注文件：{\"text\": ..., \"dates\": [...]}")
+    parser.add_argument("--threads", nargs="+", type=int, default=[settings.NER_ONNX_INTRA_OP_THREADS])
+    parser.add_argument("--batch-size", type=int, default=settings.NER_BATCH_SIZE)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    expected: Optional[List[Set[str]]] = None
+    if args.gold:
+        records = [json.loads(line) for line in Path(args.gold).read_text(encoding="utf-8").splitlines() if line.strip()]
+        texts = [record["text"] for record in records]
+        expected = [set(record["dates"]) for record in records]
+    elif args.corpus:
+        texts = [doc.strip() for doc in Path(args.corpus).read_text(encoding="utf-8").split("\n\n") if doc.strip()]
+    else:
+        texts = SAMPLES
+
+    reference = args.reference or args.backends[0]
+    outputs: Dict[str, List[Set[str]]] = {}
+    print(f"{len(texts)} documents, batch size {args.batch_size}, {args.rounds} rounds")
+    print(f"{'backend':<8} {'threads':>7} {'p50 ms':>9} {'p95 ms':>9} {'docs/s':>9}")
+    for name in args.backends:
+        for threads in args.threads:
+            predict = load_backend(name, threads, args.hf_model)
+            result = bench(predict, texts, args.batch_size, args.rounds)
+            print(f"{name:<8} {threads:>7} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['docs_per_s']:>9.1f}")
+        outputs[name] = [parsed_dates(entities) for entities in predict(texts)]
+
+    baseline = expected if expected is not None else outputs[reference]
+    label = "gold" if expected is not None else f"reference={reference}"
+    print(f"\nDATE accuracy ({label})")
+    print(f"{'backend':<8} {'precision':>9} {'recall':>9} {'f1':>9}")
+    for name, predicted in outputs.items():
+        if expected is None and name == reference:
+            continue
+        result = score(predicted, baseline)
+        print(f"{name:<8} {result['precision']:>9.3f} {result['recall']:>9.3f} {result['f1']:>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# File: CheckEasyBackend/scripts/export_onnx_ner.py
+"""
+将 Hugging Face token 分类（NER）模型导出为 ONNX，并做 int8 动态量化，供 NER_BACKEND=onnx 使用。
+
+输出目录包含 model.int8.onnx、tokenizer.json 与 config.json（见 app/modules/verification/ocr/nlp/onnx_ner.py）。
+注意：extract_dates 依赖 DATE 标签，需要使用 OntoNotes 风格标签集的模型；
+CoNLL-03 模型（如 app/nlp_test.py 中的 dbmdz/bert-large-cased-finetuned-conll03-english）只有 PER/ORG/LOC/MISC。
+
+用法（在 CheckEasyBackend 目录下，需要 torch、transformers、onnx、onnxruntime）:
+    python scripts/export_onnx_ner.py --model <模型名或本地目录> --output models/ner-onnx
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def export(model_name: str, output: Path, opset: int) -> None:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+    output.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForTokenClassification.from_pretrained(model_name)
+    model.eval()
+    if not any(label.endswith("DATE") for label in model.config.id2label.values()):
+        print(f"warning: {model_name} has no DATE label; extract_dates will return nothing", file=sys.stderr)
+
+    sample = tokenizer(["Date of birth 02 MAR 1995"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = output / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    # 动态量化：权重量化为 int8，激活在推理时按批次量化，无需校准数据
+    quantize_dynamic(str(fp32_path), str(output / "model.int8.onnx"), weight_type=QuantType.QInt8)
+
+    tokenizer.backend_tokenizer.save(str(output / "tokenizer.json"))
+    model.config.to_json_file(str(output / "config.json"))
+    fp32_size = fp32_path.stat().st_size / 2 ** 20
+    int8_size = (output / "model.int8.onnx").stat().st_size / 2 ** 20
+    print(f"exported {model_name} -> {output} (fp32 {fp32_size:.1f} MiB, int8 {int8_size:.1f} MiB)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export an int8-quantized ONNX NER model")
+    parser.add_argument("--model", required=True, help="Hugging Face 模型名或本地目录（需包含 DATE 标签）")
+    parser.add_argument("--output", default="models/ner-onnx", help="输出目录（NER_ONNX_MODEL_DIR）")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset 版本")
+    parser.add_argument("--keep-fp32", action="store_true", help="保留未量化的 model.onnx（基准对比时使用）")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    export(args.model, output, args.opset)
+    if not args.keep_fp32:
+        (output / "model.onnx").unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# File: CheckEasyBackend/scripts/import_profile.py
+"""
+导入耗时分析：在独立子进程中以 `python -X importtime` 导入指定模块（默认 app.main），
+按累计耗时列出最慢的模块，并检查是否意外加载了重型 OCR/NLP 依赖。
+
+API 进程启动时不应加载 torch、stanza、passporteye、pytesseract 等库，
+它们只在 OCR worker 或首次处理证件时按需导入。
+
+用法（在 CheckEasyBackend 目录下）:
+    python scripts/import_profile.py --top 30
+    python scripts/import_profile.py --module app.modules.verification.ocr.tasks
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# API 进程启动时不应出现在 sys.modules 中的重型依赖
+HEAVY_MODULES = ("torch", "stanza", "transformers", "passporteye", "pytesseract", "skimage", "scipy", "onnxruntime", "tesserocr")
+
+
+def profile_imports(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    返回 (子进程导入总耗时秒数, [(模块名, 自身耗时微秒, 累计耗时微秒), ...])。
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        tail = "\n".join(completed.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"Importing {module} failed:\n{tail}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return elapsed, entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile import time of the API entry point")
+    parser.add_argument("--module", default="app.main", help="要导入的模块")
+    parser.add_argument("--top", type=int, default=25, help="列出累计耗时最长的模块数")
+    parser.add_argument("--budget", type=float, default=None, help="导入耗时预算（秒），超出时返回非零退出码")
+    args = parser.parse_args()
+
+    elapsed, entries = profile_imports(args.module)
+    print(f"import {args.module}: {elapsed:.2f}s wall, {len(entries)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    loaded: Dict[str, int] = {}
+    for name, _, cumulative_us in entries:
+        top_level = name.strip().split(".")[0]
+        if top_level in HEAVY_MODULES:
+            loaded[top_level] = max(loaded.get(top_level, 0), cumulative_us)
+
+    status = 0
+    if loaded:
+        print("\nHeavy modules loaded at import time:")
+        for name, cumulative_us in sorted(loaded.items(), key=lambda e: e[1], reverse=True):
+            print(f"  {name}: {cumulative_us / 1000:.1f} ms")
+        status = 1
+    else:
+        print("\nNo heavy OCR/NLP modules loaded.")
+    if args.budget is not None and elapsed > args.budget:
+        print(f"Import time {elapsed:.2f}s exceeds budget {args.budget:.2f}s")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
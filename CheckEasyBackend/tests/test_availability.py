@@ -0,0 +1,65 @@
+# File: CheckEasyBackend/tests/test_availability.py
+from datetime import date, timedelta
+
+import pytest
+
+from app.modules.checkin.availability import AvailabilityEngine
+
+START = date(2025, 3, 1)
+
+
+def make_engine(rooms=("101", "102", "103")):
+    engine = AvailabilityEngine(START, 60)
+    for room in rooms:
+        engine.add_room(room)
+    return engine
+
+
+def day(offset):
+    return START + timedelta(days=offset)
+
+
+# 测试区间占用：[入住日, 退房日) 内不可用，退房当晚可用
+def test_occupied_nights_exclude_checkout_day():
+    engine = make_engine()
+    engine.occupy("101", day(3), day(6))
+    assert engine.free_rooms(day(0), day(3)) == ["101", "102", "103"]
+    assert engine.free_rooms(day(5), day(7)) == ["102", "103"]
+    assert engine.free_rooms(day(6), day(9)) == ["101", "102", "103"]
+
+
+# 测试跨字节边界的区间（第 7、8 晚位于不同字节）
+def test_range_across_byte_boundary():
+    engine = make_engine()
+    engine.occupy("102", day(7), day(9))
+    assert not engine.is_free("102", day(8), day(9))
+    assert engine.is_free("102", day(0), day(7))
+    assert engine.free_rooms(day(1), day(20)) == ["101", "103"]
+
+
+# 测试退房释放与未填写预计退房日期的长期占用
+def test_release_and_open_ended_stay():
+    engine = make_engine()
+    engine.occupy("103", day(2))
+    assert "103" not in engine.free_rooms(day(50), day(55))
+    engine.release("103", day(10))
+    assert "103" in engine.free_rooms(day(10), day(55))
+    assert not engine.is_free("103", day(9), day(10))
+
+
+# 测试新房间自动加入及位图扩容
+def test_rooms_added_on_demand():
+    engine = make_engine(rooms=())
+    for number in range(40):
+        engine.occupy(str(number), day(number % 5), day(number % 5 + 1))
+    free = engine.free_rooms(day(0), day(1))
+    assert len(free) == 32 and "0" not in free and "5" not in free
+
+
+# 测试查询超出视野时报错
+def test_query_outside_horizon():
+    engine = make_engine()
+    with pytest.raises(ValueError):
+        engine.free_rooms(day(-1), day(2))
+    with pytest.raises(ValueError):
+        engine.free_rooms(day(10), day(61))
@@ -0,0 +1,87 @@
+# File: CheckEasyBackend/tests/test_dates.py
+from datetime import date
+
+import pytest
+
+from app.modules.verification.ocr.dates import _parse, parse_date, parse_mrz_date
+from app.modules.verification.ocr.fields import scan_fields
+from app.modules.verification.ocr.nlp.date_extraction import extract_dates_cascade
+
+TODAY = date(2025, 3, 10)
+
+
+# 测试按字符类别推断格式
+@pytest.mark.parametrize("value, expected", [
+    ("2023-12-31", "2023-12-31"),
+    ("31.12.2023", "2023-12-31"),
+    ("31/12/2023", "2023-12-31"),
+    ("12/31/2023", "2023-12-31"),
+    ("05-04-2023", "2023-04-05"),
+    ("31 Dec 2023", "2023-12-31"),
+    ("02 MAR 1995", "1995-03-02"),
+    ("Dec 31, 2023", "2023-12-31"),
+    ("3 January 2030", "2030-01-03"),
+    ("20231231", "2023-12-31"),
+    ("740812", "1974-08-12"),
+    ("310415", "2031-04-15"),
+])
+def test_parse_date_shapes(value, expected):
+    assert parse_date(value, today=TODAY) == expected
+
+
+# 测试无法解析或不合法的日期
+@pytest.mark.parametrize("value", ["", None, "31.13.2023", "30 Feb 2024", "Foo 12 2020", "12345", "2023-12"])
+def test_parse_date_rejects_invalid(value):
+    assert parse_date(value, today=TODAY) is None
+
+
+# 测试 MRZ 日期只接受 6 位数字
+def test_parse_mrz_date():
+    assert parse_mrz_date("740812") == "1974-08-12"
+    assert parse_mrz_date("74081") is None
+    assert parse_mrz_date("74O812") is None
+
+
+# 测试重复出现的日期字符串命中缓存
+def test_parse_date_is_memoized():
+    _parse.cache_clear()
+    parse_date("12 Aug 1974", today=TODAY)
+    parse_date("12 Aug 1974", today=TODAY)
+    info = _parse.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+# 测试一次扫描取得全部带标签字段
+def test_scan_fields_single_pass():
+    text = (
+        "Name: Anna Maria Eriksson\n"
+        "Passport No. L898902C3\n"
+        "Date of birth: 12 Aug 1974\n"
+        "Expiry Date: 2031-04-15\n"
+        "DOB 12.08.1974\n"
+    )
+    fields = scan_fields(text)
+    assert fields["name"] == ["Anna Maria Eriksson"]
+    assert fields["document_number"] == ["L898902C3"]
+    assert fields["birth_date"] == ["1974-08-12", "1974-08-12"]
+    assert fields["expiry_date"] == ["2031-04-15"]
+
+
+# 测试 NER 只裁决互相矛盾的字段，MRZ 中唯一的出生日期保留
+def test_cascade_keeps_unique_fields_on_conflict():
+    text = (
+        "P<UTOERIKSSON<<ANNA<MARIA<<<<<<<<<<<<<<<<<<<\n"
+        "L898902C36UTO7408122F1204159ZE184226B<<<<<10\n"
+        "Expiry Date: 2031-01-01\n"
+        "Expiry Date: 2030-05-05\n"
+    )
+    result = extract_dates_cascade(text, ner=lambda t: ["2031-01-01"])
+    assert result.dates == {"birth_date": "1974-08-12", "expiry_date": "2031-01-01"}
+    assert result.tier == "ner"
+
+    def failing_ner(t):
+        raise RuntimeError("worker unavailable")
+
+    result = extract_dates_cascade(text, ner=failing_ner)
+    assert result.dates == {"birth_date": "1974-08-12", "expiry_date": None}
+    assert result.tier == "mrz"
@@ -0,0 +1,96 @@
+# File: CheckEasyBackend/tests/test_mrz.py
+from app.modules.verification.ocr.confidence import mrz_check_results, requires_review, score_confidence
+from app.modules.verification.ocr.mrz import check_results, corrected_fields, icao_check_digit, parse_mrz
+
+# ICAO 9303 规范中的样例
+TD3 = [
+    "P<UTOERIKSSON<<ANNA<MARIA<<<<<<<<<<<<<<<<<<<",
+    "L898902C36UTO7408122F1204159ZE184226B<<<<<10",
+]
+TD2 = [
+    "I<UTOERIKSSON<<ANNA<MARIA<<<<<<<<<<<",
+    "D231458907UTO7408122F1204159<<<<<<<6",
+]
+TD1 = [
+    "I<UTOD231458907<<<<<<<<<<<<<<<",
+    "7408122F1204159UTO<<<<<<<<<<<6",
+    "ERIKSSON<<ANNA<MARIA<<<<<<<<<<",
+]
+
+
+def test_icao_check_digit():
+    assert icao_check_digit("L898902C3") == 6
+    assert icao_check_digit("740812") == 2
+    assert icao_check_digit("<<<<") == 0
+
+
+# 测试 TD3 护照解析结果与 PassportEye to_dict() 结构一致
+def test_parse_td3():
+    data = parse_mrz(["some header text", *TD3])
+    assert data["mrz_type"] == "TD3"
+    assert data["type"] == "P"
+    assert data["country"] == "UTO"
+    assert data["number"] == "L898902C3"
+    assert data["surname"] == "ERIKSSON"
+    assert data["names"] == "ANNA MARIA"
+    assert data["date_of_birth"] == "740812"
+    assert data["expiration_date"] == "120415"
+    assert data["sex"] == "F"
+    assert data["personal_number"] == "ZE184226B<<<<<"
+    assert data["valid_score"] == 100
+
+
+def test_parse_td1_and_td2():
+    for lines, layout in ((TD1, "TD1"), (TD2, "TD2")):
+        data = parse_mrz(lines)
+        assert data["mrz_type"] == layout
+        assert data["number"] == "D23145890"
+        assert data["nationality"] == "UTO"
+        assert data["valid_score"] == 100
+        assert check_results(data) == mrz_check_results(lines)
+
+
+# 测试按校验位纠正 OCR 混淆字符（O/0、I/1、B/8）
+def test_parse_corrects_confusions():
+    line2 = "L898902C36UTO74O8I22F12O4I59ZE184226B<<<<<10"
+    data = parse_mrz([TD3[0].replace("ERIKSSON", "ERIK5S0N"), line2])
+    assert data["date_of_birth"] == "740812"
+    assert data["expiration_date"] == "120415"
+    assert data["surname"] == "ERIKSSON"
+    assert data["valid_score"] == 100
+
+    data = parse_mrz([TD3[0], "L8989O2C36" + TD3[1][10:]])
+    assert data["number"] == "L898902C3"
+    assert data["valid_number"] and data["valid_composite"] and data["corrected_number"]
+    assert not parse_mrz(TD3)["corrected_number"]
+
+
+def test_parse_rejects_unknown_layout():
+    assert parse_mrz(["P<UTO<<SHORT", "123<<"]) is None
+    assert parse_mrz([]) is None
+
+
+# 测试校验位全部通过的过期护照仍进入人工审核，不会自动通过
+def test_expired_passport_requires_review():
+    checks = check_results(parse_mrz(TD3))
+    data = {"check_digits": checks, "confidence_score": score_confidence(checks, 0.99), "document_status": "expired"}
+    assert all(checks.values()) and data["confidence_score"] >= 0.99
+    assert requires_review(data)
+    assert requires_review({**data, "document_status": "unknown"})
+    assert not requires_review({**data, "document_status": "valid"})
+    # 带 MRZ 的证件没有校验位结果时不能只凭词置信度自动通过
+    assert requires_review({**data, "document_status": "valid", "has_mrz": True, "check_digits": None})
+
+
+# 测试不在混淆字符表中的误读（9 读成 6）：校验位搜索可能得到另一个"通过校验"的号码，必须进入人工审核
+def test_corrected_number_requires_review():
+    data = parse_mrz([TD3[0], "L898962C36" + TD3[1][10:]])
+    checks = check_results(data)
+    assert not checks["document_number"]
+    review = {
+        "check_digits": checks,
+        "corrected_fields": corrected_fields(data),
+        "confidence_score": 0.99,
+        "document_status": "valid",
+    }
+    assert requires_review(review)
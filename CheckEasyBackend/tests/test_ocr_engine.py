@@ -0,0 +1,19 @@
+# File: CheckEasyBackend/tests/test_ocr_engine.py
+from app.modules.verification.ocr.confidence import weighted_word_confidence
+from app.modules.verification.ocr.engine import _text_from_data
+
+
+# 测试按 block / par / line 编号把 image_to_data 的词拼回文本
+def test_text_from_data_rebuilds_lines():
+    data = {
+        "text": ["", "PASSPORT", "", "P<UTOERIKSSON<<ANNA", "L898902C36UTO", "", "Valid", "until"],
+        "block_num": [1, 1, 2, 2, 2, 3, 3, 3],
+        "par_num": [0, 1, 0, 1, 1, 0, 1, 1],
+        "line_num": [0, 1, 0, 1, 2, 0, 1, 1],
+    }
+    assert _text_from_data(data) == "PASSPORT\n\nP<UTOERIKSSON<<ANNA\nL898902C36UTO\n\nValid until"
+
+
+def test_weighted_word_confidence():
+    assert weighted_word_confidence([("ab", 90.0), ("abcdef", 50.0)]) == 0.6
+    assert weighted_word_confidence([]) is None
@@ -0,0 +1,37 @@
+# File: CheckEasyBackend/tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# API 进程导入耗时预算（秒），可通过环境变量按机器性能调整
+STARTUP_IMPORT_BUDGET = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", 5.0))
+HEAVY_MODULES = ("torch", "stanza", "transformers", "passporteye", "pytesseract", "skimage", "scipy", "onnxruntime", "tesserocr")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+heavy = sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules)
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+def _probe():
+    # 在全新解释器中导入，避免受本测试进程已加载模块的影响
+    completed = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# 测试 API 启动时不加载重型 OCR/NLP 依赖，且导入耗时在预算内
+def test_app_import_is_light_and_within_budget():
+    result = _probe()
+    assert result["heavy"] == [], f"heavy modules imported at startup: {result['heavy']}"
+    assert result["elapsed"] < STARTUP_IMPORT_BUDGET, (
+        f"importing app.main took {result['elapsed']:.2f}s (budget {STARTUP_IMPORT_BUDGET:.2f}s); "
+        "run scripts/import_profile.py for details"
+    )
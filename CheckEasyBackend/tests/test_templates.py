@@ -0,0 +1,50 @@
+# File: CheckEasyBackend/tests/test_templates.py
+import pytest
+from PIL import Image, ImageDraw
+
+from app.modules.verification.ocr.driver_license.templates import TEMPLATES as LICENSE_TEMPLATES
+from app.modules.verification.ocr.id_card.templates import TEMPLATES as ID_TEMPLATES, chn_identity_number, gb11643_valid
+from app.modules.verification.ocr.templates import align_card, find_card_corners, find_template, perspective_coefficients
+
+
+def test_find_template_aliases_and_fallback():
+    assert find_template(ID_TEMPLATES, " china ").country == "CHN"
+    assert find_template(LICENSE_TEMPLATES, "uk", "FRONT").country == "GBR"
+    # 没有专门模板时，背面使用通用 TD1 MRZ 模板
+    assert find_template(ID_TEMPLATES, "DEU", "back").country == "*"
+    assert find_template(ID_TEMPLATES, "DEU", "front") is None
+
+
+# 测试 4 点单应矩阵把画布四角精确映射到源图四角
+def test_perspective_coefficients_maps_corners():
+    source = [(120, 110), (880, 140), (860, 640), (100, 600)]
+    a, b, c, d, e, f, g, h = perspective_coefficients(source, (1284, 810))
+    for (x, y), (u, v) in zip(((0, 0), (1284, 0), (1284, 810), (0, 810)), source):
+        w = g * x + h * y + 1
+        assert (a * x + b * y + c) / w == pytest.approx(u)
+        assert (d * x + e * y + f) / w == pytest.approx(v)
+
+
+# 测试在均匀背景上定位倾斜的卡片并校正
+def test_align_card_on_plain_background():
+    image = Image.new("L", (1000, 800), 30)
+    ImageDraw.Draw(image).polygon([(120, 110), (880, 140), (860, 640), (100, 600)], fill=230)
+    corners = find_card_corners(image)
+    assert corners is not None
+    assert corners[0] == pytest.approx((120, 110), abs=8)
+    card, aligned = align_card(image, (1284, 810))
+    assert aligned and card.size == (1284, 810)
+    assert card.getpixel((10, 10)) == 230 and card.getpixel((1270, 800)) == 230
+
+    # 卡片占满画面时找不到边缘，直接缩放
+    _, aligned = align_card(Image.new("L", (856, 540), 230), (1284, 810))
+    assert not aligned
+
+
+def test_chn_identity_number():
+    assert gb11643_valid("11010519491231002X")
+    assert not gb11643_valid("110105194912310021")
+    extracted = {"document_number": "1101 0519 4912 3100 2x", "additional_info": {}}
+    assert chn_identity_number(extracted) == {"document_number": True}
+    assert extracted["birth_date"] == "1949-12-31"
+    assert extracted["additional_info"]["sex"] == "F"